@@ -0,0 +1,17 @@
+# ASGI entry point serving the async PR endpoints alongside the Flask app.
+# Run from the backend directory with: hypercorn asgi:app --bind 0.0.0.0:5001
+# Requests under /async/ go to the Quart app; everything else is handed to
+# the existing Flask app through a WSGI adapter.
+from asgiref.wsgi import WsgiToAsgi
+from async_app import create_async_app
+from server import app as flask_app
+
+async_app = create_async_app()
+wsgi_app = WsgiToAsgi(flask_app)
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan" or scope.get("path", "").startswith("/async/"):
+        await async_app(scope, receive, send)
+    else:
+        await wsgi_app(scope, receive, send)
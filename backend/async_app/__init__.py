@@ -0,0 +1,29 @@
+from quart import Quart, jsonify
+from config.log import init_async_app as init_logging
+from config.tracing import init_async_app as init_tracing
+from async_app.clients import clients
+from async_app.routes import async_admin_bp, async_dev_bp, async_auditor_bp
+
+
+def create_async_app():
+    """Quart app serving the async PR endpoints under /async."""
+    app = Quart(__name__)
+    init_logging(app)
+    init_tracing(app)
+
+    @app.before_serving
+    async def start_clients():
+        await clients.start()
+
+    @app.after_serving
+    async def close_clients():
+        await clients.close()
+
+    @app.route('/async/')
+    async def home():
+        return jsonify({"message": "Async API is running"}), 200
+
+    app.register_blueprint(async_admin_bp, url_prefix='/async/admin')
+    app.register_blueprint(async_dev_bp, url_prefix='/async/dev')
+    app.register_blueprint(async_auditor_bp, url_prefix='/async/auditor')
+    return app
@@ -0,0 +1,115 @@
+import asyncio
+import os
+import time
+import aiohttp
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from web3 import AsyncWeb3
+from config.metrics import MongoCommandTimer, github_request_seconds, github_route
+from config.tracing import span
+from config.services import pull_requests_address, pull_requests_abi
+from scanning import get_scan_service
+
+load_dotenv()
+
+
+class GitHubClient:
+    """Thin aiohttp wrapper sharing one pooled session across requests."""
+
+    def __init__(self, session, concurrency=16):
+        self.session = session
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+    async def get(self, url, headers):
+        """GET a GitHub URL and return (status, parsed JSON or None, raw text)."""
+        async with self.semaphore:
+            route = github_route(url)
+            started = time.perf_counter()
+            status = "error"
+            try:
+                with span("github.request", **{"http.method": "GET", "http.route": route}):
+                    async with self.session.get(url, headers=headers) as response:
+                        status = response.status
+                        text = await response.text()
+                        try:
+                            data = await response.json(content_type=None)
+                        except ValueError:
+                            data = None
+                        return response.status, data, text
+            finally:
+                github_request_seconds.observe(time.perf_counter() - started, "GET", route, status)
+
+
+class AsyncClients:
+    """Per-event-loop clients for the async endpoints, each created on first use."""
+
+    def __init__(self):
+        self._github = None
+        self._db = None
+        self._w3 = None
+        self._contract = None
+        self._account = None
+        self.chain_lock = None
+
+    async def start(self):
+        # Transactions from the shared account must be sent one at a time to keep nonces ordered
+        self.chain_lock = asyncio.Lock()
+        # Building the scan service runs `bearer --version`; do it once, off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, get_scan_service)
+
+    async def close(self):
+        if self._github:
+            await self._github.session.close()
+        if self._db is not None:
+            self._db.client.close()
+        if self._w3 is not None:
+            await self._w3.provider.disconnect()
+
+    @property
+    def github(self):
+        if self._github is None:
+            connector = aiohttp.TCPConnector(limit=int(os.environ.get("GITHUB_MAX_CONNECTIONS", 32)))
+            self._github = GitHubClient(
+                aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=60)),
+                concurrency=int(os.environ.get("GITHUB_CONCURRENCY", 16))
+            )
+        return self._github
+
+    @property
+    def db(self):
+        if self._db is None:
+            mongo_uri = os.environ.get("MONGO_URI")
+            if not mongo_uri:
+                raise Exception("MONGO_URI not set in .env")
+            self._db = AsyncIOMotorClient(mongo_uri, event_listeners=[MongoCommandTimer()])[os.environ.get("MONGO_DB", "test")]
+        return self._db
+
+    @property
+    def w3(self):
+        if self._w3 is None:
+            ganache_rpc = os.environ.get("GANACHE_RPC")
+            if not ganache_rpc:
+                raise Exception("GANACHE_RPC not set in .env")
+            self._w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(ganache_rpc))
+        return self._w3
+
+    @property
+    def contract(self):
+        if self._contract is None:
+            self._contract = self.w3.eth.contract(
+                address=self.w3.to_checksum_address(pull_requests_address()),
+                abi=pull_requests_abi()
+            )
+        return self._contract
+
+    @property
+    def account(self):
+        if self._account is None:
+            private_key = os.environ.get("PRIVATE_KEY")
+            if not private_key:
+                raise Exception("PRIVATE_KEY not set in .env")
+            self._account = self.w3.eth.account.from_key(private_key)
+        return self._account
+
+
+clients = AsyncClients()
@@ -0,0 +1,125 @@
+import asyncio
+import base64
+import logging
+from web3 import Web3
+from scanning import submit_scan, wait_for_scan
+from config.chain_events import logged_tx_hash_async, wait_for_receipt_async
+from config.services import GITHUB_API_URL, log_pull_request_args
+from config.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+class ChainError(Exception):
+    """Raised when the chain account cannot pay for a PR log; aborts the request like the sync routes."""
+
+
+def github_headers(token):
+    return {"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"}
+
+
+def pr_status(pr):
+    return "approved" if pr.get("merged_at") else ("rejected" if pr["state"] == "closed" else "pending")
+
+
+async def fetch_file_content(github, headers, file):
+    """Same content rules as the sync routes: decoded contents_url, falling back to the patch."""
+    file_content = None
+    if "contents_url" in file:
+        status, content_data, _ = await github.get(file["contents_url"], headers)
+        if status == 200 and content_data and "content" in content_data and content_data.get("encoding") == "base64":
+            try:
+                file_content = base64.b64decode(content_data["content"]).decode('utf-8', errors='replace')
+            except (base64.binascii.Error, UnicodeDecodeError) as e:
+                logger.error("Error decoding file content: %s", str(e))
+    if not file_content:
+        file_content = file.get("patch", "No content available")
+    return file_content
+
+
+async def fetch_changed_files(github, headers, repo_owner, project_name, pr_id):
+    """Fetch every file of a PR concurrently and scan them on the shared scan service."""
+    files_url = f"{GITHUB_API_URL}/repos/{repo_owner}/{project_name}/pulls/{pr_id}/files"
+    status, files_data, _ = await github.get(files_url, headers)
+    if status != 200 or not files_data:
+        return []
+
+    contents = await asyncio.gather(*(fetch_file_content(github, headers, file) for file in files_data))
+    # Scan futures are cached and shared with other requests, so they are waited
+    # on from the executor rather than wrapped: cancelling this request must not
+    # cancel them
+    loop = asyncio.get_running_loop()
+    scans = [
+        loop.run_in_executor(None, wait_for_scan, submit_scan(content, file["filename"]))
+        for file, content in zip(files_data, contents)
+    ]
+    with span("scan.wait", **{"file.count": len(scans)}):
+        results = await asyncio.gather(*scans)
+    return [
+        {"filename": file["filename"], "content": content, "vulnerability": result}
+        for file, content, result in zip(files_data, contents, results)
+    ]
+
+
+async def sync_pull_request(clients, pr_id, project_name, developer, timestamp, status, verify_receipt=False, max_retries=3):
+    """Return the txHash logging this PR on chain, sending the log transaction if needed."""
+    w3, contract = clients.w3, clients.contract
+    tx_hash_value = "N/A"
+    for attempt in range(max_retries):
+        try:
+            pr_on_chain = await contract.functions.getPullRequest(pr_id).call()
+            if pr_on_chain[5]:  # isLogged
+                logged = await logged_tx_hash_async(contract, pr_id)
+                if logged is None:
+                    return "Not Found" if verify_receipt else tx_hash_value
+                tx_hash_value = logged
+                if verify_receipt:
+                    try:
+                        await w3.eth.get_transaction_receipt(tx_hash_value)
+                    except Exception as e:
+                        logger.error("Error verifying transaction %s: %s", tx_hash_value, str(e))
+                        return "Not Found"
+                return tx_hash_value
+
+            # Serialize sends from the shared account so nonces never collide
+            async with clients.chain_lock:
+                account = clients.account
+                balance = await w3.eth.get_balance(account.address)
+                balance_eth = w3.from_wei(balance, 'ether')
+                if balance_eth < 0.01:
+                    raise ChainError(f"Insufficient account balance: {balance_eth} ETH")
+
+                call = contract.functions.logPullRequest(*log_pull_request_args(pr_id, project_name, developer, timestamp, status))
+                nonce, gas_estimate, gas_price, chain_id = await asyncio.gather(
+                    w3.eth.get_transaction_count(account.address, 'pending'),
+                    call.estimate_gas({'from': account.address}),
+                    w3.eth.gas_price,
+                    w3.eth.chain_id
+                )
+                estimated_cost = gas_estimate * gas_price
+                if balance < estimated_cost:
+                    raise ChainError(f"Insufficient funds: {balance_eth} ETH available, {w3.from_wei(estimated_cost, 'ether')} ETH required")
+
+                tx = await call.build_transaction({
+                    'from': account.address,
+                    'nonce': nonce,
+                    'gas': gas_estimate + 10000,
+                    'gasPrice': gas_price,
+                    'chainId': chain_id
+                })
+                signed_tx = account.sign_transaction(tx)
+                tx_hash = await w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+
+            receipt = await wait_for_receipt_async(w3, tx_hash, timeout=300)
+            if receipt['status'] == 0:
+                raise Exception(f"Transaction failed: {receipt}")
+            logger.info("Stored PR #%s for %s on blockchain, tx: %s, gas used: %s, attempt: %s", pr_id, project_name, Web3.to_hex(tx_hash), receipt['gasUsed'], attempt + 1)
+            return Web3.to_hex(tx_hash)
+        except ChainError:
+            raise
+        except Exception as e:
+            logger.error("Error processing PR #%s for %s on blockchain on attempt %s: %s", pr_id, project_name, attempt + 1, str(e))
+            tx_hash_value = "Failed"
+            if attempt < max_retries - 1:
+                await asyncio.sleep(1)
+    return tx_hash_value
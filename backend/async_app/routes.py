@@ -0,0 +1,205 @@
+import asyncio
+import logging
+from quart import Blueprint, jsonify, request
+from async_app.clients import clients
+from async_app.pipeline import ChainError, github_headers, pr_status, fetch_changed_files, sync_pull_request
+from config.services import GITHUB_API_URL
+from config.sessions import current_user_async
+from config.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Async variants of the PR endpoints. Response bodies match the sync routes;
+# PRs and their files are fetched and scanned concurrently instead of one by one.
+async_admin_bp = Blueprint("async_admin", __name__)
+async_dev_bp = Blueprint("async_dev", __name__)
+async_auditor_bp = Blueprint("async_auditor", __name__)
+
+
+async def fetch_pull_requests(headers, repo_owner, project_name, state):
+    """Check the repo and list its PRs; returns (prs, error_response)."""
+    github = clients.github
+    status, _, text = await github.get(f"{GITHUB_API_URL}/repos/{repo_owner}/{project_name}", headers)
+    if status == 404:
+        return None, (jsonify({"error": f"Repository {project_name} not found"}), 404)
+    elif status == 403:
+        logger.warning("Rate limit exceeded checking repository %s: %s - %s", project_name, status, text)
+        return None, (jsonify({"error": "GitHub API rate limit exceeded"}), 403)
+
+    status, prs, text = await github.get(f"{GITHUB_API_URL}/repos/{repo_owner}/{project_name}/pulls?state={state}", headers)
+    if status == 403:
+        logger.warning("Rate limit exceeded for %s: %s - %s", project_name, status, text)
+        return None, (jsonify({"error": "GitHub API rate limit exceeded"}), 403)
+    elif status != 200:
+        logger.error("Failed to fetch PRs for %s: %s - %s", project_name, status, text)
+        return None, (jsonify({"error": f"Failed to fetch pull requests: {status}"}), status)
+    return prs, None
+
+
+async def build_logged_pull_request(headers, repo_owner, project_name, pr, include_version, verify_receipt):
+    pr_id = int(pr["number"])
+    developer = (pr["user"]["login"] or "").lower().strip()
+    with span("pull_request", **{"pr.id": pr_id}):
+        return await _build_logged_pull_request(headers, repo_owner, project_name, pr, pr_id, developer, include_version, verify_receipt)
+
+
+async def _build_logged_pull_request(headers, repo_owner, project_name, pr, pr_id, developer, include_version, verify_receipt):
+    changed_files = await fetch_changed_files(clients.github, headers, repo_owner, project_name, pr_id)
+    status = pr_status(pr)
+    pr_data = {
+        "pullRequestId": str(pr_id),
+        "projectName": project_name,
+    }
+    if include_version:
+        pr_data["version"] = pr.get("head", {}).get("sha", "unknown")[:7]
+    pr_data.update({
+        "developer": developer,
+        "timestamp": pr["created_at"],
+        "status": status,
+        "changedFiles": changed_files,
+        "securityScore": None if any(f["vulnerability"]["is_vulnerable"] for f in changed_files) else "Safe",
+    })
+    with span("chain.sync"):
+        pr_data["txHash"] = await sync_pull_request(clients, pr_id, project_name, developer, pr["created_at"], status, verify_receipt=verify_receipt)
+    return pr_data
+
+
+async def run_all(coros):
+    """Run coroutines concurrently and return their results in order.
+
+    The first failure cancels the others, so an aborted request stops
+    sending its remaining chain transactions, and is re-raised as is.
+    """
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(coro) for coro in coros]
+    except BaseExceptionGroup as e:
+        raise e.exceptions[0]
+    return [task.result() for task in tasks]
+
+
+async def list_and_log(headers, repo_owner, project_name, prs, include_version, verify_receipt):
+    """Process PRs concurrently, then count points the same way as the sync routes."""
+    pullrequests = await run_all(
+        build_logged_pull_request(headers, repo_owner, project_name, pr, include_version, verify_receipt)
+        for pr in prs
+    )
+    approved_count = sum(1 for pr in pullrequests if pr["status"] == "approved")
+    rejected_count = sum(1 for pr in pullrequests if pr["status"] == "rejected")
+    return pullrequests, approved_count - rejected_count
+
+
+@async_admin_bp.route("/pull_requests/<project_name>", methods=["GET"])
+async def get_pull_requests(project_name):
+    user = await current_user_async(clients.db.users, role="admin", full=True)
+    if not user:
+        return jsonify({"error": "No admin found"}), 404
+    if project_name not in user.get("createdProjects", []):
+        return jsonify({"error": "Project not created by user"}), 403
+
+    github_token = user.get("githubToken", "")
+    repo_owner = user.get("githubUsername", "")
+    if not github_token or not repo_owner:
+        return jsonify({"error": "Admin GitHub credentials missing", "project": project_name}), 400
+    headers = github_headers(github_token)
+
+    try:
+        prs, error = await fetch_pull_requests(headers, repo_owner, project_name, "all")
+        if error:
+            return error
+        pullrequests, points = await list_and_log(headers, repo_owner, project_name, prs, include_version=False, verify_receipt=False)
+        await clients.db.users.update_one({"_id": user["_id"]}, {"$set": {f"points.{project_name}": points}})
+    except ChainError as e:
+        return jsonify({"error": str(e)}), 500
+    except Exception as e:
+        logger.error("Error fetching PRs for %s: %s", project_name, str(e))
+        return jsonify({"error": f"Error fetching pull requests: {str(e)}"}), 500
+
+    logger.info("Returning %s pull requests for project %s", len(pullrequests), project_name)
+    return jsonify({"pullRequests": pullrequests, "points": points}), 200
+
+
+@async_dev_bp.route("/pullrequests", methods=["GET"])
+async def list_pullrequests():
+    user = await current_user_async(clients.db.users, role="developer", full=True)
+    if not user:
+        return jsonify({"error": "No developer found"}), 404
+
+    project_name = request.args.get("project")
+    if not project_name:
+        return jsonify({"error": "Project name is required"}), 400
+    assigned_projects = [p.get("projectName") for p in user.get("assignedProjects", []) if isinstance(p, dict) and "projectName" in p]
+    if project_name not in assigned_projects:
+        return jsonify({"error": "Project not assigned to user"}), 403
+
+    admin = await clients.db.users.find_one({"role": "admin", "createdProjects": project_name})
+    if not admin:
+        return jsonify({"error": "No admin found for project", "project": project_name}), 404
+    github_token = admin.get("githubToken", "")
+    repo_owner = admin.get("githubUsername", "")
+    if not github_token or not repo_owner:
+        return jsonify({"error": "Admin GitHub credentials missing", "project": project_name}), 400
+    headers = github_headers(github_token)
+    developer_name = (user.get("githubUsername", "") or user.get("username", "")).lower().strip()
+
+    try:
+        await clients.w3.eth.chain_id
+    except Exception as e:
+        return jsonify({"error": f"Blockchain connection error: {str(e)}"}), 500
+
+    try:
+        prs, error = await fetch_pull_requests(headers, repo_owner, project_name, "all")
+        if error:
+            return error
+        own_prs = [pr for pr in prs if (pr["user"]["login"] or "").lower().strip() == developer_name]
+        pullrequests, points = await list_and_log(headers, repo_owner, project_name, own_prs, include_version=True, verify_receipt=True)
+        await clients.db.users.update_one({"_id": user["_id"]}, {"$set": {f"points.{project_name}": points}})
+    except ChainError as e:
+        return jsonify({"error": str(e)}), 500
+    except Exception as e:
+        logger.error("Error fetching PRs for %s: %s", project_name, str(e))
+        return jsonify({"error": f"Error fetching pull requests: {str(e)}"}), 500
+
+    logger.info("Returning %s pull requests for project %s", len(pullrequests), project_name)
+    return jsonify({"pullrequests": pullrequests, "points": points}), 200
+
+
+@async_auditor_bp.route("/dashboard", methods=["GET"])
+async def auditor_dashboard():
+    user = await current_user_async(clients.db.users, role="auditor")
+    if not user:
+        return jsonify({"error": "Unauthorized"}), 403
+
+    project_name = request.args.get("projectName")
+    assigned_projects = [p["projectName"] for p in user.get("assignedProjects", [])]
+    if not project_name or project_name not in assigned_projects:
+        return jsonify({"error": "Unauthorized project or no project specified"}), 403
+
+    admin = await clients.db.users.find_one({"createdProjects": project_name, "role": "admin"})
+    if not admin:
+        return jsonify({"error": "No admin found for this repo"}), 404
+    repo_owner = admin.get("githubUsername", "Manvith-M-Nayak")
+    headers = github_headers(admin.get("githubToken", ""))
+
+    status, prs, text = await clients.github.get(f"{GITHUB_API_URL}/repos/{repo_owner}/{project_name}/pulls?state=open", headers)
+    if status != 200:
+        return jsonify({"error": f"Failed to fetch pull requests: {text}"}), status
+
+    async def build(pr):
+        pr_id = str(pr["number"])
+        with span("pull_request", **{"pr.id": int(pr_id)}):
+            changed_files = await fetch_changed_files(clients.github, headers, repo_owner, project_name, pr_id)
+        return {
+            "pullRequestId": pr_id,
+            "projectName": project_name,
+            "version": pr.get("head", {}).get("sha", "unknown")[:7],
+            "developer": pr["user"]["login"],
+            "timestamp": pr["created_at"],
+            "changedFiles": changed_files,
+            "securityScore": None if any(f["vulnerability"]["is_vulnerable"] for f in changed_files) else "Safe",
+            "status": "pending"
+        }
+
+    pull_requests = await run_all(build(pr) for pr in prs)
+    logger.info("Returning %s pull requests for project %s", len(pull_requests), project_name)
+    return jsonify({"pullRequests": pull_requests}), 200
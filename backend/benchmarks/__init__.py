@@ -0,0 +1,14 @@
+"""Offline benchmarks for the backend.
+
+Everything external is replaced by a local stand-in: fake_github serves
+synthetic repositories, bin/bearer imitates the Bearer CLI with tunable
+latency, and fake_chain answers JSON-RPC for the PullRequests contract (or
+use --chain ganache). MongoDB is the only real dependency; the suites drop
+and reseed the database named by --mongo-db on the server at MONGO_URI.
+
+Run from the backend directory:
+
+    python -m benchmarks.pipeline   # PR listing endpoints, latency percentiles
+    python -m benchmarks.load       # concurrent dashboard users, saturation per gunicorn config
+    python -m benchmarks.chain      # PullRequests tx/s, gas per PR, read latency vs history
+"""
@@ -0,0 +1,257 @@
+"""Chain throughput: logging PRs to PullRequests and reading them back as history grows.
+
+Deploys PullRequests (or uses the fake chain's), then logs --prs pull
+requests with each write mode:
+  sequential  what the PR routes do per PR today: getPullRequest, balance,
+              pending nonce, estimate_gas, gas price, send, wait for receipt
+  pipelined   nonces tracked locally and a fixed gas limit; --window
+              transactions sent before waiting for their receipts
+  batched     --batch-size signed transactions per JSON-RPC batch request,
+              receipts polled in batches too
+Every --checkpoint PRs it times getPullRequest and the routes'
+PullRequestLogged.get_logs(from_block=0, pullRequestId=...) lookup on
+--read-samples logged ids, to show how read latency tracks history size.
+Finally --updates logged PRs get an updatePullRequestStatus call each.
+--contracts runs the whole suite once per contract version, each on a fresh
+chain, so v1 and PullRequestsV2 can be compared side by side.
+
+    cd backend && python -m benchmarks.chain --chain ganache --prs 2000 --contracts PullRequests PullRequestsV2
+
+Gas figures are only meaningful with --chain ganache or external; the fake
+chain does not run the EVM.
+"""
+import argparse
+import os
+import random
+import time
+import requests
+from web3 import Web3
+from config.services import PULLREQUESTS_CONTRACT, PULLREQUESTS_V2_STATUS, log_pull_request_args, pull_requests_abi
+from benchmarks.fake_chain import CHAIN_ID, DEV_PRIVATE_KEY
+from benchmarks.report import Samples, format_table, write_json
+from benchmarks.stack import add_chain_arguments, start_chain, stop_processes
+
+MODES = ("sequential", "pipelined", "batched")
+CONTRACTS = ("PullRequests", "PullRequestsV2")
+WRITE_COLUMNS = ("endpoint", "requests", "errors", "p50_ms", "p95_ms", "p99_ms", "throughput_rps", "gas_per_pr")
+READ_COLUMNS = ("endpoint", "history", "requests", "errors", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+PROJECT = "bench-project-0"
+TIMESTAMP = "2024-01-01T00:00:00Z"
+UPDATED_AT = "2024-01-02T00:00:00Z"
+UPDATED_AT_UNIX = 1704153600
+
+
+class ChainBench:
+    def __init__(self, rpc_url, contract_address, private_key, options, contract_name=PULLREQUESTS_CONTRACT):
+        self.rpc_url = rpc_url
+        self.options = options
+        self.contract_name = contract_name
+        self.w3 = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={"timeout": options.timeout}))
+        self.contract = self.w3.eth.contract(address=Web3.to_checksum_address(contract_address), abi=pull_requests_abi(contract_name))
+        self.account = self.w3.eth.account.from_key(private_key)
+        self.session = requests.Session()
+        self.gas_limit = None
+
+    def pr_args(self, pr_id):
+        """logPullRequest arguments, encoded the way the routes encode them for this contract."""
+        return log_pull_request_args(pr_id, PROJECT, f"bench-dev-{pr_id % 3}", TIMESTAMP, "pending", self.contract_name)
+
+    def update_args(self, pr_id):
+        if self.contract_name == "PullRequests":
+            return pr_id, PROJECT, "approved", UPDATED_AT
+        return pr_id, PULLREQUESTS_V2_STATUS["approved"], UPDATED_AT_UNIX
+
+    def sign(self, pr_id, nonce, gas, gas_price):
+        tx = self.contract.functions.logPullRequest(*self.pr_args(pr_id)).build_transaction({
+            "from": self.account.address, "nonce": nonce, "gas": gas, "gasPrice": gas_price, "chainId": CHAIN_ID,
+        })
+        return self.account.sign_transaction(tx).raw_transaction
+
+    def fixed_gas(self, pr_id):
+        """Gas limit for the pipelined and batched modes, from one estimate plus headroom."""
+        if self.gas_limit is None:
+            estimate = self.contract.functions.logPullRequest(*self.pr_args(pr_id)).estimate_gas({"from": self.account.address})
+            self.gas_limit = int(estimate * 1.5) + 10000
+        return self.gas_limit
+
+    def sequential(self, ids, record):
+        w3, contract, address = self.w3, self.contract, self.account.address
+        for pr_id in ids:
+            started = time.perf_counter()
+            try:
+                contract.functions.getPullRequest(pr_id).call()
+                w3.eth.get_balance(address)
+                nonce = w3.eth.get_transaction_count(address, "pending")
+                gas = contract.functions.logPullRequest(*self.pr_args(pr_id)).estimate_gas({"from": address})
+                raw = self.sign(pr_id, nonce, gas + 10000, w3.eth.gas_price)
+                receipt = w3.eth.wait_for_transaction_receipt(w3.eth.send_raw_transaction(raw), timeout=self.options.timeout)
+                record(started, receipt["status"] == 1, receipt["gasUsed"])
+            except Exception:
+                record(started, False, 0)
+
+    def pipelined(self, ids, record):
+        w3 = self.w3
+        gas, gas_price = self.fixed_gas(ids[0]), w3.eth.gas_price
+        nonce = w3.eth.get_transaction_count(self.account.address, "pending")
+        for start in range(0, len(ids), self.options.window):
+            sent = []
+            for pr_id in ids[start:start + self.options.window]:
+                started = time.perf_counter()
+                try:
+                    sent.append((started, w3.eth.send_raw_transaction(self.sign(pr_id, nonce, gas, gas_price))))
+                    nonce += 1
+                except Exception:
+                    record(started, False, 0)
+            for started, tx_hash in sent:
+                try:
+                    receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=self.options.timeout, poll_latency=0.01)
+                    record(started, receipt["status"] == 1, receipt["gasUsed"])
+                except Exception:
+                    record(started, False, 0)
+
+    def update(self, ids, record):
+        """updatePullRequestStatus to approved, one confirmed transaction at a time."""
+        w3, address = self.w3, self.account.address
+        for pr_id in ids:
+            started = time.perf_counter()
+            try:
+                call = self.contract.functions.updatePullRequestStatus(*self.update_args(pr_id))
+                tx = call.build_transaction({
+                    "from": address, "nonce": w3.eth.get_transaction_count(address, "pending"),
+                    "gas": call.estimate_gas({"from": address}) + 10000, "gasPrice": w3.eth.gas_price, "chainId": CHAIN_ID,
+                })
+                tx_hash = w3.eth.send_raw_transaction(self.account.sign_transaction(tx).raw_transaction)
+                receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=self.options.timeout)
+                record(started, receipt["status"] == 1, receipt["gasUsed"])
+            except Exception:
+                record(started, False, 0)
+
+    def rpc_batch(self, calls):
+        body = [{"jsonrpc": "2.0", "id": i, "method": method, "params": params} for i, (method, params) in enumerate(calls)]
+        responses = self.session.post(self.rpc_url, json=body, timeout=self.options.timeout).json()
+        return [r.get("result") for r in sorted(responses, key=lambda r: r["id"])]
+
+    def batched(self, ids, record):
+        gas, gas_price = self.fixed_gas(ids[0]), self.w3.eth.gas_price
+        nonce = self.w3.eth.get_transaction_count(self.account.address, "pending")
+        for start in range(0, len(ids), self.options.batch_size):
+            chunk = ids[start:start + self.options.batch_size]
+            started = time.perf_counter()
+            raws = [self.sign(pr_id, nonce + i, gas, gas_price) for i, pr_id in enumerate(chunk)]
+            hashes = self.rpc_batch([("eth_sendRawTransaction", ["0x" + raw.hex()]) for raw in raws])
+            nonce += sum(1 for h in hashes if h)
+            pending = [h for h in hashes if h]
+            for _ in range(len(hashes) - len(pending)):
+                record(started, False, 0)
+            deadline = time.monotonic() + self.options.timeout
+            while pending and time.monotonic() < deadline:
+                receipts = self.rpc_batch([("eth_getTransactionReceipt", [h]) for h in pending])
+                for tx_hash, receipt in zip(list(pending), receipts):
+                    if receipt:
+                        record(started, receipt["status"] == "0x1", int(receipt["gasUsed"], 16))
+                        pending.remove(tx_hash)
+                if pending:
+                    time.sleep(0.01)
+            for _ in pending:
+                record(started, False, 0)
+
+    def reads(self, logged, history):
+        """Time getPullRequest and the routes' get_logs lookup for a sample of logged ids."""
+        event = self.contract.events.PullRequestLogged
+        calls = Samples("getPullRequest")
+        logs = Samples("get_logs(pullRequestId)")
+        for pr_id in random.sample(logged, min(self.options.read_samples, len(logged))):
+            started = time.perf_counter()
+            try:
+                ok = self.contract.functions.getPullRequest(pr_id).call()[5]
+            except Exception:
+                ok = False
+            calls.add(started, time.perf_counter(), ok)
+            started = time.perf_counter()
+            try:
+                ok = bool(event.get_logs(from_block=0, argument_filters={"pullRequestId": pr_id}))
+            except Exception:
+                ok = False
+            logs.add(started, time.perf_counter(), ok)
+        return [dict(s.summary(), history=history) for s in (calls, logs)]
+
+
+def write_summary(name, samples, seconds, gas_used):
+    summary = dict(samples.summary(), endpoint=name)
+    summary["throughput_rps"] = len(samples.latencies) / seconds if seconds else 0.0
+    summary["gas_per_pr"] = sum(gas_used) / len(gas_used) if gas_used else 0.0
+    return summary
+
+
+def run(bench, options):
+    label = bench.contract_name
+    writes, reads = [], []
+    logged = []
+    next_id = options.start_id
+    for mode in options.modes + ["update"]:
+        samples = Samples(mode)
+        gas_used = []
+        write_seconds = 0.0
+
+        def record(started, ok, gas):
+            samples.add(started, time.perf_counter(), ok)
+            if ok:
+                gas_used.append(gas)
+
+        if mode == "update":
+            if not logged or not options.updates:
+                continue
+            began = time.perf_counter()
+            bench.update(random.sample(logged, min(options.updates, len(logged))), record)
+            writes.append(write_summary(f"{label} updatePullRequestStatus", samples, time.perf_counter() - began, gas_used))
+            continue
+        for start in range(0, options.prs, options.checkpoint):
+            ids = list(range(next_id, next_id + min(options.checkpoint, options.prs - start)))
+            next_id += len(ids)
+            began = time.perf_counter()
+            getattr(bench, mode)(ids, record)
+            write_seconds += time.perf_counter() - began
+            logged.extend(ids)
+            reads.extend(dict(summary, endpoint=f"{label} {summary['endpoint']}") for summary in bench.reads(logged, len(logged)))
+            print(f"{label} {mode}: {len(logged)} PRs on chain", flush=True)
+        writes.append(write_summary(f"{label} logPullRequest {mode}", samples, write_seconds, gas_used))
+    return writes, reads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--contracts", nargs="+", choices=CONTRACTS, default=[PULLREQUESTS_CONTRACT])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--prs", type=int, default=1000, help="PRs logged per mode")
+    parser.add_argument("--checkpoint", type=int, default=250, help="PRs between read measurements")
+    parser.add_argument("--read-samples", type=int, default=20, help="ids read at each checkpoint")
+    parser.add_argument("--window", type=int, default=50, help="pipelined: transactions in flight")
+    parser.add_argument("--batch-size", type=int, default=50, help="batched: transactions per JSON-RPC batch")
+    parser.add_argument("--updates", type=int, default=100, help="status updates after the logging modes")
+    parser.add_argument("--start-id", type=int, default=1_000_000, help="first PR id; pick an unused range on a reused contract")
+    parser.add_argument("--private-key", default=os.environ.get("PRIVATE_KEY", DEV_PRIVATE_KEY))
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--json", help="also write the results to this file")
+    add_chain_arguments(parser)
+    options = parser.parse_args()
+
+    writes, reads = [], []
+    for contract_name in options.contracts:
+        processes = []
+        try:
+            rpc_url, contract_address = start_chain(options, processes, contract_name)
+            bench = ChainBench(rpc_url, contract_address, options.private_key, options, contract_name)
+            print(f"{contract_name} at {contract_address} on {rpc_url} ({options.chain})", flush=True)
+            contract_writes, contract_reads = run(bench, options)
+            writes += contract_writes
+            reads += contract_reads
+        finally:
+            stop_processes(processes)
+    print(format_table(reads, "\nReads as history grows", columns=READ_COLUMNS))
+    print(format_table(writes, f"\nWrites, {options.prs} PRs per mode (throughput_rps = tx/s, gas_per_pr = gas per call)", columns=WRITE_COLUMNS))
+    if options.json:
+        write_json(options.json, {"options": vars(options), "writes": writes, "reads": reads})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,507 @@
+"""In-process stand-in for a Ganache node running the PullRequests contract.
+
+It answers the JSON-RPC calls web3.py makes for the PR routes: eth_call,
+eth_estimateGas, eth_sendRawTransaction, receipts, eth_getLogs and the
+account and chain queries. It follows PullRequests.sol, or PullRequestsV2.sol
+with `--contract-name PullRequestsV2`: the same checks, storage, revert
+reasons and events. Every transaction is mined at once into its own block,
+like Ganache's automine. No EVM runs, so the numbers measure the backend's
+side of the chain round trips. Use `--chain ganache` in the benchmarks when
+gas and EVM cost matter. With --ws-port the same JSON-RPC is also served
+over WebSocket, plus eth_subscribe for newHeads and logs.
+
+    python -m benchmarks.fake_chain --port 8545 --ws-port 8546 --rpc-latency-ms 2
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import rlp
+from eth_abi import decode, encode
+from eth_account import Account
+from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector, keccak, to_checksum_address
+from websockets.asyncio.server import serve as serve_ws
+from config.deployments import load_abi
+
+CHAIN_ID = 1337
+CONTRACT_ADDRESS = "0xe7f1725E7734CE288F8367e1Bb143E90bb3F0512"
+# Well-known local development key (Hardhat/Anvil account #0); never holds real funds
+DEV_PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+GAS_PRICE = 20 * 10**9
+VALID_STATUSES = ("pending", "approved", "rejected")
+
+
+class RpcError(Exception):
+    def __init__(self, message, code=-32000, data=None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+class Revert(RpcError):
+    def __init__(self, reason):
+        # Error(string) payload, as returned by a real node for require() failures
+        super().__init__(f"execution reverted: {reason}", 3, "0x08c379a0" + encode(["string"], [reason]).hex())
+
+
+def _int(value):
+    return int.from_bytes(value, "big") if value else 0
+
+
+def _hex(value):
+    return hex(value) if isinstance(value, int) else "0x" + bytes(value).hex()
+
+
+def _page(items, offset, limit):
+    """(items[offset:offset + limit], len(items)), as the contracts' *Page views return."""
+    return items[offset:offset + limit], len(items)
+
+
+def log_filter(query):
+    """(addresses or None, topics) from an eth_getLogs / eth_subscribe("logs") filter."""
+    addresses = query.get("address")
+    if isinstance(addresses, str):
+        addresses = [addresses]
+    return ({to_checksum_address(a) for a in addresses} if addresses else None), query.get("topics") or []
+
+
+def log_matches(log, addresses, topics):
+    if addresses and log["address"] not in addresses:
+        return False
+    return not any(want is not None and log["topics"][i] not in (want if isinstance(want, list) else [want])
+                   for i, want in enumerate(topics) if i < len(log["topics"]))
+
+
+def decode_raw_transaction(raw):
+    """Fields of a signed legacy, EIP-2930 or EIP-1559 transaction."""
+    sender = Account.recover_transaction(raw)
+    if raw[0] >= 0xc0:
+        nonce, gas_price, gas, to, value, data, v, _, _ = rlp.decode(raw)
+        v = _int(v)
+        chain_id = (v - 35) // 2 if v >= 35 else None
+    elif raw[0] == 1:
+        chain_id, nonce, gas_price, gas, to, value, data = rlp.decode(raw[1:])[:7]
+        chain_id = _int(chain_id)
+    elif raw[0] == 2:
+        chain_id, nonce, _, gas_price, gas, to, value, data = rlp.decode(raw[1:])[:8]
+        chain_id = _int(chain_id)
+    else:
+        raise RpcError(f"unsupported transaction type {raw[0]}")
+    return {
+        "from": sender, "nonce": _int(nonce), "gasPrice": _int(gas_price), "gas": _int(gas),
+        "to": to_checksum_address(to) if to else None, "value": _int(value), "data": bytes(data),
+        "chainId": chain_id, "hash": keccak(raw),
+    }
+
+
+class PullRequestsChain:
+    """Chain state plus the PullRequests contract logic; all methods run under one lock."""
+
+    contract_name = "PullRequests"
+
+    def __init__(self, funded=(DEV_PRIVATE_KEY,), rpc_latency_ms=0.0):
+        abi = load_abi(self.contract_name)
+        self.functions = {function_abi_to_4byte_selector(item): item for item in abi if item["type"] == "function"}
+        self.events = {item["name"]: item for item in abi if item["type"] == "event"}
+        self.latency = rpc_latency_ms / 1000.0
+        self.lock = threading.Lock()
+        self.balances = {Account.from_key(key).address: 1000 * 10**18 for key in funded}
+        self.nonces = {}
+        self.pull_requests = {}  # id -> [(id, project, developer, timestamp, status, isLogged)]
+        self.developer_pull_requests = {}
+        self.pull_request_count = 0
+        self.blocks = [{"number": 0, "hash": keccak(b"genesis"), "timestamp": int(time.time()), "transactions": []}]
+        self.transactions = {}
+        self.receipts = {}
+        self.logs = []
+        self.listeners = []  # called as listener(block, logs) for every mined block; must not block
+
+    # --- PullRequests.sol -------------------------------------------------
+
+    def _log_pull_request(self, pr_id, project, developer, timestamp, status, apply):
+        if status not in VALID_STATUSES:
+            raise Revert("Invalid status")
+        if self.pull_requests.get(pr_id) and self.pull_requests[pr_id][0][5]:
+            raise Revert("Pull request already logged")
+        if not apply:
+            return []
+        self.pull_requests.setdefault(pr_id, []).append((pr_id, project, developer, timestamp, status, True))
+        self.developer_pull_requests.setdefault((developer, project), []).append(pr_id)
+        self.pull_request_count += 1
+        return [("PullRequestLogged", [pr_id], encode(["string"] * 4, [project, developer, timestamp, status]))]
+
+    def _update_pull_request_status(self, pr_id, project, new_status, timestamp, apply):
+        history = self.pull_requests.get(pr_id)
+        if not history:
+            raise Revert("Pull request does not exist")
+        if not history[0][5]:
+            raise Revert("Pull request not logged")
+        if history[-1][4] == new_status:
+            raise Revert("Status unchanged")
+        if new_status not in VALID_STATUSES:
+            raise Revert("Invalid status")
+        if not apply:
+            return []
+        developer = history[0][2]
+        history.append((pr_id, project, developer, timestamp, new_status, True))
+        ids = self.developer_pull_requests.setdefault((developer, project), [])
+        if pr_id not in ids:
+            ids.append(pr_id)
+        self.pull_request_count += 1
+        return [("PullRequestStatusUpdated", [pr_id], encode(["string"] * 4, [project, developer, timestamp, new_status]))]
+
+    def _view(self, name, args):
+        if name == "getPullRequest":
+            history = self.pull_requests.get(args[0])
+            return history[-1] if history else (0, "", "", "", "", False)
+        if name in ("getPullRequestCount", "pullRequestCount"):
+            return (self.pull_request_count,)
+        if name == "getPullRequestsByDeveloper":
+            return (self.developer_pull_requests.get((args[0], args[1]), []),)
+        if name == "getPullRequestHistory":
+            return (self.pull_requests.get(args[0], []),)
+        if name == "getPullRequestsByDeveloperPage":
+            return _page(self.developer_pull_requests.get((args[0], args[1]), []), args[2], args[3])
+        if name == "getPullRequestHistoryPage":
+            return _page(self.pull_requests.get(args[0], []), args[1], args[2])
+        if name == "pullRequests":
+            history = self.pull_requests.get(args[0], [])
+            if args[1] >= len(history):
+                raise Revert("index out of bounds")
+            return history[args[1]]
+        if name == "developerPullRequests":
+            ids = self.developer_pull_requests.get((args[0], args[1]), [])
+            if args[2] >= len(ids):
+                raise Revert("index out of bounds")
+            return (ids[args[2]],)
+        raise RpcError(f"unsupported view {name}")
+
+    def _execute(self, data, apply):
+        """Run calldata against the contract; returns (abi outputs or None, events)."""
+        item = self.functions.get(bytes(data[:4]))
+        if item is None:
+            raise Revert("unknown function selector")
+        args = decode([i["type"] for i in item["inputs"]], bytes(data[4:]))
+        if item["name"] == "logPullRequest":
+            return None, self._log_pull_request(*args, apply=apply)
+        if item["name"] == "updatePullRequestStatus":
+            return None, self._update_pull_request_status(*args, apply=apply)
+        outputs = self._view(item["name"], args)
+        types = [output["type"] if output["type"] != "tuple[]" else
+                 "(" + ",".join(c["type"] for c in output["components"]) + ")[]" for output in item["outputs"]]
+        return encode(types, list(outputs)), []
+
+    # --- JSON-RPC ----------------------------------------------------------
+
+    def _block_number(self, tag):
+        if tag in (None, "latest", "pending", "safe", "finalized"):
+            return len(self.blocks) - 1
+        if tag == "earliest":
+            return 0
+        return int(tag, 16) if isinstance(tag, str) else int(tag)
+
+    def _mine(self, tx, events):
+        number = len(self.blocks)
+        block_hash = keccak(tx["hash"] + number.to_bytes(8, "big"))
+        logs = []
+        for index, (name, indexed, data) in enumerate(events):
+            topics = [event_abi_to_log_topic(self.events[name])]
+            topics += [t.to_bytes(32, "big") if isinstance(t, int) else t for t in indexed]
+            logs.append({
+                "address": CONTRACT_ADDRESS,
+                "topics": [_hex(t) for t in topics],
+                "data": _hex(data),
+                "blockNumber": hex(number), "blockHash": _hex(block_hash),
+                "transactionHash": _hex(tx["hash"]), "transactionIndex": "0x0",
+                "logIndex": hex(index), "removed": False,
+            })
+        gas_used = 21000 + 16 * len(tx["data"]) + 45000 * len(events)
+        self.blocks.append({"number": number, "hash": block_hash, "timestamp": int(time.time()), "transactions": [tx["hash"]]})
+        self.logs.extend(logs)
+        self.receipts[tx["hash"]] = {
+            "transactionHash": _hex(tx["hash"]), "transactionIndex": "0x0",
+            "blockHash": _hex(block_hash), "blockNumber": hex(number),
+            "from": tx["from"], "to": tx["to"], "contractAddress": None,
+            "cumulativeGasUsed": hex(gas_used), "gasUsed": hex(gas_used),
+            "effectiveGasPrice": hex(tx["gasPrice"]), "logs": logs,
+            "logsBloom": "0x" + "00" * 256, "status": "0x1", "type": "0x0",
+        }
+        self.balances[tx["from"]] = self.balances.get(tx["from"], 0) - gas_used * tx["gasPrice"]
+        for listener in self.listeners:
+            listener(self._block(number), logs)
+
+    def _block(self, number):
+        block = self.blocks[number]
+        return {
+            "number": hex(number), "hash": _hex(block["hash"]),
+            "parentHash": _hex(self.blocks[number - 1]["hash"]) if number else "0x" + "00" * 32,
+            "timestamp": hex(block["timestamp"]), "transactions": [_hex(h) for h in block["transactions"]],
+            "gasLimit": hex(30_000_000), "gasUsed": "0x0", "baseFeePerGas": hex(GAS_PRICE),
+            "extraData": "0x", "miner": "0x" + "00" * 20, "difficulty": "0x0", "totalDifficulty": "0x0",
+            "nonce": "0x0000000000000000", "sha3Uncles": "0x" + "00" * 32, "logsBloom": "0x" + "00" * 256,
+            "stateRoot": "0x" + "00" * 32, "receiptsRoot": "0x" + "00" * 32, "transactionsRoot": "0x" + "00" * 32,
+            "mixHash": "0x" + "00" * 32, "size": "0x0", "uncles": [],
+        }
+
+    def call(self, method, params):
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            return self._dispatch(method, params)
+
+    def _dispatch(self, method, params):
+        if method == "eth_chainId":
+            return hex(CHAIN_ID)
+        if method == "net_version":
+            return str(CHAIN_ID)
+        if method == "web3_clientVersion":
+            return "FakeChain/PullRequests/v1"
+        if method == "eth_blockNumber":
+            return hex(len(self.blocks) - 1)
+        if method == "eth_gasPrice":
+            return hex(GAS_PRICE)
+        if method == "eth_maxPriorityFeePerGas":
+            return hex(10**9)
+        if method == "eth_accounts":
+            return []
+        if method == "eth_getBalance":
+            return hex(self.balances.get(to_checksum_address(params[0]), 0))
+        if method == "eth_getTransactionCount":
+            return hex(self.nonces.get(to_checksum_address(params[0]), 0))
+        if method == "eth_getCode":
+            return "0x6080" if to_checksum_address(params[0]) == CONTRACT_ADDRESS else "0x"
+        if method == "eth_getBlockByNumber":
+            number = self._block_number(params[0])
+            return self._block(number) if number < len(self.blocks) else None
+        if method in ("eth_call", "eth_estimateGas"):
+            tx = params[0]
+            if to_checksum_address(tx.get("to", "0x" + "00" * 20)) != CONTRACT_ADDRESS:
+                return "0x" if method == "eth_call" else hex(21000)
+            result, events = self._execute(bytes.fromhex((tx.get("data") or tx.get("input") or "0x")[2:]), apply=False)
+            if method == "eth_call":
+                return _hex(result or b"")
+            return hex(21000 + 16 * len(tx.get("data") or "") // 2 + 45000 * max(len(events), 1))
+        if method == "eth_sendRawTransaction":
+            tx = decode_raw_transaction(bytes.fromhex(params[0][2:]))
+            if tx["chainId"] not in (None, CHAIN_ID):
+                raise RpcError(f"invalid chain id {tx['chainId']}, expected {CHAIN_ID}")
+            expected = self.nonces.get(tx["from"], 0)
+            if tx["nonce"] != expected:
+                raise RpcError(f"nonce {'too low' if tx['nonce'] < expected else 'too high'}: expected {expected}, got {tx['nonce']}")
+            if self.balances.get(tx["from"], 0) < tx["gas"] * tx["gasPrice"]:
+                raise RpcError("insufficient funds for gas * price + value")
+            events = []
+            if tx["to"] == CONTRACT_ADDRESS:
+                events = self._execute(tx["data"], apply=True)[1]
+            self.nonces[tx["from"]] = expected + 1
+            self.transactions[tx["hash"]] = tx
+            self._mine(tx, events)
+            return _hex(tx["hash"])
+        if method == "eth_getTransactionReceipt":
+            return self.receipts.get(bytes.fromhex(params[0][2:]))
+        if method == "eth_getTransactionByHash":
+            tx = self.transactions.get(bytes.fromhex(params[0][2:]))
+            if tx is None:
+                return None
+            receipt = self.receipts[tx["hash"]]
+            return {
+                "hash": _hex(tx["hash"]), "from": tx["from"], "to": tx["to"], "nonce": hex(tx["nonce"]),
+                "gas": hex(tx["gas"]), "gasPrice": hex(tx["gasPrice"]), "value": hex(tx["value"]),
+                "input": _hex(tx["data"]), "blockNumber": receipt["blockNumber"], "blockHash": receipt["blockHash"],
+                "transactionIndex": "0x0", "chainId": hex(CHAIN_ID), "type": "0x0",
+                "v": "0x0", "r": "0x0", "s": "0x0",
+            }
+        if method == "eth_getLogs":
+            query = params[0]
+            start = self._block_number(query.get("fromBlock", "earliest"))
+            end = self._block_number(query.get("toBlock", "latest"))
+            addresses, topics = log_filter(query)
+            return [log for log in self.logs
+                    if start <= int(log["blockNumber"], 16) <= end and log_matches(log, addresses, topics)]
+        raise RpcError(f"method {method} not supported", -32601)
+
+
+class PullRequestsV2Chain(PullRequestsChain):
+    """PullRequestsV2.sol: enum status, hashed keys, one record per PR and history only in events."""
+
+    contract_name = "PullRequestsV2"
+
+    def _log_pull_request(self, pr_id, project, developer, timestamp, status, apply):
+        if status == 0:
+            raise Revert("Invalid status")
+        if pr_id in self.pull_requests:
+            raise Revert("Pull request already logged")
+        if not apply:
+            return []
+        project_key, developer_key = keccak(text=project), keccak(text=developer)
+        self.pull_requests[pr_id] = [project_key, developer_key, timestamp, status]
+        self.developer_pull_requests.setdefault((developer_key, project_key), []).append(pr_id)
+        self.pull_request_count += 1
+        data = encode(["string", "string", "uint64", "uint8"], [project, developer, timestamp, status])
+        return [("PullRequestLogged", [pr_id, project_key, developer_key], data)]
+
+    def _update_pull_request_status(self, pr_id, new_status, timestamp, apply):
+        record = self.pull_requests.get(pr_id)
+        if record is None:
+            raise Revert("Pull request does not exist")
+        old_status = record[3]
+        if old_status == new_status:
+            raise Revert("Status unchanged")
+        if new_status == 0:
+            raise Revert("Invalid status")
+        if not apply:
+            return []
+        record[2], record[3] = timestamp, new_status
+        data = encode(["uint64", "uint8", "uint8"], [timestamp, old_status, new_status])
+        return [("PullRequestStatusUpdated", [pr_id, record[0], record[1]], data)]
+
+    def _view(self, name, args):
+        if name == "getPullRequest":
+            record = self.pull_requests.get(args[0])
+            return (args[0], *record, True) if record else (0, b"\0" * 32, b"\0" * 32, 0, 0, False)
+        if name in ("getPullRequestCount", "pullRequestCount"):
+            return (self.pull_request_count,)
+        if name == "getPullRequestsByDeveloper":
+            return (self.developer_pull_requests.get((keccak(text=args[0]), keccak(text=args[1])), []),)
+        if name == "getPullRequestsByDeveloperPage":
+            return _page(self.developer_pull_requests.get((keccak(text=args[0]), keccak(text=args[1])), []), args[2], args[3])
+        raise RpcError(f"unsupported view {name}")
+
+
+CHAINS = {chain.contract_name: chain for chain in (PullRequestsChain, PullRequestsV2Chain)}
+
+
+def rpc_response(chain, request):
+    """JSON-RPC response object for one request object."""
+    response = {"jsonrpc": "2.0", "id": request.get("id")}
+    try:
+        response["result"] = chain.call(request["method"], request.get("params") or [])
+    except RpcError as e:
+        response["error"] = {"code": e.code, "message": str(e)}
+        if e.data:
+            response["error"]["data"] = e.data
+    return response
+
+
+def make_handler(chain):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without this, Nagle and delayed ACKs add ~40ms per response
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            result = [rpc_response(chain, r) for r in body] if isinstance(body, list) else rpc_response(chain, body)
+            payload = json.dumps(result).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(chain, host="127.0.0.1", port=0):
+    """Start the JSON-RPC server on a background thread; returns (server, url)."""
+    server = ThreadingHTTPServer((host, port), make_handler(chain))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-chain", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+class WebSocketRpc:
+    """JSON-RPC over WebSocket with eth_subscribe("newHeads") and eth_subscribe("logs", filter)."""
+
+    def __init__(self, chain):
+        self.chain = chain
+        self.loop = None
+        self.subscriptions = {}  # id -> (connection, kind, (addresses, topics) for logs)
+        self.next_id = 0
+        chain.listeners.append(self._mined)
+
+    def _mined(self, block, logs):
+        # Called under the chain lock on an HTTP or executor thread; hand off to the loop
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._notify, block, logs)
+
+    def _notify(self, block, logs):
+        for subscription_id, (connection, kind, query) in list(self.subscriptions.items()):
+            results = [block] if kind == "newHeads" else [log for log in logs if log_matches(log, *query)]
+            for result in results:
+                message = {"jsonrpc": "2.0", "method": "eth_subscription",
+                           "params": {"subscription": subscription_id, "result": result}}
+                self.loop.create_task(connection.send(json.dumps(message)))
+
+    async def _call(self, connection, request):
+        method, params = request.get("method"), request.get("params") or []
+        if method == "eth_subscribe":
+            if params[0] not in ("newHeads", "logs"):
+                return {"jsonrpc": "2.0", "id": request.get("id"),
+                        "error": {"code": -32601, "message": f"subscription {params[0]} not supported"}}
+            self.next_id += 1
+            subscription_id = hex(self.next_id)
+            query = log_filter(params[1] if len(params) > 1 else {}) if params[0] == "logs" else None
+            self.subscriptions[subscription_id] = (connection, params[0], query)
+            return {"jsonrpc": "2.0", "id": request.get("id"), "result": subscription_id}
+        if method == "eth_unsubscribe":
+            return {"jsonrpc": "2.0", "id": request.get("id"), "result": self.subscriptions.pop(params[0], None) is not None}
+        return await self.loop.run_in_executor(None, rpc_response, self.chain, request)
+
+    async def handle(self, connection):
+        try:
+            async for message in connection:
+                body = json.loads(message)
+                if isinstance(body, list):
+                    result = [await self._call(connection, r) for r in body]
+                else:
+                    result = await self._call(connection, body)
+                await connection.send(json.dumps(result))
+        finally:
+            for subscription_id, (owner, _, _) in list(self.subscriptions.items()):
+                if owner is connection:
+                    del self.subscriptions[subscription_id]
+
+    async def serve(self, host, port, started):
+        self.loop = asyncio.get_running_loop()
+        async with serve_ws(self.handle, host, port) as server:
+            started.set_result(server.sockets[0].getsockname()[1])
+            await asyncio.Future()
+
+
+def serve_websocket(chain, host="127.0.0.1", port=0):
+    """Start the WebSocket JSON-RPC server on a background thread; returns its ws:// url."""
+    started = Future()
+    rpc = WebSocketRpc(chain)
+    threading.Thread(target=lambda: asyncio.run(rpc.serve(host, port, started)), name="fake-chain-ws", daemon=True).start()
+    return f"ws://{host}:{started.result(timeout=10)}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8545)
+    parser.add_argument("--rpc-latency-ms", type=float, default=0.0, help="added to every RPC call")
+    parser.add_argument("--contract-name", choices=sorted(CHAINS), default="PullRequests")
+    parser.add_argument("--ws-port", type=int, help="also serve JSON-RPC and eth_subscribe over WebSocket on this port")
+    args = parser.parse_args()
+
+    chain = CHAINS[args.contract_name](rpc_latency_ms=args.rpc_latency_ms)
+    server, url = serve(chain, args.host, args.port)
+    if args.ws_port is not None:
+        url += " and " + serve_websocket(chain, args.host, args.ws_port)
+    print(f"Fake {args.contract_name} chain on {url} (chain id {CHAIN_ID}, contract {CONTRACT_ADDRESS})", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Local stand-in for the parts of the GitHub REST API the routes use.
+
+Serves synthetic repositories whose PR and file counts are set on the
+command line. Content is derived from the PR and file numbers, so every run
+sees the same data. Review, merge and close calls are accepted but change
+nothing, so repeated runs stay comparable.
+
+    python -m benchmarks.fake_github --port 9100 --prs 20 --files 8 --latency-ms 30
+"""
+import argparse
+import base64
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+OWNER = "bench-admin"
+PROJECT_PREFIX = "bench-project-"
+
+# Every third Python file and every fourth JS file carries a risky sink, so
+# both the pre-filter skip path and the scanner path are exercised
+PY_TEMPLATE = """import json
+
+
+def handler_{pr}_{index}(payload):
+    data = json.loads(payload)
+    total = 0
+    for item in data.get("items", []):
+        total += int(item.get("value", 0))
+{body}    return total
+"""
+JS_TEMPLATE = """export function handler{pr}_{index}(payload) {{
+  const data = JSON.parse(payload);
+  let total = 0;
+  for (const item of data.items || []) {{
+    total += Number(item.value || 0);
+  }}
+{body}  return total;
+}}
+"""
+
+
+def developer_login(pr_number, developers):
+    return f"bench-dev-{pr_number % developers}"
+
+
+def file_content(pr_number, index, lines):
+    if index % 2 == 0:
+        risky = index % 3 == 0
+        body = "".join(f"    total += len(str(data)) * {n}\n" for n in range(lines))
+        if risky:
+            body += "    eval(data.get('expr', '0'))\n"
+        return f"src/module_{pr_number}_{index}.py", PY_TEMPLATE.format(pr=pr_number, index=index, body=body)
+    risky = index % 4 == 1
+    body = "".join(f"  total += String(data).length * {n};\n" for n in range(lines))
+    if risky:
+        body += "  eval(data.expr);\n"
+    return f"web/module_{pr_number}_{index}.js", JS_TEMPLATE.format(pr=pr_number, index=index, body=body)
+
+
+def pr_state(pr_number):
+    """Mix of open, merged and closed PRs, like a real project's history."""
+    if pr_number % 5 == 0:
+        return "closed", "2024-02-01T00:00:00Z"
+    if pr_number % 7 == 0:
+        return "closed", None
+    return "open", None
+
+
+class FakeGitHub:
+    def __init__(self, projects=1, prs=20, files=8, lines=40, developers=3, latency_ms=0.0):
+        self.projects = projects
+        self.prs = prs
+        self.files = files
+        self.lines = lines
+        self.developers = developers
+        self.latency = latency_ms / 1000.0
+        self.base_url = None
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def project_names(self):
+        return [f"{PROJECT_PREFIX}{i}" for i in range(self.projects)]
+
+    def pull(self, repo, number):
+        state, merged_at = pr_state(number)
+        return {
+            "number": number,
+            "state": state,
+            "merged_at": merged_at,
+            "created_at": f"2024-01-{1 + number % 28:02d}T12:00:00Z",
+            "user": {"login": developer_login(number, self.developers)},
+            "head": {"sha": f"{number:040x}"},
+            "title": f"Synthetic PR {number} for {repo}",
+        }
+
+    def handle(self, method, path, query):
+        """Return (status, body) for one API call."""
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            self.requests += 1
+
+        match = re.match(r"^/repos/([^/]+)/([^/]+)(/.*)?$", path)
+        if not match or match.group(1) != OWNER or match.group(2) not in self.project_names():
+            return 404, {"message": "Not Found"}
+        repo, rest = match.group(2), match.group(3) or ""
+
+        if rest == "" and method == "GET":
+            return 200, {"name": repo, "full_name": f"{OWNER}/{repo}", "private": False}
+        if rest == "/pulls" and method == "GET":
+            state = query.get("state", ["open"])[0]
+            pulls = [self.pull(repo, n) for n in range(1, self.prs + 1)]
+            if state != "all":
+                pulls = [p for p in pulls if p["state"] == state]
+            return 200, pulls
+
+        match = re.match(r"^/pulls/(\d+)(/files|/reviews|/merge)?$", rest)
+        if match:
+            number, action = int(match.group(1)), match.group(2)
+            if number < 1 or number > self.prs:
+                return 404, {"message": "Not Found"}
+            if action == "/files" and method == "GET":
+                files = []
+                for index in range(self.files):
+                    filename, content = file_content(number, index, self.lines)
+                    files.append({
+                        "filename": filename,
+                        "status": "modified",
+                        "contents_url": f"{self.base_url}/repos/{OWNER}/{repo}/contents/{filename}?ref={number:040x}",
+                        "patch": "@@ -1,3 +1,3 @@\n" + "\n".join("+" + line for line in content.splitlines()[:5]),
+                    })
+                return 200, files
+            if action == "/reviews" and method == "POST":
+                return 200, {"id": number, "state": "APPROVED"}
+            if action == "/merge" and method == "PUT":
+                return 200, {"merged": True, "message": "Pull Request successfully merged"}
+            if action is None and method == "PATCH":
+                return 200, dict(self.pull(repo, number), state="closed")
+            if action is None and method == "GET":
+                return 200, self.pull(repo, number)
+
+        match = re.match(r"^/contents/web/module_(\d+)_(\d+)\.js$|^/contents/src/module_(\d+)_(\d+)\.py$", rest)
+        if match and method == "GET":
+            pr_number, index = (int(g) for g in (match.group(1, 2) if match.group(1) else match.group(3, 4)))
+            filename, content = file_content(pr_number, index, self.lines)
+            return 200, {
+                "name": filename.rsplit("/", 1)[-1],
+                "path": filename,
+                "encoding": "base64",
+                "content": base64.encodebytes(content.encode()).decode(),
+            }
+        return 404, {"message": "Not Found"}
+
+
+def make_handler(github):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without this, Nagle and delayed ACKs add ~40ms per response
+        disable_nagle_algorithm = True
+
+        def _respond(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                self.rfile.read(length)
+            url = urlparse(self.path)
+            status, body = github.handle(self.command, url.path, parse_qs(url.query))
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_POST = do_PUT = do_PATCH = _respond
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(github, host="127.0.0.1", port=0):
+    """Start the server on a background thread; returns the server (its URL is github.base_url)."""
+    server = ThreadingHTTPServer((host, port), make_handler(github))
+    server.daemon_threads = True
+    github.base_url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, name="fake-github", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--projects", type=int, default=1)
+    parser.add_argument("--prs", type=int, default=20)
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--lines", type=int, default=40, help="filler lines per synthetic file")
+    parser.add_argument("--developers", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every API call")
+    args = parser.parse_args()
+
+    github = FakeGitHub(args.projects, args.prs, args.files, args.lines, args.developers, args.latency_ms)
+    server = serve(github, args.host, args.port)
+    print(f"Fake GitHub API on {github.base_url}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Load test: concurrent admins, developers and auditors on their dashboards.
+
+Each virtual user logs in and then loops over its role's pages with a
+think time between requests:
+  admin      GET /admin/pull_requests/<project>
+  developer  GET /dev/pullrequests, GET /dev/leaderboard
+  auditor    GET /auditor/dashboard
+It logs in again every --login-every iterations, so POST /api/auth/login
+and its bcrypt cost are measured under the same load; with SESSION_SECRET
+set the returned token is sent on the following requests. --steps scales
+the --admins, --developers-online and --auditors-online counts. For each
+gunicorn configuration in --configs the harness reports p50/p95/p99, error
+rate and throughput per endpoint and step, and the step where each
+endpoint saturated.
+
+    cd backend && MONGO_URI=mongodb://localhost:27017 python -m benchmarks.load \\
+        --configs gthread:2x8 sync:4x1 --steps 1 2 4 8 --duration 30
+"""
+import argparse
+import copy
+import random
+import threading
+import time
+import requests
+from benchmarks.report import Samples, format_table, wire_bytes, write_json
+from benchmarks.stack import BENCH_PASSWORD, BenchStack, add_stack_arguments
+
+LOGIN = "POST /api/auth/login"
+
+
+class VirtualUser(threading.Thread):
+    def __init__(self, stack, role, email, options, stop, record):
+        super().__init__(daemon=True)
+        self.stack = stack
+        self.role = role
+        self.email = email
+        self.options = options
+        self.stop = stop
+        self.record = record
+        self.session = requests.Session()
+        self.token = None
+        self.random = random.Random(f"{role}:{email}")
+
+    def request(self, name, method, url, **kwargs):
+        headers = {"X-User-Email": self.email, "Accept-Encoding": self.options.accept_encoding}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, headers=headers, timeout=self.options.timeout, **kwargs)
+            ok, size = response.status_code < 400, wire_bytes(response)
+        except requests.RequestException:
+            response, ok, size = None, False, 0
+        self.record(name, started, time.perf_counter(), ok, size)
+        return response
+
+    def login(self):
+        response = self.request(LOGIN, "POST", f"{self.stack.app_url}/api/auth/login",
+                                json={"email": self.email, "password": BENCH_PASSWORD})
+        if response is not None and response.status_code == 200:
+            self.token = response.json().get("token")
+
+    def pages(self, project):
+        base = self.stack.app_url
+        if self.role == "admin":
+            return [("GET /admin/pull_requests", f"{base}/admin/pull_requests/{project}")]
+        if self.role == "developer":
+            return [("GET /dev/pullrequests", f"{base}/dev/pullrequests?project={project}"),
+                    ("GET /dev/leaderboard", f"{base}/dev/leaderboard?project={project}")]
+        return [("GET /auditor/dashboard", f"{base}/auditor/dashboard?projectName={project}")]
+
+    def run(self):
+        projects = self.stack.github.project_names()
+        # Spread the first requests out instead of having every user fire at once
+        self.stop.wait(self.random.uniform(0, self.options.think_ms / 1000.0))
+        iteration = 0
+        while not self.stop.is_set():
+            if iteration % self.options.login_every == 0:
+                self.login()
+            for name, url in self.pages(self.random.choice(projects)):
+                if self.stop.is_set():
+                    break
+                self.request(name, "GET", url)
+                self.stop.wait(self.random.expovariate(1000.0 / self.options.think_ms) if self.options.think_ms else 0)
+            iteration += 1
+
+
+def run_step(stack, options, scale):
+    """Run scale x the configured users for --duration seconds; returns per-endpoint summaries."""
+    samples = {}
+    lock = threading.Lock()
+    measuring = threading.Event()
+
+    def record(name, started, finished, ok, size):
+        if not measuring.is_set():
+            return
+        with lock:
+            samples.setdefault(name, Samples(name)).add(started, finished, ok, size)
+
+    stop = threading.Event()
+    users = []
+    for role, count in (("admin", options.admins), ("developer", options.developers_online), ("auditor", options.auditors_online)):
+        emails = stack.users[role]
+        users.extend(VirtualUser(stack, role, emails[i % len(emails)], options, stop, record) for i in range(count * scale))
+    for user in users:
+        user.start()
+    time.sleep(options.ramp)
+    measuring.set()
+    time.sleep(options.duration)
+    measuring.clear()
+    stop.set()
+    for user in users:
+        user.join(options.timeout)
+    return [samples[name].summary() for name in sorted(samples)]
+
+
+def saturation(steps, options):
+    """For each endpoint, the first step where throughput stopped growing, p95 broke the SLO or errors appeared."""
+    verdicts = {}
+    previous = {}
+    for scale, summaries in steps:
+        for s in summaries:
+            name = s["endpoint"]
+            if name in verdicts:
+                continue
+            reason = None
+            if s["error_rate"] > options.max_error_rate:
+                reason = f"error rate {s['error_rate']:.1%}"
+            elif s["p95_ms"] > options.slo_ms:
+                reason = f"p95 {s['p95_ms']:.0f}ms > {options.slo_ms:.0f}ms"
+            elif name in previous and s["throughput_rps"] < previous[name] * 1.1:
+                reason = f"throughput flat ({previous[name]:.1f} -> {s['throughput_rps']:.1f} req/s)"
+            if reason:
+                verdicts[name] = f"saturated at {scale}x users: {reason}"
+            previous[name] = s["throughput_rps"]
+    for name in previous:
+        verdicts.setdefault(name, f"not saturated up to {steps[-1][0]}x users")
+    return verdicts
+
+
+def parse_config(spec):
+    """'gthread:2x8' -> ('gthread', 2, 8)."""
+    worker_class, _, shape = spec.partition(":")
+    workers, _, threads = (shape or "2x1").partition("x")
+    return worker_class, int(workers), int(threads or 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--configs", nargs="+", default=["gthread:2x8"], help="gunicorn worker_class:workersxthreads")
+    parser.add_argument("--admins", type=int, default=1, help="online admins per step unit")
+    parser.add_argument("--developers-online", type=int, default=2, help="online developers per step unit")
+    parser.add_argument("--auditors-online", type=int, default=1, help="online auditors per step unit")
+    parser.add_argument("--steps", type=int, nargs="+", default=[1, 2, 4, 8], help="user multipliers, run in order")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds per step")
+    parser.add_argument("--ramp", type=float, default=5.0, help="unmeasured seconds at the start of each step")
+    parser.add_argument("--think-ms", type=float, default=500.0, help="mean pause between a user's requests")
+    parser.add_argument("--login-every", type=int, default=10, help="iterations between a user's logins")
+    parser.add_argument("--accept-encoding", default="gzip", help="Accept-Encoding sent by every user (identity disables compression)")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--slo-ms", type=float, default=5000.0, help="p95 above this counts as saturated")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--json", help="also write the results to this file")
+    add_stack_arguments(parser)
+    options = parser.parse_args()
+
+    results = []
+    for spec in options.configs:
+        worker_class, workers, threads = parse_config(spec)
+        stack_options = copy.copy(options)
+        stack_options.worker_class, stack_options.workers, stack_options.threads = worker_class, workers, threads
+        steps = []
+        with BenchStack(stack_options) as stack:
+            for scale in options.steps:
+                summaries = run_step(stack, options, scale)
+                steps.append((scale, summaries))
+                users = scale * (options.admins + options.developers_online + options.auditors_online)
+                print(format_table(summaries, f"\n{spec}  step {scale}x ({users} users, {options.duration:.0f}s)"), flush=True)
+        verdicts = saturation(steps, options)
+        print(f"\n{spec} saturation:")
+        for name, verdict in sorted(verdicts.items()):
+            print(f"  {name}: {verdict}")
+        results.append({"config": spec, "steps": [{"scale": scale, "results": s} for scale, s in steps], "saturation": verdicts})
+
+    if options.json:
+        write_json(options.json, {"options": vars(options), "results": results})
+
+
+if __name__ == "__main__":
+    main()
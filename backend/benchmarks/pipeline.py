@@ -0,0 +1,102 @@
+"""PR pipeline benchmark: latency and throughput of the three PR listing endpoints.
+
+Starts the fake GitHub, fake Bearer and chain stand-ins, seeds MONGO_URI's
+`--mongo-db` database, runs the app under gunicorn, then calls
+/admin/pull_requests/<project>, /dev/pullrequests and /auditor/dashboard.
+
+    cd backend && MONGO_URI=mongodb://localhost:27017 python -m benchmarks.pipeline --prs 20 --files 8
+
+The warm-up requests log the synthetic PRs on chain, so the measured
+requests cover the steady state, where every PR is already logged. Use
+`--no-scan-cache` to make every request pay for scanning. Each endpoint is
+measured once per `--encodings` value (sent as Accept-Encoding), so avg_kb,
+the compressed size on the wire, can be compared with and without
+compression.
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from benchmarks.report import Samples, format_table, wire_bytes, write_json
+from benchmarks.stack import BenchStack, add_stack_arguments
+
+ENDPOINTS = ("admin", "developer", "auditor")
+ENCODINGS = ("identity", "gzip", "br")
+_local = threading.local()
+
+
+def endpoint_request(stack, endpoint, project, index=0):
+    """(name, url, headers) for one call of a PR listing endpoint as a seeded user."""
+    if endpoint == "admin":
+        return "GET /admin/pull_requests", f"{stack.app_url}/admin/pull_requests/{project}", {"X-User-Email": stack.users["admin"][0]}
+    if endpoint == "developer":
+        users = stack.users["developer"]
+        return "GET /dev/pullrequests", f"{stack.app_url}/dev/pullrequests?project={project}", {"X-User-Email": users[index % len(users)]}
+    users = stack.users["auditor"]
+    return "GET /auditor/dashboard", f"{stack.app_url}/auditor/dashboard?projectName={project}", {"X-User-Email": users[index % len(users)]}
+
+
+def session():
+    """One keep-alive session per client thread."""
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def timed_get(url, headers, timeout):
+    started = time.perf_counter()
+    try:
+        response = session().get(url, headers=headers, timeout=timeout)
+        return started, time.perf_counter(), response.status_code == 200, wire_bytes(response)
+    except requests.RequestException:
+        return started, time.perf_counter(), False, 0
+
+
+def run(stack, options):
+    projects = stack.github.project_names()
+    for endpoint in options.endpoints:
+        for i in range(options.warmup):
+            _, url, headers = endpoint_request(stack, endpoint, projects[i % len(projects)], i)
+            session().get(url, headers=headers, timeout=options.timeout)
+
+    summaries = []
+    for endpoint in options.endpoints:
+        for encoding in options.encodings:
+            samples = None
+            with ThreadPoolExecutor(max_workers=options.concurrency) as pool:
+                calls = []
+                for i in range(options.iterations):
+                    name, url, headers = endpoint_request(stack, endpoint, projects[i % len(projects)], i)
+                    samples = samples or Samples(f"{name} [{encoding}]")
+                    calls.append(pool.submit(timed_get, url, {**headers, "Accept-Encoding": encoding}, options.timeout))
+                for call in calls:
+                    samples.add(*call.result())
+            summaries.append(samples.summary())
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--warmup", type=int, default=2, help="untimed requests per endpoint")
+    parser.add_argument("--iterations", type=int, default=20, help="timed requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--encodings", nargs="+", choices=ENCODINGS, default=["identity", "gzip"],
+                        help="Accept-Encoding values to measure each endpoint with (br needs brotli on the server)")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--json", help="also write the results to this file")
+    add_stack_arguments(parser)
+    options = parser.parse_args()
+
+    with BenchStack(options) as stack:
+        summaries = run(stack, options)
+    title = (f"PR pipeline: {options.prs} PRs x {options.files} files, GitHub +{options.github_latency_ms:.0f}ms, "
+             f"chain={options.chain}, {options.worker_class} {options.workers}x{options.threads}, concurrency {options.concurrency}")
+    print(format_table(summaries, title))
+    if options.json:
+        write_json(options.json, {"config": vars(options), "results": summaries})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Latency percentiles and the result table shared by the benchmark entry points."""
+import json
+import math
+
+
+def wire_bytes(response):
+    """Body size of a requests response as sent, before requests decompresses it."""
+    length = response.headers.get("Content-Length")
+    if length is not None:
+        return int(length)
+    # Chunked responses: the raw stream's count, if urllib3 kept one
+    return response.raw.tell() or len(response.content)
+
+
+class Samples:
+    """Latencies (seconds), status codes and response sizes on the wire for one endpoint."""
+
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []
+        self.errors = 0
+        self.bytes = 0
+        self.started = None
+        self.finished = None
+
+    def add(self, started, finished, ok, size=0):
+        self.latencies.append(finished - started)
+        self.errors += 0 if ok else 1
+        self.bytes += size
+        self.started = started if self.started is None else min(self.started, started)
+        self.finished = finished if self.finished is None else max(self.finished, finished)
+
+    def percentile(self, p):
+        if not self.latencies:
+            return float("nan")
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(p / 100.0 * len(ordered)) - 1))]
+
+    def summary(self):
+        count = len(self.latencies)
+        elapsed = (self.finished - self.started) if count else 0.0
+        return {
+            "endpoint": self.name,
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": self.errors / count if count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": max(self.latencies) * 1000 if count else float("nan"),
+            "throughput_rps": count / elapsed if elapsed else 0.0,
+            "avg_kb": self.bytes / count / 1024 if count else 0.0,
+        }
+
+
+COLUMNS = ("endpoint", "requests", "errors", "p50_ms", "p95_ms", "p99_ms", "max_ms", "throughput_rps", "avg_kb")
+
+
+def format_table(summaries, title=None, columns=COLUMNS):
+    rows = [[_cell(s[c]) for c in columns] for s in summaries]
+    widths = [max(len(c), *(len(r[i]) for r in rows)) if rows else len(c) for i, c in enumerate(columns)]
+    lines = [title] if title else []
+    lines.append("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    lines.extend("  ".join(cell.ljust(w) for cell, w in zip(row, widths)) for row in rows)
+    return "\n".join(lines)
+
+
+def _cell(value):
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return str(value)
+
+
+def write_json(path, results):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
@@ -0,0 +1,246 @@
+"""Starts the stand-ins, seeds Mongo and runs the Flask app under gunicorn for a benchmark."""
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import time
+import requests
+from pymongo import MongoClient
+from config.services import PULLREQUESTS_CONTRACT
+from benchmarks.fake_chain import CHAIN_ID, CONTRACT_ADDRESS, DEV_PRIVATE_KEY
+from benchmarks.fake_github import OWNER, FakeGitHub
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+FAKE_BEARER_DIR = os.path.join(BACKEND_DIR, "benchmarks", "bin")
+BENCH_PASSWORD = "bench-password"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(url, timeout=60, method="get", **kwargs):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if getattr(requests, method)(url, timeout=2, **kwargs).status_code < 500:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def spawn_module(module, *args, env=None):
+    """Run a benchmarks module in a child process and return (process, the URL it announces)."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", module, "--port", "0", *args],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, text=True,
+    )
+    line = process.stdout.readline()
+    url = next((word for word in line.split() if word.startswith("http://")), None)
+    if url is None:
+        process.kill()
+        raise RuntimeError(f"{module} failed to start: {line!r}")
+    return process, url
+
+
+def deploy_to_ganache(rpc_url, contract_name=PULLREQUESTS_CONTRACT):
+    """Deploy a contract from Brownie's build output; returns its address."""
+    from web3 import Web3
+
+    artifact = os.path.join(REPO_DIR, "blockchain", "build", "contracts", f"{contract_name}.json")
+    if not os.path.exists(artifact):
+        raise RuntimeError(f"{artifact} not found; run `brownie compile` in blockchain/ first")
+    with open(artifact) as f:
+        build = json.load(f)
+    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    account = w3.eth.account.from_key(DEV_PRIVATE_KEY)
+    tx = w3.eth.contract(abi=build["abi"], bytecode=build["bytecode"]).constructor().build_transaction({
+        "from": account.address, "nonce": w3.eth.get_transaction_count(account.address), "chainId": CHAIN_ID,
+    })
+    receipt = w3.eth.wait_for_transaction_receipt(w3.eth.send_raw_transaction(account.sign_transaction(tx).raw_transaction))
+    return receipt["contractAddress"]
+
+
+def start_chain(options, processes, contract_name=PULLREQUESTS_CONTRACT):
+    """Start (or connect to) the chain chosen by --chain; returns (rpc url, contract address).
+
+    Child processes are appended to `processes` for the caller to stop.
+    """
+    o = options
+    if o.chain == "external":
+        return o.chain_rpc, o.contract or deploy_to_ganache(o.chain_rpc, contract_name)
+    if o.chain == "ganache":
+        port = free_port()
+        npx = shutil.which("npx")
+        if not npx:
+            raise RuntimeError("--chain ganache needs Node.js (npx) on PATH")
+        processes.append(subprocess.Popen(
+            [npx, "--yes", "ganache", "--port", str(port), "--chain.chainId", str(CHAIN_ID),
+             "--wallet.accounts", f"{DEV_PRIVATE_KEY},{1000 * 10**18}", "--logging.quiet"],
+            stdout=subprocess.DEVNULL,
+        ))
+        rpc_url = f"http://127.0.0.1:{port}"
+        wait_for(rpc_url, method="post", json={"jsonrpc": "2.0", "id": 1, "method": "eth_chainId", "params": []})
+        return rpc_url, deploy_to_ganache(rpc_url, contract_name)
+    process, rpc_url = spawn_module("benchmarks.fake_chain", "--rpc-latency-ms", str(o.rpc_latency_ms), "--contract-name", contract_name)
+    processes.append(process)
+    return rpc_url, CONTRACT_ADDRESS
+
+
+def stop_processes(processes):
+    for process in reversed(processes):
+        if process.poll() is None:
+            process.send_signal(signal.SIGTERM)
+    for process in processes:
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    processes.clear()
+
+
+class BenchStack:
+    """Fake GitHub + fake Bearer + chain + seeded Mongo + the app, torn down on exit.
+
+    `options` is the parsed argparse namespace from add_stack_arguments().
+    """
+
+    def __init__(self, options):
+        self.options = options
+        self.processes = []
+        self.github = FakeGitHub(options.projects, options.prs, options.files, options.lines, options.developers)
+        self.app_url = options.app_url
+        self.users = {"admin": [], "developer": [], "auditor": []}
+
+    def __enter__(self):
+        try:
+            self.start()
+        except BaseException:
+            self.stop()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        o = self.options
+        github_process, github_url = spawn_module(
+            "benchmarks.fake_github",
+            "--projects", str(o.projects), "--prs", str(o.prs), "--files", str(o.files),
+            "--lines", str(o.lines), "--developers", str(o.developers), "--latency-ms", str(o.github_latency_ms),
+        )
+        self.processes.append(github_process)
+        rpc_url, contract_address = start_chain(self.options, self.processes)
+        self.seed_mongo()
+
+        if self.app_url:
+            return
+        port = free_port()
+        env = dict(
+            os.environ,
+            PORT=str(port),
+            GITHUB_API_URL=github_url,
+            GANACHE_RPC=rpc_url,
+            PULLREQUESTS_ADDRESS=contract_address,
+            PRIVATE_KEY=DEV_PRIVATE_KEY,
+            MONGO_DB=o.mongo_db,
+            PATH=FAKE_BEARER_DIR + os.pathsep + os.environ.get("PATH", ""),
+            FAKE_BEARER_STARTUP_MS=str(o.bearer_startup_ms),
+            FAKE_BEARER_PER_FILE_MS=str(o.bearer_per_file_ms),
+            GUNICORN_WORKER_CLASS=o.worker_class,
+            GUNICORN_WORKERS=str(o.workers),
+            GUNICORN_THREADS=str(o.threads),
+            GUNICORN_LOG_LEVEL="warning",
+            LOG_LEVEL=os.environ.get("LOG_LEVEL", "WARNING"),
+        )
+        if o.no_scan_cache:
+            env["SCAN_CACHE_SIZE"] = "0"
+        self.processes.append(subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "--access-logfile", os.devnull, "-c", "gunicorn.conf.py"],
+            cwd=BACKEND_DIR, env=env,
+        ))
+        self.app_url = f"http://127.0.0.1:{port}"
+        wait_for(self.app_url + "/")
+
+    def seed_mongo(self):
+        """Recreate MONGO_DB with one admin per project and the developers and auditors assigned to it."""
+        from config.passwords import hash_password
+
+        o = self.options
+        mongo_uri = os.environ.get("MONGO_URI")
+        if not mongo_uri:
+            raise RuntimeError("MONGO_URI must point at a MongoDB server; the benchmark uses database MONGO_DB (--mongo-db)")
+        client = MongoClient(mongo_uri)
+        client.drop_database(o.mongo_db)
+        db = client[o.mongo_db]
+        password = hash_password(BENCH_PASSWORD)
+        projects = self.github.project_names()
+        assigned = [{"projectName": name, "role": "developer", "assignedAt": "2024-01-01T00:00:00Z"} for name in projects]
+        docs = [{
+            "username": "bench-admin", "email": "admin@bench.local", "password": password, "role": "admin",
+            "githubUsername": OWNER, "githubToken": "bench-token-0000", "createdProjects": projects,
+        }]
+        for i in range(o.developers):
+            docs.append({
+                "username": f"bench-dev-{i}", "email": f"dev{i}@bench.local", "password": password,
+                "role": "developer", "githubUsername": f"bench-dev-{i}", "githubToken": "bench-token-0000",
+                "assignedProjects": assigned, "points": {},
+            })
+        for i in range(o.auditors):
+            docs.append({
+                "username": f"bench-auditor-{i}", "email": f"auditor{i}@bench.local", "password": password,
+                "role": "auditor", "githubUsername": f"bench-auditor-{i}", "githubToken": "bench-token-0000",
+                "assignedProjects": [dict(a, role="auditor") for a in assigned],
+            })
+        db.users.insert_many(docs)
+        db.projects.insert_many([
+            {"name": name, "adminGithubUsername": OWNER, "createdAt": "2024-01-01T00:00:00Z",
+             "githubRepoUrl": f"https://github.com/{OWNER}/{name}", "githubRepoId": None,
+             "webhookId": None, "webhookUrl": None}
+            for name in projects
+        ])
+        for doc in docs:
+            self.users[doc["role"]].append(doc["email"])
+        client.close()
+
+    def stop(self):
+        stop_processes(self.processes)
+
+
+def add_stack_arguments(parser):
+    group = parser.add_argument_group("stack")
+    group.add_argument("--projects", type=int, default=1)
+    group.add_argument("--prs", type=int, default=20, help="PRs per synthetic repository")
+    group.add_argument("--files", type=int, default=8, help="files per PR")
+    group.add_argument("--lines", type=int, default=40, help="filler lines per synthetic file")
+    group.add_argument("--developers", type=int, default=3)
+    group.add_argument("--auditors", type=int, default=1)
+    group.add_argument("--github-latency-ms", type=float, default=30.0)
+    group.add_argument("--bearer-startup-ms", type=float, default=400.0)
+    group.add_argument("--bearer-per-file-ms", type=float, default=15.0)
+    group.add_argument("--no-scan-cache", action="store_true", help="scan every file on every request")
+    add_chain_arguments(parser)
+    group.add_argument("--mongo-db", default="bench", help="database to recreate and seed (dropped first!)")
+    group.add_argument("--worker-class", default="gthread", choices=("sync", "gthread", "gevent"))
+    group.add_argument("--workers", type=int, default=2)
+    group.add_argument("--threads", type=int, default=8)
+    group.add_argument("--app-url", help="benchmark an already running app instead of starting gunicorn")
+    return parser
+
+
+def add_chain_arguments(parser):
+    group = parser.add_argument_group("chain")
+    group.add_argument("--chain", choices=("fake", "ganache", "external"), default="fake")
+    group.add_argument("--rpc-latency-ms", type=float, default=1.0, help="fake chain only")
+    group.add_argument("--chain-rpc", help="with --chain external")
+    group.add_argument("--contract", help="PullRequests address, with --chain external (deployed when omitted)")
+    return parser
@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import os
+import threading
+from dotenv import load_dotenv
+from eth_utils import event_abi_to_log_topic
+from web3 import AsyncIPCProvider, AsyncWeb3, Web3, WebSocketProvider
+from web3.exceptions import TimeExhausted, TransactionNotFound
+from config import registry
+from config.metrics import chain_push_events_total
+from config.services import pull_requests_abi, pull_requests_address, pull_requests_deploy_block
+
+load_dotenv()
+
+# Push-based chain events over a WebSocket (CHAIN_WS_URL) or IPC
+# (CHAIN_IPC_PATH) connection, next to the HTTP provider the routes use for
+# calls and transactions. A watcher thread per process keeps eth_subscribe
+# subscriptions to newHeads and to the PullRequests contract's
+# PullRequestLogged logs, and from them:
+#   - resolves receipt waits when the transaction's log or next block
+#     arrives, one eth_getTransactionReceipt per confirmation instead of
+#     polling every 100ms;
+#   - keeps pr id -> latest PullRequestLogged tx hash, backfilled once with
+#     eth_getLogs from the deploy block, so "already logged" PRs need no
+#     get_logs scan.
+# Without either setting, or while the socket is reconnecting, the helpers
+# below fall back to polling over HTTP.
+
+CHAIN_WS_URL = os.environ.get("CHAIN_WS_URL")
+CHAIN_IPC_PATH = os.environ.get("CHAIN_IPC_PATH")
+RECONNECT_MAX_SECONDS = 30
+
+logger = logging.getLogger(__name__)
+
+
+def make_socket_provider():
+    """Persistent provider for eth_subscribe, or None if no socket endpoint is configured."""
+    if CHAIN_WS_URL:
+        return WebSocketProvider(CHAIN_WS_URL)
+    if CHAIN_IPC_PATH:
+        return AsyncIPCProvider(CHAIN_IPC_PATH)
+    return None
+
+
+class ChainWatcher:
+    """Owns the subscription connection; its asyncio loop runs on a daemon thread."""
+
+    def __init__(self, provider_factory, contract_address, abi, from_block=0):
+        self.provider_factory = provider_factory
+        self.address = AsyncWeb3.to_checksum_address(contract_address)
+        self.abi = abi
+        self.from_block = from_block  # where the next backfill starts
+        self.live = threading.Event()  # set while subscribed and backfilled
+        self.w3 = None
+        self.logged = {}  # pr id -> (block number, log index, tx hash)
+        self.waiters = {}  # tx hash -> [asyncio.Future]; only touched on the loop
+        self.lock = threading.Lock()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_until_complete, args=(self._run(),), name="chain-watcher", daemon=True)
+        self.thread.start()
+
+    async def _run(self):
+        delay = 1
+        while True:
+            try:
+                await self._watch()
+            except Exception as e:
+                logger.warning("Chain subscription lost: %s; reconnecting in %ss", e, delay)
+            if self.live.is_set():
+                delay = 1
+            else:
+                delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+            self.live.clear()
+            self.w3 = None
+            await asyncio.sleep(delay)
+
+    async def _watch(self):
+        async with AsyncWeb3(self.provider_factory()) as w3:
+            event = w3.eth.contract(address=self.address, abi=self.abi).events.PullRequestLogged()
+            topic = Web3.to_hex(event_abi_to_log_topic(event.abi))
+            # Subscribe before backfilling so nothing mined in between is missed
+            heads = await w3.eth.subscribe("newHeads")
+            logs = await w3.eth.subscribe("logs", {"address": self.address, "topics": [topic]})
+            self.w3 = w3
+            for log in await w3.eth.get_logs({"address": self.address, "topics": [topic], "fromBlock": self.from_block}):
+                self._index(event.process_log(log))
+            # Transactions mined while the socket was down
+            for tx_hash in list(self.waiters):
+                await self._check_receipt(tx_hash)
+            self.live.set()
+            logger.info("Subscribed to newHeads and PullRequestLogged at %s", self.address)
+
+            async for message in w3.socket.process_subscriptions():
+                if message["subscription"] == heads:
+                    chain_push_events_total.inc("newHeads")
+                    for tx_hash in list(self.waiters):
+                        await self._check_receipt(tx_hash)
+                elif message["subscription"] == logs:
+                    chain_push_events_total.inc("logs")
+                    log = event.process_log(message["result"])
+                    self._index(log)
+                    await self._check_receipt(Web3.to_hex(log["transactionHash"]))
+
+    def _index(self, log):
+        entry = (log["blockNumber"], log["logIndex"], Web3.to_hex(log["transactionHash"]))
+        with self.lock:
+            pr_id = log["args"]["pullRequestId"]
+            if entry > self.logged.get(pr_id, (-1, -1, "")):
+                self.logged[pr_id] = entry
+        self.from_block = max(self.from_block, log["blockNumber"])
+
+    async def _check_receipt(self, tx_hash):
+        """Resolve the waiters for tx_hash if it has been mined."""
+        if tx_hash not in self.waiters or self.w3 is None:
+            return
+        try:
+            receipt = await self.w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            return
+        except Exception as e:
+            logger.debug("Receipt check for %s failed: %s", tx_hash, e)
+            return
+        for future in self.waiters.pop(tx_hash, []):
+            if not future.done():
+                future.set_result(receipt)
+
+    async def _wait_for_receipt(self, tx_hash, timeout):
+        future = self.loop.create_future()
+        self.waiters.setdefault(tx_hash, []).append(future)
+        try:
+            # It may have been mined before we started listening
+            await self._check_receipt(tx_hash)
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeExhausted(f"Transaction {tx_hash} is not in the chain after {timeout} seconds")
+        finally:
+            pending = self.waiters.get(tx_hash, [])
+            if future in pending:
+                pending.remove(future)
+            if not pending:
+                self.waiters.pop(tx_hash, None)
+
+    def receipt_future(self, tx_hash, timeout):
+        """concurrent.futures.Future of the receipt; fails with TimeExhausted after timeout seconds."""
+        tx_hash = Web3.to_hex(hexstr=tx_hash) if isinstance(tx_hash, str) else Web3.to_hex(tx_hash)
+        return asyncio.run_coroutine_threadsafe(self._wait_for_receipt(tx_hash, timeout), self.loop)
+
+    def logged_tx_hash(self, pr_id):
+        with self.lock:
+            entry = self.logged.get(pr_id)
+        return entry[2] if entry else None
+
+
+def start_chain_watcher():
+    """Registry factory: a running ChainWatcher, or None when no socket endpoint is configured."""
+    if not (CHAIN_WS_URL or CHAIN_IPC_PATH):
+        return None
+    return ChainWatcher(make_socket_provider, pull_requests_address(), pull_requests_abi(), pull_requests_deploy_block())
+
+
+def live_watcher():
+    """This process's watcher if it is subscribed right now, else None."""
+    watcher = registry.get("chain_watcher")
+    return watcher if watcher is not None and watcher.live.is_set() else None
+
+
+def _latest_logged(events):
+    # Tx hashes are 0x-prefixed hex strings everywhere, as waiters and API responses expect
+    return Web3.to_hex(max(events, key=lambda e: (e['blockNumber'], e['logIndex']))['transactionHash']) if events else None
+
+
+def wait_for_receipt(w3, tx_hash, timeout=300):
+    """Receipt of tx_hash, pushed by the watcher when one is live, else polled over HTTP."""
+    watcher = live_watcher()
+    if watcher is None:
+        return w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+    return watcher.receipt_future(tx_hash, timeout).result()
+
+
+def logged_tx_hash(contract, pr_id):
+    """Hash of the latest PullRequestLogged transaction for a PR, or None if there is none."""
+    watcher = live_watcher()
+    # A PR logged in the last block may not have been pushed yet; get_logs covers that gap
+    tx_hash = watcher.logged_tx_hash(pr_id) if watcher else None
+    if tx_hash is None:
+        tx_hash = _latest_logged(contract.events.PullRequestLogged.get_logs(
+            from_block=pull_requests_deploy_block(),
+            argument_filters={'pullRequestId': pr_id}
+        ))
+    return tx_hash
+
+
+async def wait_for_receipt_async(w3, tx_hash, timeout=300):
+    """wait_for_receipt for the async app's AsyncWeb3 client."""
+    watcher = live_watcher()
+    if watcher is None:
+        return await w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+    return await asyncio.wrap_future(watcher.receipt_future(tx_hash, timeout))
+
+
+async def logged_tx_hash_async(contract, pr_id):
+    """logged_tx_hash for the async app's AsyncWeb3 contract."""
+    watcher = live_watcher()
+    tx_hash = watcher.logged_tx_hash(pr_id) if watcher else None
+    if tx_hash is None:
+        tx_hash = _latest_logged(await contract.events.PullRequestLogged.get_logs(
+            from_block=pull_requests_deploy_block(),
+            argument_filters={'pullRequestId': pr_id}
+        ))
+    return tx_hash
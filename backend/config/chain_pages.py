@@ -0,0 +1,32 @@
+import os
+
+# Generators over the PullRequests contracts' *Page views. Each page is one
+# bounded eth_call, so a long history never turns into a single response
+# large enough to hit the node's gas or size limits. Pages are read one
+# after another, not as a snapshot: entries appended mid-iteration are
+# picked up, and none are skipped because the indexes are append-only.
+
+CHAIN_PAGE_SIZE = int(os.environ.get("CHAIN_PAGE_SIZE", "100"))
+
+
+def iter_pages(fetch_page, page_size=CHAIN_PAGE_SIZE):
+    """Yield every item from fetch_page(offset, limit) -> (items, total), one call per page."""
+    offset = 0
+    while True:
+        items, total = fetch_page(offset, page_size)
+        yield from items
+        offset += len(items)
+        if not items or offset >= total:
+            return
+
+
+def developer_pull_request_ids(contract, developer, project_name, page_size=CHAIN_PAGE_SIZE):
+    """Ids of a developer's PRs in a project, each listed once."""
+    view = contract.functions.getPullRequestsByDeveloperPage
+    return iter_pages(lambda offset, limit: view(developer, project_name, offset, limit).call(), page_size)
+
+
+def pull_request_history(contract, pr_id, page_size=CHAIN_PAGE_SIZE):
+    """Every stored version of a PR, oldest first. PullRequests (v1) only; v2 keeps history in events."""
+    view = contract.functions.getPullRequestHistoryPage
+    return iter_pages(lambda offset, limit: view(pr_id, offset, limit).call(), page_size)
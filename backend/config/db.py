@@ -1,6 +1,7 @@
 from pymongo import MongoClient
 import os
 from dotenv import load_dotenv
+from config.metrics import MongoCommandTimer
 
 load_dotenv()
 
@@ -8,5 +9,5 @@ def connect_db():
     mongo_uri = os.environ.get("MONGO_URI")
     if not mongo_uri:
         raise Exception("MONGO_URI not set in .env")
-    client = MongoClient(mongo_uri)
-    return client['test']  # your database name
+    client = MongoClient(mongo_uri, event_listeners=[MongoCommandTimer()])
+    return client[os.environ.get("MONGO_DB", "test")]  # your database name
@@ -0,0 +1,61 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+from collections import namedtuple
+
+# Contract deployments, read from contracts/deployments.json; the manifest is
+# written by blockchain/scripts/manifest.py when contracts are deployed:
+#   {"chainId": 1337, "contracts": {"PullRequests": {"address": "0x...",
+#    "deployBlock": 12, "abiHash": "sha256:..."}}}
+# ABIs are read from abis/<name>.json. Every file is read once per process.
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANIFEST_PATH = os.path.join(BACKEND_DIR, "contracts", "deployments.json")
+LEGACY_ADDRESSES_PATH = os.path.join(BACKEND_DIR, "contracts", "addresses.json")
+
+logger = logging.getLogger(__name__)
+
+Deployment = namedtuple("Deployment", "name address abi chain_id deploy_block")
+
+
+def abi_hash(abi):
+    """sha256 of the canonical ABI JSON; blockchain/scripts/manifest.py computes the same."""
+    return "sha256:" + hashlib.sha256(json.dumps(abi, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def load_manifest():
+    if os.path.exists(MANIFEST_PATH):
+        with open(MANIFEST_PATH, "r") as f:
+            return json.load(f)
+    # Deployments from before the manifest only recorded addresses
+    if os.path.exists(LEGACY_ADDRESSES_PATH):
+        with open(LEGACY_ADDRESSES_PATH, "r") as f:
+            return {"chainId": None, "contracts": {name: {"address": address} for name, address in json.load(f).items()}}
+    return {"chainId": None, "contracts": {}}
+
+
+@functools.lru_cache(maxsize=None)
+def load_abi(name):
+    abi_path = os.path.join(BACKEND_DIR, "abis", f"{name}.json")
+    try:
+        with open(abi_path, "r") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Contract ABI not found at {abi_path}")
+    return data["abi"] if isinstance(data, dict) else data
+
+
+@functools.lru_cache(maxsize=None)
+def get_deployment(name):
+    """Address, ABI, chain id and deploy block of a contract; address is None if it was never deployed."""
+    manifest = load_manifest()
+    entry = manifest["contracts"].get(name, {})
+    abi = load_abi(name)
+    if entry.get("address") and not entry.get("abiHash"):
+        logger.warning("No ABI hash recorded for %s at %s; abis/%s.json is unverified until the deploy script is re-run", name, entry["address"], name)
+    elif entry.get("abiHash") and entry["abiHash"] != abi_hash(abi):
+        logger.warning("abis/%s.json does not match the ABI deployed at %s; re-run the deploy or sync script", name, entry.get("address"))
+    return Deployment(name, entry.get("address"), abi, manifest.get("chainId"), entry.get("deployBlock", 0))
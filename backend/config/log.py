@@ -0,0 +1,143 @@
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Application logging: levels, optional JSON lines, a correlation id per
+# request and sampled DEBUG output. Records are handed to a background
+# thread through a queue so request threads never block on stdout.
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")
+# Fraction of DEBUG records kept, and the cap on DEBUG records per second
+LOG_DEBUG_SAMPLE = float(os.environ.get("LOG_DEBUG_SAMPLE", 1.0))
+LOG_DEBUG_RATE = int(os.environ.get("LOG_DEBUG_RATE", 100))
+
+# A context variable rather than a thread-local: it follows each request
+# task in the Quart app as well as each worker thread in the Flask app
+_request_id = contextvars.ContextVar("request_id", default="-")
+_listener = None
+
+
+def set_request_id(request_id=None):
+    request_id = request_id or uuid.uuid4().hex[:16]
+    _request_id.set(request_id)
+    return request_id
+
+
+def get_request_id():
+    return _request_id.get()
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = get_request_id()
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """Keeps a LOG_DEBUG_SAMPLE fraction of DEBUG records, at most LOG_DEBUG_RATE per second."""
+
+    def __init__(self, sample=1.0, rate=100):
+        super().__init__()
+        self.sample = sample
+        self.rate = rate
+        self.window = 0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG:
+            return True
+        if self.sample < 1.0 and random.random() >= self.sample:
+            return False
+        now = int(time.monotonic())
+        with self.lock:
+            if now != self.window:
+                self.window, self.count = now, 0
+            self.count += 1
+            return self.count <= self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+def configure_logging():
+    """Install the queue handler on the root logger once per process."""
+    global _listener
+    if _listener is not None:
+        return
+    stream = logging.StreamHandler()
+    if LOG_FORMAT == "json":
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    queue_handler.addFilter(DebugSampler(LOG_DEBUG_SAMPLE, LOG_DEBUG_RATE))
+
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    root.handlers = [queue_handler]
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def init_app(app):
+    """Give every Flask request a correlation id (reused from X-Request-ID if sent)."""
+    from flask import request
+
+    configure_logging()
+
+    @app.before_request
+    def assign_request_id():
+        set_request_id(request.headers.get("X-Request-ID"))
+
+    @app.after_request
+    def echo_request_id(response):
+        response.headers["X-Request-ID"] = get_request_id()
+        return response
+
+    @app.teardown_request
+    def clear_request_id(exc=None):
+        _request_id.set("-")
+
+
+def init_async_app(app):
+    """Same as init_app for the Quart app; hooks are async so the id is set on the request task."""
+    from quart import request
+
+    configure_logging()
+
+    @app.before_request
+    async def assign_request_id():
+        set_request_id(request.headers.get("X-Request-ID"))
+
+    @app.after_request
+    async def echo_request_id(response):
+        response.headers["X-Request-ID"] = get_request_id()
+        return response
@@ -0,0 +1,190 @@
+import re
+import threading
+import time
+from contextlib import contextmanager
+import requests
+from pymongo import monitoring
+from config.tracing import span
+
+# Process-local metrics in the Prometheus text exposition format, served at
+# /metrics. Blueprints and clients wrap their outbound calls with the helpers
+# below; under gunicorn every worker keeps its own series, so scrape each
+# worker (or sum them) rather than expecting one global view.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+_metrics = []
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+        _metrics.append(self)
+
+    def inc(self, *label_values, amount=1):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for label_values, value in sorted(self.values.items(), key=lambda item: tuple(map(str, item[0]))):
+                lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}  # label values -> [bucket counts..., sum, count]
+        self.lock = threading.Lock()
+        _metrics.append(self)
+
+    def observe(self, seconds, *label_values):
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series[index] += 1
+            series[-2] += seconds
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, *label_values):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *label_values)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for label_values, series in sorted(self.series.items(), key=lambda item: tuple(map(str, item[0]))):
+                for bound, count in zip(self.buckets, series):
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, [('le', bound)])} {count}")
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, [('le', '+Inf')])} {series[-1]}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labels, label_values)} {series[-2]}")
+                lines.append(f"{self.name}_count{_format_labels(self.labels, label_values)} {series[-1]}")
+        return lines
+
+
+def render():
+    """All metrics in the Prometheus text format."""
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+github_request_seconds = Histogram(
+    "github_request_seconds", "GitHub API request latency.", ("method", "route", "status"))
+scan_seconds = Histogram(
+    "scan_seconds", "Scanner subprocess duration per run (a Bearer run covers a whole batch).", ("backend",))
+scan_timeouts_total = Counter(
+    "scan_timeouts_total", "Scanner runs killed by their timeout.", ("backend",))
+web3_rpc_seconds = Histogram(
+    "web3_rpc_seconds", "JSON-RPC latency against the chain node.", ("method",))
+chain_tx_confirmation_seconds = Histogram(
+    "chain_tx_confirmation_seconds", "Time from sending a PR log transaction to its receipt.")
+mongo_query_seconds = Histogram(
+    "mongo_query_seconds", "MongoDB command latency.", ("collection", "command", "outcome"))
+chain_push_events_total = Counter(
+    "chain_push_events_total", "eth_subscribe notifications received by the chain watcher.", ("subscription",))
+cache_lookups_total = Counter(
+    "cache_lookups_total", "In-process cache lookups; hit ratio = hit / (hit + miss).", ("cache", "result"))
+
+
+_GITHUB_ROUTES = [
+    (re.compile(r"^/repos/[^/]+/[^/]+/contents/.*$"), "/repos/{owner}/{repo}/contents/{path}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/pulls/\d+/(files|reviews|merge)$"), r"/repos/{owner}/{repo}/pulls/{number}/\1"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/pulls/\d+$"), "/repos/{owner}/{repo}/pulls/{number}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/pulls$"), "/repos/{owner}/{repo}/pulls"),
+    (re.compile(r"^/repos/[^/]+/[^/]+$"), "/repos/{owner}/{repo}"),
+]
+
+
+def github_route(url):
+    """Collapse a GitHub API URL to its route template so labels stay low-cardinality."""
+    path = re.sub(r"^[a-z]+://[^/]+", "", url).split("?", 1)[0]
+    for pattern, template in _GITHUB_ROUTES:
+        if pattern.match(path):
+            return pattern.sub(template, path)
+    return "other"
+
+
+def github_request(method, url, **kwargs):
+    """requests.request() for the GitHub API, timed (and traced) by route and status."""
+    route = github_route(url)
+    started = time.perf_counter()
+    status = "error"
+    try:
+        with span("github.request", **{"http.method": method.upper(), "http.route": route}) as current:
+            response = requests.request(method, url, **kwargs)
+            status = response.status_code
+            if current:
+                current.set(**{"http.status_code": status})
+            return response
+    finally:
+        github_request_seconds.observe(time.perf_counter() - started, method.upper(), route, status)
+
+
+def instrument_web3_provider(provider):
+    """Time (and trace) every JSON-RPC call made through a sync Web3 provider, by RPC method."""
+    make_request = provider.make_request
+
+    def timed_make_request(method, params):
+        with web3_rpc_seconds.time(str(method)), span(f"web3.{method}"):
+            return make_request(method, params)
+
+    provider.make_request = timed_make_request
+
+    make_batch_request = getattr(provider, "make_batch_request", None)
+    if make_batch_request is not None:
+        def timed_make_batch_request(batch):
+            with web3_rpc_seconds.time("batch"), span("web3.batch", size=len(batch)):
+                return make_batch_request(batch)
+
+        provider.make_batch_request = timed_make_batch_request
+    return provider
+
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """pymongo/motor command listener feeding mongo_query_seconds by collection."""
+
+    def __init__(self):
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        with self.lock:
+            self.pending[(event.connection_id, event.request_id)] = collection if isinstance(collection, str) else "-"
+
+    def _finish(self, event, outcome):
+        with self.lock:
+            collection = self.pending.pop((event.connection_id, event.request_id), "-")
+        mongo_query_seconds.observe(event.duration_micros / 1e6, collection, event.command_name, outcome)
+
+    def succeeded(self, event):
+        self._finish(event, "ok")
+
+    def failed(self, event):
+        self._finish(event, "error")
@@ -0,0 +1,32 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# bcrypt cost factor for new hashes; raising it upgrades users on their next login
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", 12))
+
+# bcrypt releases the GIL, so a small bounded pool caps how many hashes burn
+# CPU at once during a login burst while other request threads keep running
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("PASSWORD_HASH_WORKERS", os.cpu_count() or 2)),
+    thread_name_prefix="bcrypt"
+)
+
+
+def hash_password(password):
+    return _executor.submit(bcrypt.hashpw, password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).result()
+
+
+def verify_password(password, hashed):
+    return _executor.submit(bcrypt.checkpw, password.encode(), hashed).result()
+
+
+def needs_rehash(hashed):
+    """True if the stored hash was made with a different cost than BCRYPT_ROUNDS."""
+    try:
+        return int(hashed.split(b'$')[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
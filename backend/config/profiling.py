@@ -0,0 +1,89 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Opt-in cProfile hook for staging. Nothing is profiled unless PROFILE_ENABLED=1.
+# Then a request with ?profile=1 is profiled, its stats are written to
+# PROFILE_DIR as a .prof file (open with snakeviz or `python -m pstats`) and
+# the top PROFILE_TOP functions are logged; ?profile=text returns that table
+# instead of the normal response body. PROFILE_ALL=1 profiles every request.
+
+PROFILE_ENABLED = os.environ.get("PROFILE_ENABLED", "0") == "1"
+PROFILE_ALL = os.environ.get("PROFILE_ALL", "0") == "1"
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+PROFILE_TOP = int(os.environ.get("PROFILE_TOP", 25))
+PROFILE_SORT = os.environ.get("PROFILE_SORT", "cumulative")
+
+# cProfile can only observe the thread that enabled it and only one profiler
+# may be active at a time, so concurrent requests are profiled one by one
+_lock = threading.Lock()
+
+
+def top_functions(profile, limit=PROFILE_TOP, sort=PROFILE_SORT):
+    """The pstats table of the `limit` hottest functions, as text."""
+    out = io.StringIO()
+    pstats.Stats(profile, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def dump(profile, name):
+    """Write a profile to PROFILE_DIR and return the file path."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+    path = os.path.join(PROFILE_DIR, f"{safe_name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{threading.get_ident()}.prof")
+    profile.dump_stats(path)
+    return path
+
+
+def init_app(app):
+    """Profile Flask requests that ask for it (see module comment)."""
+    if not PROFILE_ENABLED:
+        return
+
+    from flask import Response, g, request
+
+    @app.before_request
+    def start_profile():
+        mode = request.args.get("profile")
+        if not (PROFILE_ALL or mode in ("1", "text")):
+            return
+        if not _lock.acquire(blocking=False):
+            logger.warning("Profiler busy, not profiling %s", request.path)
+            return
+        g.profile = cProfile.Profile()
+        g.profile_mode = mode
+        g.profile.enable()
+
+    @app.after_request
+    def stop_profile(response):
+        profile = g.pop("profile", None)
+        if profile is None:
+            return response
+        try:
+            profile.disable()
+            path = dump(profile, request.endpoint or request.path)
+            table = top_functions(profile)
+        finally:
+            _lock.release()
+        logger.info("Profiled %s %s -> %s\n%s", request.method, request.path, path, table)
+        if g.pop("profile_mode", None) == "text":
+            response = Response(table, mimetype="text/plain")
+        response.headers["X-Profile-File"] = os.path.basename(path)
+        return response
+
+    @app.teardown_request
+    def abandon_profile(exc=None):
+        # after_request is skipped when the handler raised; never leave the profiler running
+        profile = g.pop("profile", None)
+        if profile is not None:
+            profile.disable()
+            _lock.release()
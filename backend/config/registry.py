@@ -0,0 +1,80 @@
+import os
+import threading
+
+# Lazily-created, per-process service clients (Mongo, Web3, contracts, ...).
+# Nothing here touches the network at import time: a client is built the
+# first time it is used and cached for the life of the process. A failed
+# build is not cached, so the next use retries.
+
+_factories = {}
+_probes = {}
+_instances = {}
+_pid = None
+_lock = threading.RLock()
+
+
+def register(name, factory, probe=None):
+    """Register a client factory and an optional health probe taking the client."""
+    _factories[name] = factory
+    if probe:
+        _probes[name] = probe
+
+
+def get(name):
+    global _pid
+    with _lock:
+        # Sockets and threads do not survive fork; rebuild clients in the child
+        if _pid != os.getpid():
+            _instances.clear()
+            _pid = os.getpid()
+        if name not in _instances:
+            if name not in _factories:
+                raise KeyError(f"Unknown service: {name}")
+            _instances[name] = _factories[name]()
+        return _instances[name]
+
+
+def reset(name=None):
+    with _lock:
+        if name is None:
+            _instances.clear()
+        else:
+            _instances.pop(name, None)
+
+
+def health(names=None):
+    """Build and probe the named (default: every registered) services; returns {name: {"ok": bool, ...}}."""
+    report = {}
+    for name in names or list(_factories):
+        try:
+            instance = get(name)
+            if name in _probes:
+                _probes[name](instance)
+            report[name] = {"ok": True}
+        except Exception as e:
+            report[name] = {"ok": False, "error": str(e)}
+    return report
+
+
+class LazyService:
+    """Module-level stand-in for a registry service.
+
+    Lets route modules keep `db.users.find_one(...)`-style code while the
+    client itself is only created on first attribute or item access.
+    `item` selects a sub-object, e.g. LazyService("db", "users") for a
+    collection.
+    """
+
+    def __init__(self, name, item=None):
+        self._name = name
+        self._item = item
+
+    def _resolve(self):
+        instance = get(self._name)
+        return instance if self._item is None else instance[self._item]
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    def __getitem__(self, key):
+        return self._resolve()[key]
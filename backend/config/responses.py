@@ -0,0 +1,83 @@
+import gzip
+import os
+from dotenv import load_dotenv
+from flask.json.provider import DefaultJSONProvider
+try:
+    import orjson
+except ImportError:  # falls back to Flask's json module
+    orjson = None
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+load_dotenv()
+
+# Response-size work for the PR listings, which carry whole file contents:
+# a compact orjson-backed JSON provider and Accept-Encoding negotiated
+# br/gzip compression of JSON and text bodies.
+
+COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 1024))
+COMPRESS_GZIP_LEVEL = int(os.environ.get("COMPRESS_GZIP_LEVEL", 6))
+COMPRESS_BROTLI_QUALITY = int(os.environ.get("COMPRESS_BROTLI_QUALITY", 4))
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider using orjson; output is compact and keys keep insertion order.
+
+    Dates still go through Flask's default (HTTP date strings), so responses
+    only differ from the stock provider in whitespace and key order.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.options).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=self.default, option=self.options), mimetype=self.mimetype)
+
+
+def _choose_encoding(accept_encodings):
+    if brotli is not None and accept_encodings.quality("br") > 0:
+        return "br"
+    if accept_encodings.quality("gzip") > 0:
+        return "gzip"
+    return None
+
+
+def compress_response(response):
+    """after_request hook: compress JSON/text bodies the client accepts, above COMPRESS_MIN_SIZE."""
+    from flask import request
+
+    response.vary.add("Accept-Encoding")
+    if (response.direct_passthrough
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or "Content-Encoding" in response.headers
+            or not (response.mimetype or "").startswith(COMPRESSIBLE_TYPES)):
+        return response
+    encoding = _choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+
+    if encoding == "br":
+        body = brotli.compress(body, quality=COMPRESS_BROTLI_QUALITY)
+    else:
+        body = gzip.compress(body, compresslevel=COMPRESS_GZIP_LEVEL, mtime=0)
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_app(app):
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+    app.after_request(compress_response)
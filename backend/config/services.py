@@ -0,0 +1,96 @@
+import functools
+import os
+from datetime import datetime
+from dotenv import load_dotenv
+from config import registry
+from config.registry import LazyService
+from config.db import connect_db
+from config.deployments import get_deployment, load_abi
+from config.web3 import check_connection, get_web3
+
+load_dotenv()
+
+# Overridable so benchmarks can point the routes at a local GitHub stand-in
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+# PullRequests or PullRequestsV2: picks the ABI in abis/ and the entry in contracts/deployments.json
+PULLREQUESTS_CONTRACT = os.environ.get("PULLREQUESTS_CONTRACT", "PullRequests")
+PULLREQUESTS_V2_STATUS = {"pending": 1, "approved": 2, "rejected": 3}
+
+
+@functools.lru_cache(maxsize=None)
+def pull_requests_deployment():
+    """The configured PullRequests contract; PULLREQUESTS_ADDRESS overrides the manifest's address."""
+    deployment = get_deployment(PULLREQUESTS_CONTRACT)
+    contract_address = os.environ.get("PULLREQUESTS_ADDRESS")
+    if contract_address and contract_address.lower() != (deployment.address or "").lower():
+        # Not the manifest's deployment, so its deploy block is unknown unless given
+        deployment = deployment._replace(
+            address=contract_address, deploy_block=int(os.environ.get("PULLREQUESTS_DEPLOY_BLOCK", "0"))
+        )
+    if not deployment.address:
+        raise Exception(f"PULLREQUESTS_ADDRESS not set in .env and {PULLREQUESTS_CONTRACT} missing from contracts/deployments.json")
+    return deployment
+
+
+def pull_requests_address():
+    return pull_requests_deployment().address
+
+
+def pull_requests_abi(contract_name=PULLREQUESTS_CONTRACT):
+    return load_abi(contract_name)
+
+
+def pull_requests_deploy_block():
+    """First block worth scanning for the contract's events."""
+    return pull_requests_deployment().deploy_block
+
+
+def log_pull_request_args(pr_id, project_name, developer, timestamp, status, contract_name=PULLREQUESTS_CONTRACT):
+    """logPullRequest arguments for the configured contract version.
+
+    v1 takes the GitHub strings as they are; v2 takes the ISO 8601 timestamp
+    as unix seconds and the status as its enum value.
+    """
+    if contract_name == "PullRequests":
+        return pr_id, project_name, developer, timestamp, status
+    seconds = int(datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp())
+    return pr_id, project_name, developer, seconds, PULLREQUESTS_V2_STATUS[status]
+
+
+def get_pull_requests_contract():
+    w3 = registry.get("web3")
+    return w3.eth.contract(address=w3.to_checksum_address(pull_requests_address()), abi=pull_requests_abi())
+
+
+def get_chain_account():
+    private_key = os.environ.get("PRIVATE_KEY")
+    if not private_key:
+        raise Exception("PRIVATE_KEY not set in .env")
+    try:
+        return registry.get("web3").eth.account.from_key(private_key)
+    except ValueError as e:
+        raise ValueError(f"Invalid private key: {str(e)}")
+
+
+def get_scanner():
+    from scanning import get_scan_service
+    return get_scan_service()
+
+
+def get_chain_watcher():
+    from config.chain_events import start_chain_watcher
+    return start_chain_watcher()
+
+
+registry.register("db", connect_db, probe=lambda db: db.command("ping"))
+registry.register("web3", get_web3, probe=lambda w3: check_connection(w3, fresh=True))
+registry.register("pull_requests", get_pull_requests_contract)
+registry.register("chain_account", get_chain_account)
+registry.register("scanner", get_scanner)
+registry.register("chain_watcher", get_chain_watcher)
+
+# Module-level handles for the route modules; each resolves on first use
+db = LazyService("db")
+w3 = LazyService("web3")
+pull_requests_contract = LazyService("pull_requests")
+chain_account = LazyService("chain_account")
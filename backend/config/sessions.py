@@ -0,0 +1,153 @@
+import copy
+import os
+import threading
+import time
+from bson.objectid import ObjectId
+from dotenv import load_dotenv
+from flask import request
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+from config.metrics import cache_lookups_total
+from config.services import db
+
+load_dotenv()
+
+# Signed session tokens plus a short-lived, in-process authorization cache.
+# A request carrying `Authorization: Bearer <token>` is identified without
+# touching Mongo; the legacy X-User-Email header still works and is cached
+# the same way. Membership changes call invalidate_user(); other worker
+# processes pick them up once AUTH_CACHE_TTL expires.
+
+SESSION_SECRET = os.environ.get("SESSION_SECRET")
+SESSION_MAX_AGE = int(os.environ.get("SESSION_MAX_AGE", 12 * 3600))
+AUTH_CACHE_TTL = int(os.environ.get("AUTH_CACHE_TTL", 30))
+
+_serializer = URLSafeTimedSerializer(SESSION_SECRET, salt="session") if SESSION_SECRET else None
+_cache = {}  # "uid:<id>" / "email:<email>" -> (expires_at, user doc without password)
+_invalidated = {}  # user id -> time of last membership change
+_lock = threading.Lock()
+
+
+def issue_token(user):
+    """Sign a session token for a user document; None when SESSION_SECRET is not configured."""
+    if not _serializer:
+        return None
+    return _serializer.dumps({
+        "uid": str(user["_id"]),
+        "email": user["email"],
+        "role": user["role"],
+        "createdProjects": user.get("createdProjects", []),
+        "assignedProjects": user.get("assignedProjects", []),
+    })
+
+
+def _token_claims(headers):
+    header = headers.get("Authorization", "")
+    if not _serializer or not header.startswith("Bearer "):
+        return None
+    try:
+        claims, issued_at = _serializer.loads(header[len("Bearer "):], max_age=SESSION_MAX_AGE, return_timestamp=True)
+    except (BadSignature, SignatureExpired):
+        return None
+    claims["iat"] = issued_at.timestamp()
+    return claims
+
+
+def _cache_get(key):
+    with _lock:
+        entry = _cache.get(key)
+        if entry and entry[0] > time.time():
+            cache_lookups_total.inc("auth", "hit")
+            return entry[1]
+        _cache.pop(key, None)
+    cache_lookups_total.inc("auth", "miss")
+    return None
+
+
+def _cache_put(doc):
+    expires_at = time.time() + AUTH_CACHE_TTL
+    with _lock:
+        _cache[f"uid:{doc['_id']}"] = (expires_at, doc)
+        if doc.get("email"):
+            _cache[f"email:{doc['email']}"] = (expires_at, doc)
+
+
+def invalidate_user(user_id, email=None):
+    """Drop cached authorization for a user after their project memberships change."""
+    with _lock:
+        _invalidated[str(user_id)] = time.time()
+        cached = _cache.pop(f"uid:{user_id}", None)
+        if cached:
+            _cache.pop(f"email:{cached[1].get('email')}", None)
+        if email:
+            _cache.pop(f"email:{email}", None)
+
+
+def _authorize(headers, role, full):
+    """Everything current_user can decide without Mongo.
+
+    Returns (user, None) once settled (user may be None), or (None, query)
+    when the user document still has to be read with `query`.
+    """
+    claims = _token_claims(headers)
+    if claims:
+        if role and claims["role"] != role:
+            return None, None
+        doc = _cache_get(f"uid:{claims['uid']}")
+        if doc is None and not full:
+            fresh = time.time() - claims["iat"] < AUTH_CACHE_TTL
+            if fresh and _invalidated.get(claims["uid"], 0) < claims["iat"]:
+                return {
+                    "_id": ObjectId(claims["uid"]),
+                    "email": claims["email"],
+                    "role": claims["role"],
+                    "createdProjects": claims["createdProjects"],
+                    "assignedProjects": claims["assignedProjects"],
+                }, None
+        if doc is None:
+            return None, {"_id": ObjectId(claims["uid"])}
+    else:
+        email = headers.get("X-User-Email")
+        if not email:
+            return None, None
+        doc = _cache_get(f"email:{email}")
+        if doc is None:
+            return None, {"email": email}
+    return _admit(doc, role), None
+
+
+def _admit(doc, role):
+    if not doc:
+        return None
+    if role and doc.get("role") != role:
+        return None
+    # Handlers mutate what they get back (e.g. toggling assignedProjects), so never hand out the cached object
+    return copy.deepcopy(doc)
+
+
+def current_user(role=None, full=False):
+    """Identify the caller from a session token or the X-User-Email header.
+
+    Returns a copy of the user document (without the password), or None if
+    the caller is unknown or does not have `role`. With full=False a fresh
+    token's own claims are enough; pass full=True when the handler needs
+    fields only stored in Mongo (GitHub credentials, points, ...).
+    """
+    user, query = _authorize(request.headers, role, full)
+    if query is None:
+        return user
+    doc = db.users.find_one(query, {"password": 0})
+    if doc:
+        _cache_put(doc)
+    return _admit(doc, role)
+
+
+async def current_user_async(users, role=None, full=False):
+    """current_user for the Quart app: same tokens, cache and rules, with `users` a motor collection."""
+    from quart import request as async_request  # only installed with requirements-async.txt
+    user, query = _authorize(async_request.headers, role, full)
+    if query is None:
+        return user
+    doc = await users.find_one(query, {"password": 0})
+    if doc:
+        _cache_put(doc)
+    return _admit(doc, role)
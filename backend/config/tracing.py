@@ -0,0 +1,219 @@
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Per-request tracing. Each traced request gets a trace made of nested spans
+# (request -> pull_request -> github / scan / web3 calls). Finished traces are
+# exported as OTLP/JSON lines, the format the OpenTelemetry collector's file
+# exporter writes and its otlpjsonfile receiver reads, to TRACE_FILE or to the
+# log. Sending `X-Debug-Timing: 1` (when TRACE_DEBUG_TIMING=1) traces that one
+# request and returns a Server-Timing style summary in the X-Debug-Timing
+# response header. Outside a traced request span() is a no-op.
+
+TRACE_EXPORTER = os.environ.get("TRACE_EXPORTER", "none")  # none | console | file
+TRACE_FILE = os.environ.get("TRACE_FILE", "traces.jsonl")
+TRACE_DEBUG_TIMING = os.environ.get("TRACE_DEBUG_TIMING", "0") == "1"
+SERVICE_NAME = os.environ.get("TRACE_SERVICE_NAME", "supply-chain-backend")
+
+_current = contextvars.ContextVar("current_span", default=None)
+_file_lock = threading.Lock()
+
+
+class Trace:
+    def __init__(self, trace_id=None):
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.spans = []
+
+
+class Span:
+    def __init__(self, trace, name, parent_id=None, attributes=None):
+        self.trace = trace
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes or {}
+        self.error = None
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+
+    @property
+    def duration_ms(self):
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def end(self):
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self.trace.spans.append(self)
+
+    def to_otlp(self):
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def current_span():
+    return _current.get()
+
+
+@contextmanager
+def span(name, **attributes):
+    """Time a block as a child of the current span; does nothing outside a trace."""
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(parent.trace, name, parent.span_id, attributes)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        child.end()
+
+
+def traced(iterable, name, attributes):
+    """Yield from iterable with each loop body running inside its own span.
+
+    `attributes(item)` builds the span attributes, e.g. the PR number, so a
+    plain `for` loop gets one span per item without re-indenting its body.
+    """
+    for item in iterable:
+        with span(name, **attributes(item)):
+            yield item
+
+
+def start_trace(name, traceparent=None, **attributes):
+    """Open the root span of a request, joining a W3C traceparent if one was sent."""
+    trace_id, parent_id = None, None
+    if traceparent:
+        parts = traceparent.split("-")
+        if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16:
+            trace_id, parent_id = parts[1], parts[2]
+    root = Span(Trace(trace_id), name, parent_id, attributes)
+    return root, _current.set(root)
+
+
+def finish_trace(root, token):
+    """Close the root span, restore the context and export the trace."""
+    root.end()
+    try:
+        _current.reset(token)
+    except ValueError:
+        # Reset from a different context (e.g. a sync teardown hook); just clear it
+        _current.set(None)
+    export(root.trace)
+
+
+def export(trace):
+    if TRACE_EXPORTER == "none" or not trace.spans:
+        return
+    line = json.dumps({"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+        "scopeSpans": [{"scope": {"name": "backend"}, "spans": [s.to_otlp() for s in trace.spans]}],
+    }]})
+    if TRACE_EXPORTER == "file":
+        with _file_lock, open(TRACE_FILE, "a") as fh:
+            fh.write(line + "\n")
+    else:
+        logger.info(line)
+
+
+def timing_summary(trace, limit=12):
+    """Server-Timing style summary: total time per span name, then the slowest PR and file spans."""
+    totals = {}
+    for s in trace.spans:
+        total, count = totals.get(s.name, (0.0, 0))
+        totals[s.name] = (total + s.duration_ms, count + 1)
+    entries = [
+        f'{name};dur={total:.1f};desc="x{count}"'
+        for name, (total, count) in sorted(totals.items(), key=lambda item: -item[1][0])[:limit]
+    ]
+    keyed = [s for s in trace.spans if "pr.id" in s.attributes or "file.name" in s.attributes]
+    for s in sorted(keyed, key=lambda s: -s.duration_ms)[:3]:
+        label = " ".join(f"{key}={value}" for key, value in s.attributes.items() if key in ("pr.id", "file.name"))
+        entries.append(f'slowest;dur={s.duration_ms:.1f};desc="{s.name} {label}"')
+    return ", ".join(entries)
+
+
+def _wants_trace(headers):
+    return TRACE_EXPORTER != "none" or (TRACE_DEBUG_TIMING and headers.get("X-Debug-Timing") == "1")
+
+
+def init_app(app):
+    """Trace Flask requests (see module comment for when)."""
+    from flask import g, request
+
+    @app.before_request
+    def open_trace():
+        if _wants_trace(request.headers):
+            g.trace = start_trace(f"{request.method} {request.url_rule.rule if request.url_rule else request.path}",
+                                  request.headers.get("traceparent"), **{"http.method": request.method, "http.target": request.path})
+
+    @app.after_request
+    def close_trace(response):
+        trace = g.pop("trace", None)
+        if trace:
+            root, token = trace
+            root.set(**{"http.status_code": response.status_code})
+            finish_trace(root, token)
+            if TRACE_DEBUG_TIMING and request.headers.get("X-Debug-Timing") == "1":
+                response.headers["X-Debug-Timing"] = timing_summary(root.trace)
+        return response
+
+
+def init_async_app(app):
+    """Same as init_app for the Quart app; hooks are async so the context variable stays on the request task."""
+    from quart import g, request
+
+    @app.before_request
+    async def open_trace():
+        if _wants_trace(request.headers):
+            g.trace = start_trace(f"{request.method} {request.url_rule.rule if request.url_rule else request.path}",
+                                  request.headers.get("traceparent"), **{"http.method": request.method, "http.target": request.path})
+
+    @app.after_request
+    async def close_trace(response):
+        trace = g.pop("trace", None)
+        if trace:
+            root, token = trace
+            root.set(**{"http.status_code": response.status_code})
+            finish_trace(root, token)
+            if TRACE_DEBUG_TIMING and request.headers.get("X-Debug-Timing") == "1":
+                response.headers["X-Debug-Timing"] = timing_summary(root.trace)
+        return response
@@ -1,12 +1,91 @@
 from web3 import Web3
 import os
-import json
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
-from web3.middleware import geth_poa_middleware
+from config.deployments import get_deployment
+from config.metrics import cache_lookups_total, instrument_web3_provider
+try:
+    from web3.middleware import ExtraDataToPOAMiddleware as geth_poa_middleware  # web3 >= 7
+except ImportError:
+    from web3.middleware import geth_poa_middleware
 
 # Load variables from .env into the environment
 load_dotenv()
 
+# One provider per process, shared by every route through the service
+# registry. Its requests.Session keeps up to WEB3_POOL_SIZE keep-alive
+# connections to the node (at least one per gunicorn thread avoids
+# reconnecting under load). Idempotent node-level reads are answered from
+# an in-process cache: values that cannot change for a node are kept until
+# a request to it fails, the rest for WEB3_CACHE_TTL seconds.
+
+WEB3_POOL_SIZE = int(os.environ.get("WEB3_POOL_SIZE", 16))
+WEB3_TIMEOUT = int(os.environ.get("WEB3_TIMEOUT", 30))
+WEB3_CACHE_TTL = float(os.environ.get("WEB3_CACHE_TTL", 1))
+
+STATIC_RPC_METHODS = {"eth_chainId", "net_version"}
+TTL_RPC_METHODS = {"eth_gasPrice", "eth_blockNumber", "eth_maxPriorityFeePerGas"}
+
+
+def make_session(pool_size=WEB3_POOL_SIZE):
+    """requests.Session with a keep-alive pool sized for concurrent RPC callers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def cache_web3_provider(provider, ttl=WEB3_CACHE_TTL):
+    """Serve the parameterless reads in STATIC_RPC_METHODS / TTL_RPC_METHODS from memory."""
+    make_request = provider.make_request
+    cache = {}  # method -> (expires_at, response)
+    lock = threading.Lock()
+
+    def forward(method, params):
+        try:
+            response = make_request(method, params)
+        except OSError:
+            # The node may have been restarted or replaced; re-read everything from it
+            provider.node_reachable = False
+            with lock:
+                cache.clear()
+            raise
+        provider.node_reachable = True
+        return response
+
+    def cached_make_request(method, params):
+        if method not in STATIC_RPC_METHODS and method not in TTL_RPC_METHODS:
+            return forward(method, params)
+        now = time.monotonic()
+        with lock:
+            entry = cache.get(method)
+        if entry and entry[0] > now:
+            cache_lookups_total.inc("web3", "hit")
+            return entry[1]
+        cache_lookups_total.inc("web3", "miss")
+        response = forward(method, params)
+        if "error" not in response:
+            expires_at = float("inf") if method in STATIC_RPC_METHODS else now + ttl
+            with lock:
+                cache[method] = (expires_at, response)
+        return response
+
+    provider.node_reachable = False  # outcome of the last real round trip, see check_connection
+    provider.make_request = cached_make_request
+    return provider
+
+
+def make_provider(rpc_url):
+    """HTTP provider on a pooled session, instrumented, with the RPC response cache in front."""
+    provider = Web3.HTTPProvider(rpc_url, request_kwargs={"timeout": WEB3_TIMEOUT}, session=make_session())
+    # Cache hits never reach the instrumented provider, so web3_rpc_seconds counts real round trips
+    return cache_web3_provider(instrument_web3_provider(provider))
+
+
 # Function to return a connected Web3 instance
 def get_web3():
     # Load RPC endpoint from .env file
@@ -14,8 +93,8 @@ def get_web3():
     if not ganache_rpc:
         raise Exception("GANACHE_RPC not set in .env")
 
-    # Initialize Web3 with the HTTP Provider
-    w3 = Web3(Web3.HTTPProvider(ganache_rpc))
+    # Initialize Web3 with the shared HTTP provider
+    w3 = Web3(make_provider(ganache_rpc))
 
     # Inject POA middleware if it hasn’t already been injected
     if geth_poa_middleware not in w3.middleware_onion:
@@ -27,29 +106,22 @@ def get_web3():
 
     return w3
 
-# Function to retrieve the deployed contract instance
-def get_contract(w3):
-    # Load contract address from .env
-    contract_address = os.environ.get("PULL_REQUESTS")
-    if not contract_address:
-        raise Exception("PULL_REQUESTS not set in .env")
-
-    # Build the ABI path (assuming ABI is a raw list or full artifact)
-    abi_path = "../frontend/src/abis/PullRequests.json"
-    if not os.path.exists(abi_path):
-        raise FileNotFoundError(f"ABI file not found at {abi_path}")
-
-    # Load and parse the ABI file
-    with open(abi_path, "r") as file:
-        abi_json = json.load(file)
-
-        # Handle two ABI formats: raw list and full artifact
-        if isinstance(abi_json, list):
-            abi = abi_json
-        elif isinstance(abi_json, dict) and "abi" in abi_json:
-            abi = abi_json["abi"]
-        else:
-            raise ValueError("Invalid ABI format: Expected a list or a dict with 'abi' key.")
-
-    # Return the contract instance using checksum address
-    return w3.eth.contract(address=w3.to_checksum_address(contract_address), abi=abi)
\ No newline at end of file
+
+def check_connection(w3, fresh=False):
+    """Raise if the node is unreachable.
+
+    Trusts the provider's last real RPC round trip while it succeeded, so
+    routes pay for no extra request; fresh=True (the health probe) always
+    asks the node, with web3_clientVersion, which is never cached.
+    """
+    if not fresh and getattr(w3.provider, "node_reachable", False):
+        return
+    w3.provider.is_connected(show_traceback=True)
+
+
+# Function to retrieve a deployed contract instance from contracts/deployments.json
+def get_contract(w3, name="PullRequests"):
+    deployment = get_deployment(name)
+    if not deployment.address:
+        raise Exception(f"{name} missing from contracts/deployments.json")
+    return w3.eth.contract(address=w3.to_checksum_address(deployment.address), abi=deployment.abi)
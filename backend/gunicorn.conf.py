@@ -0,0 +1,75 @@
+# Production serving profile for the Flask API.
+# Run from the backend directory with: gunicorn
+# (gunicorn picks this file up automatically from the working directory)
+import multiprocessing
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+wsgi_app = "server:app"
+bind = f"0.0.0.0:{os.environ.get('PORT', 5001)}"
+
+cores = multiprocessing.cpu_count()
+
+# sync: one request per worker; gthread: threads share a worker, good for the
+# I/O-bound PR endpoints; gevent: cooperative, needs `pip install gevent`
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+if worker_class == "sync":
+    workers = int(os.environ.get("GUNICORN_WORKERS", cores * 2 + 1))
+    threads = 1
+elif worker_class == "gthread":
+    workers = int(os.environ.get("GUNICORN_WORKERS", cores + 1))
+    threads = int(os.environ.get("GUNICORN_THREADS", 8))
+else:
+    workers = int(os.environ.get("GUNICORN_WORKERS", cores))
+    threads = 1
+    worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 500))
+
+# A PR listing can wait up to 300s for a transaction receipt plus Bearer
+# batches of up to BEARER_TIMEOUT, so the worker timeout must sit above both
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 360))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 360))
+keepalive = 5
+
+# Clients (Mongo, Web3, scanner worker threads) must be created in each
+# worker, never in the master: neither sockets nor threads survive fork.
+# config.registry also rebuilds them if it notices it is in a new process
+preload_app = False
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+
+# Connections opened in each worker before it takes requests. The scanner
+# pools and the chain watcher start threads, so they stay lazy; a slow Mongo
+# or node delays boot by at most WARMUP_TIMEOUT, then keeps connecting in the
+# background
+WARMUP_SERVICES = ("db", "web3")
+WARMUP_TIMEOUT = float(os.environ.get("GUNICORN_WARMUP_TIMEOUT", 5))
+
+
+def post_worker_init(worker):
+    """Connect the per-worker Mongo and Web3 clients after fork so the first request does not pay for them."""
+    from config import registry
+    report = {}
+    threads = [
+        threading.Thread(target=lambda name=name: report.update(registry.health([name])), daemon=True)
+        for name in WARMUP_SERVICES
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + WARMUP_TIMEOUT
+    for thread in threads:
+        thread.join(max(0, deadline - time.monotonic()))
+    for name in WARMUP_SERVICES:
+        status = report.get(name)
+        if status is None:
+            worker.log.warning("%s still connecting in worker %s after %ss", name, worker.pid, WARMUP_TIMEOUT)
+        elif status["ok"]:
+            worker.log.info("%s ready in worker %s", name, worker.pid)
+        else:
+            worker.log.warning("%s unavailable in worker %s: %s", name, worker.pid, status["error"])
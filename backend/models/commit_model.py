@@ -1,7 +1,3 @@
-from config.db import connect_db
-
-db = connect_db()
-
 def pull_request_exists(db, pull_request_id):
     return db.pull_requests.find_one({"pullRequestId": pull_request_id}) is not None
 
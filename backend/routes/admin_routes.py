@@ -1,19 +1,24 @@
 from flask import Blueprint, request, jsonify
 from bson.objectid import ObjectId
-from config.db import connect_db
-import requests
+from config.registry import LazyService
+from config.services import GITHUB_API_URL, db, w3, log_pull_request_args, pull_requests_contract as contract, chain_account as blockchain_account
+from config.sessions import current_user, invalidate_user
+from config.chain_events import logged_tx_hash, wait_for_receipt
+from config.chain_pages import pull_request_history
+from scanning import submit_scan, wait_for_scan
 from web3 import Web3
-import os
-import json
+from web3.exceptions import Web3Exception
+from config.metrics import github_request, chain_tx_confirmation_seconds
+from config.tracing import span, traced
 import base64
-import shutil
-import subprocess
+import time
+import logging
 
-db = connect_db()
 admin_bp = Blueprint('admin', __name__)
-users_col = db['users']
-projects_col = db['projects']
-access_col = db['access_requests']
+logger = logging.getLogger(__name__)
+users_col = LazyService("db", "users")
+projects_col = LazyService("db", "projects")
+access_col = LazyService("db", "access_requests")
 
 # def serialize_user(doc, mask=True):
 #     data = {
@@ -77,19 +82,19 @@ def create_project():
 
     # Validate required fields
     if not all([name, admin_gh, created_at]):
-        print(f"Missing fields: name={name}, admin_gh={admin_gh}, created_at={created_at}")
+        logger.warning("Missing fields: name=%s, admin_gh=%s, created_at=%s", name, admin_gh, created_at)
         return jsonify({"error": "Missing required fields"}), 400
 
     try:
         # Check if admin user exists
         admin_user = db['users'].find_one({"githubUsername": admin_gh})
         if not admin_user:
-            print(f"Admin not found: {admin_gh}")
+            logger.warning("Admin not found: %s", admin_gh)
             return jsonify({"error": "Admin user not found"}), 404
 
         # Check if project already exists for this admin to avoid duplicates
         if db['users'].find_one({"githubUsername": admin_gh, "createdProjects": name}):
-            print(f"Project already exists: {name} for admin {admin_gh}")
+            logger.warning("Project already exists: %s for admin %s", name, admin_gh)
             return jsonify({"error": "Project already exists"}), 400
 
         # Add project to admin's createdProjects array and initialize projectMetadata
@@ -101,8 +106,9 @@ def create_project():
             }
         )
         if result.matched_count == 0:
-            print(f"Admin not found for update: {admin_gh}")
+            logger.warning("Admin not found for update: %s", admin_gh)
             return jsonify({"error": "Admin user not found"}), 404
+        invalidate_user(admin_user["_id"], admin_user.get("email"))
 
         # Store project details in a separate projects collection
         projects_col = db['projects']
@@ -117,11 +123,11 @@ def create_project():
         }
         projects_col.insert_one(project_data)
 
-        print(f"Created project {name} for admin {admin_gh}")
+        logger.info("Created project %s for admin %s", name, admin_gh)
         return jsonify({"message": "Project created successfully"}), 201
 
     except Exception as e:
-        print(f"Error creating project: {str(e)}")
+        logger.error("Error creating project: %s", str(e))
         return jsonify({"error": str(e)}), 500
 
 @admin_bp.route("/update_project", methods=["PUT"])
@@ -134,7 +140,7 @@ def update_project():
     webhook_url = data.get("webhookUrl")
 
     if not all([name, github_repo_url, github_repo_id, webhook_id, webhook_url]):
-        print(f"Missing fields in update: name={name}, github_repo_url={github_repo_url}")
+        logger.warning("Missing fields in update: name=%s, github_repo_url=%s", name, github_repo_url)
         return jsonify({"error": "Missing required fields"}), 400
 
     try:
@@ -152,7 +158,7 @@ def update_project():
             }
         )
         if project_result.matched_count == 0:
-            print(f"Project not found for update: {name}")
+            logger.warning("Project not found for update: %s", name)
             return jsonify({"error": "Project not found"}), 404
 
         # Update projectMetadata in users collection
@@ -170,14 +176,14 @@ def update_project():
             }
         )
         if user_result.matched_count == 0:
-            print(f"User with project not found for update: {name}")
+            logger.warning("User with project not found for update: %s", name)
             return jsonify({"error": "User with project not found"}), 404
 
-        print(f"Updated project {name}")
+        logger.info("Updated project %s", name)
         return jsonify({"message": "Project updated successfully"}), 200
 
     except Exception as e:
-        print(f"Error updating project: {str(e)}")
+        logger.error("Error updating project: %s", str(e))
         return jsonify({"error": str(e)}), 500
 
 # @admin_bp.route('/commits/<github_username>', methods=['GET'])
@@ -231,10 +237,10 @@ def get_available_users():
         ))
         for user in users:
             user['_id'] = str(user['_id'])
-        print(f"Retrieved {len(users)} available users")
+        logger.debug("Retrieved %s available users", len(users))
         return jsonify({'users': users}), 200
     except Exception as e:
-        print(f"Error fetching available users: {str(e)}")
+        logger.error("Error fetching available users: %s", str(e))
         return jsonify({'error': str(e)}), 500
 
 @admin_bp.route('/projects/<github_username>', methods=['GET'])
@@ -243,7 +249,7 @@ def get_admin_projects(github_username):
         # Find the admin user
         admin = users_col.find_one({'githubUsername': github_username})
         if not admin:
-            print(f"Admin not found: {github_username}")
+            logger.warning("Admin not found: %s", github_username)
             return jsonify({'error': 'Admin user not found'}), 404
 
         # Get projects from createdProjects and projectMetadata
@@ -275,10 +281,10 @@ def get_admin_projects(github_username):
                 'assignedUsers': assigned_users
             })
 
-        print(f"Retrieved {len(projects)} projects for admin {github_username}")
+        logger.debug("Retrieved %s projects for admin %s", len(projects), github_username)
         return jsonify({'projects': projects}), 200
     except Exception as e:
-        print(f"Error fetching projects for {github_username}: {str(e)}")
+        logger.error("Error fetching projects for %s: %s", github_username, str(e))
         return jsonify({'error': str(e)}), 500
 
 @admin_bp.route('/assign_user_to_project', methods=['POST'])
@@ -290,37 +296,37 @@ def assign_user():
     assigned_at = data.get('assignedAt')
 
     if not project_name or not isinstance(project_name, str) or not project_name.strip():
-        print(f"Invalid projectName: {project_name}")
+        logger.warning("Invalid projectName: %s", project_name)
         return jsonify({'error': 'Invalid or missing project name'}), 400
     if role not in ('developer', 'auditor'):
-        print(f"Invalid role: {role}")
+        logger.warning("Invalid role: %s", role)
         return jsonify({'error': 'Invalid role'}), 400
     if not all([project_name, user_id, role, assigned_at]):
-        print(f"Missing data: projectName={project_name}, userId={user_id}, role={role}, assignedAt={assigned_at}")
+        logger.warning("Missing data: projectName=%s, userId=%s, role=%s, assignedAt=%s", project_name, user_id, role, assigned_at)
         return jsonify({'error': 'Missing required fields'}), 400
 
     try:
         if not ObjectId.is_valid(user_id):
-            print(f"Invalid user_id: {user_id}")
+            logger.warning("Invalid user_id: %s", user_id)
             return jsonify({'error': 'Invalid user ID format'}), 400
         user = users_col.find_one({'_id': ObjectId(user_id)})
         if not user:
-            print(f"User not found: {user_id}")
+            logger.warning("User not found: %s", user_id)
             return jsonify({'error': 'User not found'}), 404
         if user.get('role') not in ['developer', 'auditor']:
-            print(f"User role invalid: {user.get('role')}")
+            logger.warning("User role invalid: %s", user.get('role'))
             return jsonify({'error': 'User must be a developer or auditor'}), 400
 
         # Check if project exists in any admin's createdProjects
         admin = users_col.find_one({'createdProjects': project_name})
         if not admin:
-            print(f"Project not found: {project_name}")
+            logger.warning("Project not found: %s", project_name)
             return jsonify({'error': 'Project not found'}), 404
 
         # Check if user is already assigned to the project
         user_assigned_projects = user.get('assignedProjects', [])
         if any(p.get('projectName') == project_name for p in user_assigned_projects):
-            print(f"User {user_id} already assigned to project {project_name}")
+            logger.warning("User %s already assigned to project %s", user_id, project_name)
             return jsonify({'error': 'User already assigned to this project'}), 409
 
         # Assign user to project
@@ -340,11 +346,12 @@ def assign_user():
                 {'_id': ObjectId(user_id)},
                 {'$set': {f'points.{project_name}': 0}}
             )
+        invalidate_user(user_id, user.get('email'))
 
-        print(f"Assigned user {user_id} to project {project_name} as {role}")
+        logger.info("Assigned user %s to project %s as %s", user_id, project_name, role)
         return jsonify({'message': 'User assigned successfully'}), 200
     except Exception as e:
-        print(f"Error assigning user to project: {str(e)}")
+        logger.error("Error assigning user to project: %s", str(e))
         return jsonify({'error': str(e)}), 500
 
 @admin_bp.route('/remove_user_from_project', methods=['POST'])
@@ -354,25 +361,25 @@ def remove_user_from_project():
     user_id = data.get('userId')
 
     if not project_name or not isinstance(project_name, str) or not project_name.strip():
-        print(f"Invalid projectName: {project_name}")
+        logger.warning("Invalid projectName: %s", project_name)
         return jsonify({'error': 'Invalid or missing project name'}), 400
     if not all([project_name, user_id]):
-        print(f"Missing data: projectName={project_name}, userId={user_id}")
+        logger.warning("Missing data: projectName=%s, userId=%s", project_name, user_id)
         return jsonify({'error': 'Missing projectName or userId'}), 400
 
     try:
         if not ObjectId.is_valid(user_id):
-            print(f"Invalid user_id: {user_id}")
+            logger.warning("Invalid user_id: %s", user_id)
             return jsonify({'error': 'Invalid user ID format'}), 400
         user = users_col.find_one({'_id': ObjectId(user_id)})
         if not user:
-            print(f"User not found: {user_id}")
+            logger.warning("User not found: %s", user_id)
             return jsonify({'error': 'User not found'}), 404
 
         # Check if user is assigned to the project
         user_assigned_projects = user.get('assignedProjects', [])
         if not any(p.get('projectName') == project_name for p in user_assigned_projects):
-            print(f"User {user_id} not assigned to project {project_name}")
+            logger.warning("User %s not assigned to project %s", user_id, project_name)
             return jsonify({'error': 'User not assigned to this project'}), 404
 
         # Remove user from project
@@ -387,11 +394,12 @@ def remove_user_from_project():
                 {'_id': ObjectId(user_id)},
                 {'$unset': {f'points.{project_name}': ''}}
             )
+        invalidate_user(user_id, user.get('email'))
 
-        print(f"Removed user {user_id} from project {project_name}")
+        logger.info("Removed user %s from project %s", user_id, project_name)
         return jsonify({'message': 'User removed from project successfully'}), 200
     except Exception as e:
-        print(f"Error removing user from project: {str(e)}")
+        logger.error("Error removing user from project: %s", str(e))
         return jsonify({'error': str(e)}), 500
 
 # @admin_bp.route('/user_projects/<user_id>', methods=['GET'])
@@ -423,128 +431,31 @@ def remove_user_from_project():
 #         print(f"Error fetching projects for user {user_id}: {str(e)}")
 #         return jsonify({'error': str(e)}), 500
 
-w3 = Web3(Web3.HTTPProvider(os.getenv('GANACHE_RPC')))
-contract_address = os.getenv('PULLREQUESTS_ADDRESS', '0xbA23583659a1a57b495211Ad3989983Aa7D47253')
-
-with open(os.path.join(os.path.dirname(__file__), '../abis/PullRequests.json'), 'r') as f:
-    contract_abi = json.load(f)['abi']
-contract = w3.eth.contract(address=contract_address, abi=contract_abi)
-
-def check_vulnerabilities(file_content, filename):
-    """Run Bearer CLI to scan .py files for vulnerabilities."""
-    if not filename.endswith('.py'):
-        return {"is_vulnerable": False, "details": "Non-Python file, marked as safe"}
-
-    if not file_content or file_content.strip() == "":
-        print(f"No content to scan for {filename}: content is empty or whitespace")
-        return {"is_vulnerable": False, "details": "Empty or invalid file content"}
-
-    content_to_scan = file_content
-    print(f"Preparing to scan content for {filename}: {content_to_scan[:100]}{'...' if len(content_to_scan) > 100 else ''}")
-
-    bearer_path = shutil.which('bearer') or '/usr/local/bin/bearer'
-    if not os.path.exists(bearer_path):
-        print(f"Bearer CLI not found at {bearer_path}")
-        return {"is_vulnerable": False, "details": "Bearer CLI not installed or not found"}
-
-    vulnerabilities = []
-    temp_file_path = None
-    stderr_file_path = None
-    try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as temp_file:
-            temp_file.write(content_to_scan)
-            temp_file_path = temp_file.name
-
-        # Verify temporary file content
-        with open(temp_file_path, 'r', encoding='utf-8') as temp_file:
-            temp_content = temp_file.read()
-            print(f"Temporary file content for {filename}: {temp_content[:100]}{'...' if len(temp_content) > 100 else ''}")
-
-        stderr_fd, stderr_file_path = tempfile.mkstemp(suffix='.txt')
-        with os.fdopen(stderr_fd, 'w') as stderr_file:
-            stderr_file.write("")
-
-        result = subprocess.run(
-            [bearer_path, 'scan', temp_file_path, '--format', 'json', '--quiet'],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-
-        with open(stderr_file_path, 'r', encoding='utf-8') as stderr_file:
-            stderr_output = stderr_file.read()
-
-        print(f"Bearer scan stdout for {filename}: {result.stdout}")
-        print(f"Bearer scan stderr for {filename}: {stderr_output}")
-        print(f"Bearer scan return code for {filename}: {result.returncode}")
-
-        if result.stdout:
-            try:
-                bearer_output = json.loads(result.stdout)
-                if not bearer_output:  # Empty JSON output
-                    print(f"Empty Bearer scan output for {filename}: likely no vulnerabilities in simple Python code")
-                    return {"is_vulnerable": False, "details": "No vulnerabilities detected (simple Python code)"}
-                for severity in ['critical', 'high', 'medium', 'low', 'warning']:
-                    for finding in bearer_output.get(severity, []):
-                        vulnerabilities.append({
-                            "type": finding.get('title', 'Unknown Vulnerability'),
-                            "line": finding.get('line_number', 1),
-                            "snippet": finding.get('code_extract', finding.get('snippet', 'No snippet available'))
-                        })
-            except json.JSONDecodeError as e:
-                print(f"Failed to parse Bearer JSON output for {filename}: {str(e)}")
-                return {"is_vulnerable": False, "details": f"Failed to parse Bearer output: {str(e)}"}
-
-        if not vulnerabilities and stderr_output:
-            print(f"Bearer scan error for {filename}: {stderr_output}")
-            return {"is_vulnerable": False, "details": f"Bearer scan failed: {stderr_output}"}
-        elif not vulnerabilities and not result.stdout:
-            print(f"Bearer scan produced no output for {filename}")
-            return {"is_vulnerable": False, "details": "No vulnerabilities detected (no scan output)"}
-
-    except subprocess.TimeoutExpired:
-        print(f"Bearer scan timed out for {filename}")
-        return {"is_vulnerable": False, "details": "Bearer scan timed out"}
-    except Exception as e:
-        print(f"Error running Bearer scan for {filename}: {str(e)}")
-        return {"is_vulnerable": False, "details": f"Failed to scan file: {str(e)}"}
-    finally:
-        for path in [temp_file_path, stderr_file_path]:
-            if path and os.path.exists(path):
-                try:
-                    os.unlink(path)
-                except Exception as e:
-                    print(f"Failed to delete temporary file {path}: {str(e)}")
-
-    if vulnerabilities:
-        return {"is_vulnerable": True, "details": vulnerabilities}
-    return {"is_vulnerable": False, "details": "No vulnerabilities detected"}
-
 @admin_bp.route("/pull_requests/<project_name>", methods=["GET"])
 def get_pull_requests(project_name):
-    print(f"Entering get_pull_requests endpoint for project: {project_name}")
+    logger.debug("Entering get_pull_requests endpoint for project: %s", project_name)
     user_email = request.headers.get("X-User-Email")
-    print(f"User email: {user_email}")
-    user = db.users.find_one({"email": user_email, "role": "admin"})
+    logger.debug("User email: %s", user_email)
+    user = current_user(role="admin", full=True)
     if not user:
-        print(f"No admin found for email: {user_email}")
+        logger.warning("No admin found for email: %s", user_email)
         return jsonify({"error": "No admin found"}), 404
 
     if not project_name:
-        print("Project name is missing")
+        logger.warning("Project name is missing")
         return jsonify({"error": "Project name is required"}), 400
 
     created_projects = user.get("createdProjects", [])
-    print(f"Created projects: {created_projects}")
+    logger.debug("Created projects: %s", created_projects)
     if project_name not in created_projects:
-        print(f"Project {project_name} not created by user")
+        logger.warning("Project %s not created by user", project_name)
         return jsonify({"error": "Project not created by user"}), 403
 
     github_token = user.get("githubToken", "")
     repo_owner = user.get("githubUsername", "")
-    print(f"Admin GitHub username: {repo_owner}, token present: {bool(github_token)}")
+    logger.debug("Admin GitHub username: %s, token present: %s", repo_owner, bool(github_token))
     if not github_token or not repo_owner:
-        print("Admin GitHub credentials missing")
+        logger.warning("Admin GitHub credentials missing")
         return jsonify({"error": "Admin GitHub credentials missing", "project": project_name}), 400
 
     headers = {"Authorization": f"token {github_token}", "Accept": "application/vnd.github.v3+json"}
@@ -552,62 +463,68 @@ def get_pull_requests(project_name):
     approved_count = 0
     rejected_count = 0
     try:
-        repo_check_url = f"https://api.github.com/repos/{repo_owner}/{project_name}"
-        print(f"Checking repository: {repo_check_url}")
-        repo_response = requests.get(repo_check_url, headers=headers)
-        print(f"Repository check response: status={repo_response.status_code}")
+        repo_check_url = f"{GITHUB_API_URL}/repos/{repo_owner}/{project_name}"
+        logger.debug("Checking repository: %s", repo_check_url)
+        repo_response = github_request("get", repo_check_url, headers=headers)
+        logger.debug("Repository check response: status=%s", repo_response.status_code)
         if repo_response.status_code == 404:
-            print(f"Repository not found: {project_name}")
+            logger.warning("Repository not found: %s", project_name)
             return jsonify({"error": f"Repository {project_name} not found"}), 404
         elif repo_response.status_code == 403:
-            print(f"Rate limit exceeded checking repository {project_name}: {repo_response.status_code} - {repo_response.text}")
+            logger.warning("Rate limit exceeded checking repository %s: %s - %s", project_name, repo_response.status_code, repo_response.text)
             return jsonify({"error": "GitHub API rate limit exceeded"}), 403
 
-        repo_url = f"https://api.github.com/repos/{repo_owner}/{project_name}/pulls?state=all"
-        print(f"Fetching pull requests from: {repo_url}")
-        response = requests.get(repo_url, headers=headers)
-        print(f"GitHub API response for {project_name}: status={response.status_code}, data={response.text[:200]}...")
+        repo_url = f"{GITHUB_API_URL}/repos/{repo_owner}/{project_name}/pulls?state=all"
+        logger.debug("Fetching pull requests from: %s", repo_url)
+        response = github_request("get", repo_url, headers=headers)
+        logger.debug("GitHub API response for %s: status=%s, data=%.200s...", project_name, response.status_code, response.text)
 
         if response.status_code == 200:
             prs = response.json()
-            print(f"Found {len(prs)} pull requests")
-            for pr in prs:
+            logger.debug("Found %s pull requests", len(prs))
+            for pr in traced(prs, "pull_request", lambda pr: {"pr.id": int(pr["number"])}):
                 pr_id = int(pr["number"])
                 developer = (pr["user"]["login"] or "").lower().strip()
-                print(f"Processing PR #{pr_id}, developer: {developer}")
+                logger.debug("Processing PR #%s, developer: %s", pr_id, developer)
 
-                files_url = f"https://api.github.com/repos/{repo_owner}/{project_name}/pulls/{pr_id}/files"
-                print(f"Fetching files for PR #{pr_id}: {files_url}")
-                files_response = requests.get(files_url, headers=headers)
-                changed_files = []
+                files_url = f"{GITHUB_API_URL}/repos/{repo_owner}/{project_name}/pulls/{pr_id}/files"
+                logger.debug("Fetching files for PR #%s: %s", pr_id, files_url)
+                files_response = github_request("get", files_url, headers=headers)
+                pending_files = []
 
                 if files_response.status_code == 200:
                     files_data = files_response.json()
-                    print(f"Found {len(files_data)} files in PR #{pr_id}")
+                    logger.debug("Found %s files in PR #%s", len(files_data), pr_id)
                     for file in files_data:
                         file_content = None
                         if "contents_url" in file:
-                            print(f"Fetching file content: {file['contents_url']}")
-                            content_response = requests.get(file["contents_url"], headers=headers)
+                            logger.debug("Fetching file content: %s", file['contents_url'])
+                            content_response = github_request("get", file["contents_url"], headers=headers)
                             if content_response.status_code == 200:
                                 content_data = content_response.json()
                                 if "content" in content_data and content_data.get("encoding") == "base64":
                                     try:
                                         file_content = base64.b64decode(content_data["content"]).decode('utf-8', errors='replace')
                                     except (base64.binascii.Error, UnicodeDecodeError) as e:
-                                        print(f"Error decoding file content: {str(e)}")
+                                        logger.error("Error decoding file content: %s", str(e))
                                         file_content = file.get("patch", "No content available")
                         if not file_content:
                             file_content = file.get("patch", "No content available")
-                            print(f"Using patch as file content for {file['filename']}")
+                            logger.debug("Using patch as file content for %s", file['filename'])
 
-                        vuln_result = check_vulnerabilities(file_content, file["filename"])
-                        changed_files.append({
-                            "filename": file["filename"],
-                            "content": file_content,
-                            "vulnerability": vuln_result
-                        })
-                        print(f"File {file['filename']} processed, vulnerability: {vuln_result['is_vulnerable']}")
+                        # Queue the scan; results are collected once every file of the PR is submitted
+                        pending_files.append((file["filename"], file_content, submit_scan(file_content, file["filename"])))
+
+                changed_files = []
+                for filename, file_content, scan in pending_files:
+                    with span("scan.wait", **{"file.name": filename}):
+                        vuln_result = wait_for_scan(scan)
+                    changed_files.append({
+                        "filename": filename,
+                        "content": file_content,
+                        "vulnerability": vuln_result
+                    })
+                    logger.debug("File %s processed, vulnerability: %s", filename, vuln_result['is_vulnerable'])
 
                 pr_status = "approved" if pr.get("merged_at") else ("rejected" if pr["state"] == "closed" else "pending")
                 if pr_status == "approved":
@@ -624,112 +541,134 @@ def get_pull_requests(project_name):
                     "securityScore": None if any(f["vulnerability"]["is_vulnerable"] for f in changed_files) else "Safe",
                     "txHash": "N/A"
                 }
-                print(f"PR #{pr_id} data prepared: status={pr_status}, files={len(changed_files)}")
+                logger.debug("PR #%s data prepared: status=%s, files=%s", pr_id, pr_status, len(changed_files))
 
                 # Check if PR exists on blockchain with retry logic
                 max_retries = 3
                 for attempt in range(max_retries):
                     try:
                         pr_on_chain = contract.functions.getPullRequest(pr_id).call()
-                        print(f"PR #{pr_id} blockchain check: isLogged={pr_on_chain[5]}")
+                        logger.debug("PR #%s blockchain check: isLogged=%s", pr_id, pr_on_chain[5])
                         if pr_on_chain[5]:  # isLogged
-                            events = contract.events.PullRequestLogged.get_logs(
-                                fromBlock=0,
-                                argument_filters={'pullRequestId': pr_id}
-                            )
-                            if events:
-                                latest_event = max(events, key=lambda e: e['blockNumber'])
-                                pr_data["txHash"] = latest_event['transactionHash'].hex()
-                                print(f"PR #{pr_id} already logged, txHash: {pr_data['txHash']}")
+                            tx_hash = logged_tx_hash(contract, pr_id)
+                            if tx_hash:
+                                pr_data["txHash"] = tx_hash
+                                logger.debug("PR #%s already logged, txHash: %s", pr_id, pr_data['txHash'])
                             break
                         else:
-                            print(f"Logging new PR #{pr_id} to blockchain")
-                            balance = w3.eth.get_balance(blockchain_account.address)
+                            logger.debug("Logging new PR #%s to blockchain", pr_id)
+                            # Balance and nonce in one round trip; the nonce is unused if the balance check fails
+                            with w3.batch_requests() as batch:
+                                batch.add(w3.eth.get_balance(blockchain_account.address))
+                                batch.add(w3.eth.get_transaction_count(blockchain_account.address, 'pending'))
+                                balance, nonce = batch.execute()
                             balance_eth = w3.from_wei(balance, 'ether')
-                            print(f"Account {blockchain_account.address} balance: {balance_eth} ETH")
+                            logger.debug("Account %s balance: %s ETH", blockchain_account.address, balance_eth)
                             if balance_eth < 0.01:
-                                print(f"Insufficient balance for PR #{pr_id}: {balance_eth} ETH")
+                                logger.warning("Insufficient balance for PR #%s: %s ETH", pr_id, balance_eth)
                                 return jsonify({"error": f"Insufficient account balance: {balance_eth} ETH"}), 500
 
-                            nonce = w3.eth.get_transaction_count(blockchain_account.address, 'pending')
                             gas_estimate = contract.functions.logPullRequest(
-                                pr_id, project_name, developer, pr["created_at"], pr_status
+                                *log_pull_request_args(pr_id, project_name, developer, pr["created_at"], pr_status)
                             ).estimate_gas({'from': blockchain_account.address})
-                            print(f"PR #{pr_id} gas estimate: {gas_estimate}, using gas: {gas_estimate + 10000}")
+                            logger.debug("PR #%s gas estimate: %s, using gas: %s", pr_id, gas_estimate, gas_estimate + 10000)
                             gas_price = w3.eth.gas_price
                             estimated_cost = gas_estimate * gas_price
-                            print(f"Estimated cost: {w3.from_wei(estimated_cost, 'ether')} ETH (gasPrice: {w3.from_wei(gas_price, 'gwei')} Gwei)")
+                            logger.debug("Estimated cost: %s ETH (gasPrice: %s Gwei)", w3.from_wei(estimated_cost, 'ether'), w3.from_wei(gas_price, 'gwei'))
                             if balance < estimated_cost:
-                                print(f"Insufficient funds: balance={balance_eth} ETH, required={w3.from_wei(estimated_cost, 'ether')} ETH")
+                                logger.warning("Insufficient funds: balance=%s ETH, required=%s ETH", balance_eth, w3.from_wei(estimated_cost, 'ether'))
                                 return jsonify({"error": f"Insufficient funds: {balance_eth} ETH available, {w3.from_wei(estimated_cost, 'ether')} ETH required"}), 500
 
                             tx = contract.functions.logPullRequest(
-                                pr_id, project_name, developer, pr["created_at"], pr_status
+                                *log_pull_request_args(pr_id, project_name, developer, pr["created_at"], pr_status)
                             ).build_transaction({
                                 'from': blockchain_account.address,
                                 'nonce': nonce,
                                 'gas': gas_estimate + 10000,
                                 'gasPrice': gas_price,
-                                'chainId': 1337
+                                'chainId': w3.eth.chain_id  # memoized by the provider
                             })
                             signed_tx = w3.eth.account.sign_transaction(tx, blockchain_account._private_key)
                             tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-                            receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=300)
+                            with chain_tx_confirmation_seconds.time(), span("chain.wait_receipt"):
+                                receipt = wait_for_receipt(w3, tx_hash, timeout=300)
                             if receipt['status'] == 0:
                                 pr_data["txHash"] = "Failed"
-                                print(f"Transaction failed for PR #{pr_id}: {receipt}")
+                                logger.warning("Transaction failed for PR #%s: %s", pr_id, receipt)
                                 raise Web3Exception(f"Transaction failed: {receipt}")
-                            tx_data = w3.eth.get_transaction(tx_hash)
-                            decoded_input = contract.decode_function_input(tx_data.input)
-                            function_called, function_args = decoded_input
-                            print(f"Stored PR #{pr_id} for {project_name} on blockchain, tx: {tx_hash.hex()}, gas used: {receipt['gasUsed']}, attempt: {attempt + 1}")
-                            print(f"Transaction receipt: {receipt}")
-                            print(f"Function called: {function_called.fn_name}")
-                            print(f"Arguments: {function_args}")
-                            pr_data["txHash"] = tx_hash.hex()
+                            logger.info("Stored PR #%s for %s on blockchain, tx: %s, gas used: %s, attempt: %s", pr_id, project_name, Web3.to_hex(tx_hash), receipt['gasUsed'], attempt + 1)
+                            # Decoding the input costs another RPC round trip, so only do it when it will be logged
+                            if logger.isEnabledFor(logging.DEBUG):
+                                tx_data = w3.eth.get_transaction(tx_hash)
+                                function_called, function_args = contract.decode_function_input(tx_data.input)
+                                logger.debug("Transaction receipt: %s", receipt)
+                                logger.debug("Function called: %s, arguments: %s", function_called.fn_name, function_args)
+                            pr_data["txHash"] = Web3.to_hex(tx_hash)
                             break
                     except Web3Exception as we:
-                        print(f"Web3 error for PR #{pr_id} for {project_name} on attempt {attempt + 1}: {str(we)}")
+                        logger.warning("Web3 error for PR #%s for %s on attempt %s: %s", pr_id, project_name, attempt + 1, str(we))
                         pr_data["txHash"] = "Failed"
                         if attempt == max_retries - 1:
-                            print(f"Max retries reached for PR #{pr_id}")
+                            logger.warning("Max retries reached for PR #%s", pr_id)
                             break
                         time.sleep(1)
                         continue
                     except Exception as e:
-                        print(f"Error processing PR #{pr_id} for {project_name} on blockchain on attempt {attempt + 1}: {str(e)}")
+                        logger.error("Error processing PR #%s for %s on blockchain on attempt %s: %s", pr_id, project_name, attempt + 1, str(e))
                         pr_data["txHash"] = "Failed"
                         if attempt == max_retries - 1:
-                            print(f"Max retries reached for PR #{pr_id}")
+                            logger.warning("Max retries reached for PR #%s", pr_id)
                             break
                         time.sleep(1)
                         continue
 
                 pullrequests.append(pr_data)
-                print(f"Added PR #{pr_id} to response")
+                logger.debug("Added PR #%s to response", pr_id)
 
         elif response.status_code == 403:
-            print(f"Rate limit exceeded for {project_name}: {response.status_code} - {response.text}")
+            logger.warning("Rate limit exceeded for %s: %s - %s", project_name, response.status_code, response.text)
             return jsonify({"error": "GitHub API rate limit exceeded"}), 403
         else:
-            print(f"Failed to fetch PRs for {project_name}: {response.status_code} - {response.text}")
+            logger.error("Failed to fetch PRs for %s: %s - %s", project_name, response.status_code, response.text)
             return jsonify({"error": f"Failed to fetch pull requests: {response.status_code}"}), response.status_code
 
         points = approved_count - rejected_count
-        print(f"Calculated points for project {project_name}: {points} (approved: {approved_count}, rejected: {rejected_count})")
+        logger.debug("Calculated points for project %s: %s (approved: %s, rejected: %s)", project_name, points, approved_count, rejected_count)
         try:
             db.users.update_one(
                 {"_id": ObjectId(user["_id"])},
                 {"$set": {f"points.{project_name}": points}}
             )
-            print(f"Updated points in MongoDB for project {project_name}: {points}")
+            logger.debug("Updated points in MongoDB for project %s: %s", project_name, points)
         except Exception as e:
-            print(f"Failed to update points for project {project_name}: {str(e)}")
+            logger.error("Failed to update points for project %s: %s", project_name, str(e))
             return jsonify({"error": f"Failed to update points: {str(e)}"}), 500
 
     except Exception as e:
-        print(f"Error fetching PRs for {project_name}: {str(e)}")
+        logger.error("Error fetching PRs for %s: %s", project_name, str(e))
         return jsonify({"error": f"Error fetching pull requests: {str(e)}"}), 500
 
-    print(f"Returning {len(pullrequests)} pull requests for project {project_name}")
-    return jsonify({"pullRequests": pullrequests, "points": points}), 200
\ No newline at end of file
+    logger.info("Returning %s pull requests for project %s", len(pullrequests), project_name)
+    return jsonify({"pullRequests": pullrequests, "points": points}), 200
+@admin_bp.route("/pull_requests/<project_name>/<int:pr_id>/history", methods=["GET"])
+def get_pull_request_history(project_name, pr_id):
+    """Every version of a PR stored on chain, oldest first, read one page at a time."""
+    user = current_user(role="admin", full=True)
+    if not user:
+        return jsonify({"error": "No admin found"}), 404
+    if project_name not in user.get("createdProjects", []):
+        logger.warning("Project %s not created by user", project_name)
+        return jsonify({"error": "Project not created by user"}), 403
+    if not any(item.get("name") == "getPullRequestHistoryPage" for item in contract.abi):
+        return jsonify({"error": "PR history is not stored by this contract version; read its PullRequestLogged events"}), 404
+
+    try:
+        history = [
+            {"pullRequestId": entry[0], "projectName": entry[1], "developer": entry[2], "timestamp": entry[3], "status": entry[4]}
+            for entry in pull_request_history(contract, pr_id)
+            if entry[1] == project_name
+        ]
+    except Exception as e:
+        logger.error("Failed to read on-chain history of PR #%s: %s", pr_id, str(e))
+        return jsonify({"error": f"Blockchain error: {str(e)}"}), 500
+    return jsonify({"project": project_name, "pullRequestId": pr_id, "history": history}), 200
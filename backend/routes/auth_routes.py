@@ -1,11 +1,13 @@
 from flask import Blueprint, request, jsonify
 from bson.objectid import ObjectId
-import bcrypt
-from config.db import connect_db
+from config.passwords import hash_password, verify_password, needs_rehash
+from config.sessions import issue_token
+from config.registry import LazyService
+import logging
 
-db = connect_db()
-users_col = db['users']
+users_col = LazyService("db", "users")
 auth_bp = Blueprint('auth', __name__)
+logger = logging.getLogger(__name__)
 
 def serialize_user(doc, mask=True):
     data = {
@@ -37,7 +39,7 @@ def signup():
     user = {
         'username': data['username'],
         'email': data['email'].lower(),
-        'password': bcrypt.hashpw(data['password'].encode(), bcrypt.gensalt()),
+        'password': hash_password(data['password']),
         'role': data['role'],
         'githubUsername': data['githubUsername'],
         'githubToken': data['githubToken']
@@ -50,7 +52,7 @@ def signup():
             user['points'] = {}  # Initialize points as an empty object for developers
     res = users_col.insert_one(user)
     user['_id'] = res.inserted_id
-    print(f"Registered user: {user['username']}")
+    logger.info("Registered user: %s", user['username'])
     return jsonify({'user': serialize_user(user, mask=False)}), 201
 
 @auth_bp.route('/login', methods=['POST'])
@@ -63,11 +65,15 @@ def login():
     user = users_col.find_one({'$or': [{'username': identifier}, {'email': identifier.lower()}]})
     if not user:
         return jsonify({'error': 'User not found'}), 404
-    if not bcrypt.checkpw(pw.encode(), user['password']):
-        print(f"Login failed for identifier: {identifier}")
+    if not verify_password(pw, user['password']):
+        logger.warning("Login failed for identifier: %s", identifier)
         return jsonify({'error': 'Invalid credentials'}), 401
-    print(f"Login successful for user: {user['username']}")
-    return jsonify({'user': serialize_user(user, mask=False)}), 200
+    if needs_rehash(user['password']):
+        # Cost factor changed since this hash was made; upgrade it while we have the plaintext
+        users_col.update_one({'_id': user['_id']}, {'$set': {'password': hash_password(pw)}})
+        logger.info("Rehashed password for user: %s", user['username'])
+    logger.info("Login successful for user: %s", user['username'])
+    return jsonify({'user': serialize_user(user, mask=False), 'token': issue_token(user)}), 200
 
 @auth_bp.route('/users/<user_id>', methods=['PUT'])
 def update_user(user_id):
@@ -76,23 +82,23 @@ def update_user(user_id):
     project_name = data.get('projectName')
     
     if points is None or not isinstance(points, int):
-        print(f"Invalid points value: {points}")
+        logger.warning("Invalid points value: %s", points)
         return jsonify({'error': 'Invalid or missing points value'}), 400
     if not project_name or not isinstance(project_name, str) or not project_name.strip():
-        print(f"Invalid projectName: {project_name}")
+        logger.warning("Invalid projectName: %s", project_name)
         return jsonify({'error': 'Invalid or missing project name'}), 400
 
     try:
         if not ObjectId.is_valid(user_id):
-            print(f"Invalid user_id: {user_id}")
+            logger.warning("Invalid user_id: %s", user_id)
             return jsonify({'error': 'Invalid user ID format'}), 400
 
         user = users_col.find_one({'_id': ObjectId(user_id), 'role': 'developer'})
         if not user:
-            print(f"No developer found for ID: {user_id}")
+            logger.warning("No developer found for ID: %s", user_id)
             return jsonify({'error': 'Developer not found'}), 404
         if isinstance(user.get('points'), list):
-            print(f"Invalid points field type for user {user_id}: expected object, got array")
+            logger.warning("Invalid points field type for user %s: expected object, got array", user_id)
             return jsonify({'error': 'User points field must be an object, not an array'}), 400
 
         result = users_col.update_one(
@@ -100,26 +106,26 @@ def update_user(user_id):
             {'$set': {f'points.{project_name}': points}}
         )
         if result.matched_count == 0:
-            print(f"No developer found for ID: {user_id}")
+            logger.warning("No developer found for ID: %s", user_id)
             return jsonify({'error': 'Developer not found'}), 404
-        print(f"Updated points for user {user_id}, project {project_name}: {points}")
+        logger.info("Updated points for user %s, project %s: %s", user_id, project_name, points)
         return jsonify({'message': f'Points updated for {project_name}', 'points': points}), 200
     except Exception as e:
-        print(f"Failed to update user points for user {user_id}, project {project_name}: {str(e)}")
+        logger.error("Failed to update user points for user %s, project %s: %s", user_id, project_name, str(e))
         return jsonify({'error': f'Failed to update user points: {str(e)}'}), 500
 
 @auth_bp.route('/users/<user_id>', methods=['GET'])
 def get_user(user_id):
     try:
         if not ObjectId.is_valid(user_id):
-            print(f"Invalid user_id: {user_id}")
+            logger.warning("Invalid user_id: %s", user_id)
             return jsonify({'error': 'Invalid user ID format'}), 400
         user = users_col.find_one({'_id': ObjectId(user_id)})
         if not user:
-            print(f"No user found for ID: {user_id}")
+            logger.warning("No user found for ID: %s", user_id)
             return jsonify({'error': 'User not found'}), 404
-        print(f"Retrieved user: {user['username']}")
+        logger.debug("Retrieved user: %s", user['username'])
         return jsonify({'user': serialize_user(user, mask=False)}), 200
     except Exception as e:
-        print(f"Failed to retrieve user {user_id}: {str(e)}")
+        logger.error("Failed to retrieve user %s: %s", user_id, str(e))
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -0,0 +1,2 @@
+from scanning.base import ScannerBackend, scan_result
+from scanning.service import ScanService, get_scan_service, submit_scan, check_vulnerabilities, scan_stats, wait_for_scan
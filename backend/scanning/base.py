@@ -0,0 +1,43 @@
+from concurrent.futures import Future
+
+
+def scan_result(is_vulnerable, details):
+    """Single result schema shared by every scanner backend."""
+    return {
+        "is_vulnerable": is_vulnerable,
+        "details": details,  # list of findings, or a status message
+    }
+
+
+def finding(vuln_type, line, snippet):
+    return {
+        "type": vuln_type,
+        "line": line,
+        "snippet": snippet,
+    }
+
+
+def completed(result):
+    """Wrap an already-known result in a resolved Future."""
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class ScannerBackend:
+    """Interface implemented by scanner backends.
+
+    `submit` must return a Future resolving to a `scan_result` dict, so the
+    service can queue every file of a PR before awaiting any of them.
+    """
+
+    name = "base"
+
+    def start(self):
+        return self
+
+    def submit(self, content, filename):
+        raise NotImplementedError
+
+    def scan(self, content, filename):
+        return self.submit(content, filename).result()
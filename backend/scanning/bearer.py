@@ -0,0 +1,184 @@
+import functools
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+from dotenv import load_dotenv
+from config.metrics import scan_seconds, scan_timeouts_total
+from scanning.base import ScannerBackend, scan_result, finding, completed
+from scanning.staging import ScratchDir
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+SEVERITIES = ['critical', 'high', 'medium', 'low', 'warning']
+
+
+@functools.lru_cache(maxsize=None)
+def detect_bearer():
+    """Locate the Bearer CLI and read its version once per process.
+
+    Returns (path, version), or (None, None) if Bearer is unusable.
+    """
+    bearer_path = shutil.which('bearer') or os.environ.get("BEARER_PATH", '/usr/local/bin/bearer')
+    if not os.path.exists(bearer_path):
+        logger.warning("Bearer CLI not found at %s. Ensure Bearer is installed.", bearer_path)
+        return None, None
+
+    try:
+        version_result = subprocess.run(
+            [bearer_path, '--version'],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+    except Exception as e:
+        logger.error("Failed to verify Bearer CLI version: %s", str(e))
+        return None, None
+    version = version_result.stdout.strip()
+    logger.info("Bearer CLI version: %s", version)
+    return bearer_path, version
+
+
+class BearerBackend(ScannerBackend):
+    """Warm pool of Bearer workers fed through a job queue.
+
+    Bearer has no daemon mode, so the rule-loading cost is amortised by
+    letting each worker drain several queued files and scan them in a
+    single `bearer scan` invocation.
+    """
+
+    def __init__(self, name="bearer", workers=2, batch_size=8, batch_wait=0.05, timeout=60):
+        self.name = name
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.timeout = timeout
+        self.bearer_path = None
+        self.version = None
+        self.jobs = queue.Queue()
+        self.threads = []
+        self.lock = threading.Lock()
+        self.stats = {"files": 0, "batches": 0, "scan_seconds": 0.0}
+
+    def start(self):
+        self.bearer_path, self.version = detect_bearer()
+        if not self.bearer_path:
+            return self
+
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"{self.name}-worker-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        logger.info("Started %s %s workers (batch size %s)", self.workers, self.name, self.batch_size)
+        return self
+
+    def submit(self, content, filename):
+        """Queue a file for scanning and return a Future with the scan result."""
+        if not self.bearer_path:
+            return completed(scan_result(False, "Bearer CLI not installed or not found"))
+        future = Future()
+        self.jobs.put((content, filename, future))
+        return future
+
+    def _next_batch(self):
+        batch = [self.jobs.get()]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.jobs.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _work(self):
+        # Each worker stages its batches in one RAM-backed directory for its whole lifetime
+        scratch = None
+        while True:
+            batch = self._next_batch()
+            try:
+                if scratch is None:
+                    scratch = ScratchDir(prefix=f"{self.name}-")
+                self._run_batch(batch, scratch)
+            except Exception as e:
+                # A dead worker would leave these futures, and every request waiting on them, pending forever
+                logger.error("%s worker failed a batch of %s files: %s", self.name, len(batch), e)
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_result(scan_result(False, f"Failed to scan file: {str(e)}"))
+
+    def _run_batch(self, batch, scratch):
+        started = time.monotonic()
+        try:
+            results = self._scan_batch(batch, scratch)
+        except subprocess.TimeoutExpired:
+            logger.warning("Bearer scan timed out for batch of %s files", len(batch))
+            scan_timeouts_total.inc(self.name)
+            results = [scan_result(False, "Bearer scan timed out")] * len(batch)
+        except Exception as e:
+            logger.error("Error running Bearer scan for batch of %s files: %s", len(batch), str(e))
+            results = [scan_result(False, f"Failed to scan file: {str(e)}")] * len(batch)
+
+        elapsed = time.monotonic() - started
+        scan_seconds.observe(elapsed, self.name)
+        with self.lock:
+            self.stats["files"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["scan_seconds"] += elapsed
+        logger.debug("Bearer scanned %s files in %.2fs", len(batch), elapsed)
+
+        for (_, _, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _scan_batch(self, batch, scratch):
+        names = scratch.stage([(content, filename) for content, filename, _ in batch])
+        result = subprocess.run(
+            [self.bearer_path, 'scan', scratch.path, '--format', 'json', '--quiet'],
+            capture_output=True,
+            text=True,
+            timeout=self.timeout
+        )
+
+        if not result.stdout:
+            if result.stderr:
+                logger.error("Bearer scan error output: %s", result.stderr)
+                return [scan_result(False, f"Bearer scan failed: {result.stderr}")] * len(batch)
+            # Bearer always prints a JSON report, so silence means the run is broken; don't let it be cached as safe
+            logger.error("Bearer scan produced no output for batch of %s files", len(batch))
+            return [scan_result(False, "Bearer scan produced no output")] * len(batch)
+
+        try:
+            bearer_output = json.loads(result.stdout)
+        except json.JSONDecodeError as e:
+            logger.error("Failed to parse Bearer JSON output: %s", str(e))
+            return [scan_result(False, f"Failed to parse Bearer output: {str(e)}")] * len(batch)
+
+        findings = {name: [] for name in names}
+        for severity in SEVERITIES:
+            for item in (bearer_output or {}).get(severity, []):
+                name = os.path.basename(item.get('filename', ''))
+                if name in findings:
+                    findings[name].append(finding(
+                        item.get('title', 'Unknown Vulnerability'),
+                        item.get('line_number', 1),
+                        item.get('code_extract', item.get('snippet', 'No snippet available'))
+                    ))
+
+        results = []
+        for name in names:
+            vulnerabilities = findings[name]
+            if vulnerabilities:
+                results.append(scan_result(True, vulnerabilities))
+            else:
+                results.append(scan_result(False, "No vulnerabilities detected"))
+        return results
+
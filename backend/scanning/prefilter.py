@@ -0,0 +1,97 @@
+import ast
+import re
+
+# Calls that hand data to a shell, the interpreter, a deserializer, the
+# filesystem or the network, plus the weak-crypto and logging calls that
+# Bearer's Python rules look at
+SINK_CALLS = re.compile(
+    r'^(subprocess\.\w+|os\.(system|popen|exec\w*|spawn\w*)|eval|exec|compile|__import__|open'
+    r'|pickle\.loads?|cPickle\.loads?|marshal\.loads?|shelve\.open|yaml\.(load|unsafe_load)'
+    r'|\w+\.execute(many)?|\w+\.raw|hashlib\.\w+|random\.\w+|tempfile\.mktemp'
+    r'|requests\.\w+|urllib\.\w+(\.\w+)*|jwt\.\w+|ssl\.\w+|(logging|logger|log)\.\w+)$'
+)
+SINK_MODULES = re.compile(r'^(subprocess|pickle|cPickle|marshal|shelve|ctypes|flask|django|sqlite3|psycopg2|pymysql)$')
+SECRET_NAMES = re.compile(r'(passw(or)?d|secret|token|api_?key|private_?key|access_?key)', re.IGNORECASE)
+SQL_KEYWORDS = re.compile(r'\b(select|insert|update|delete|drop)\b.*\b(from|into|set|table|where)\b', re.IGNORECASE | re.DOTALL)
+
+
+def _dotted_name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        parent = _dotted_name(node.value)
+        return f"{parent}.{node.attr}" if parent else node.attr
+    return None
+
+
+def _imported_names(tree):
+    """Local name -> dotted name it was imported as, e.g. {"o": "os", "system": "os.system"}."""
+    names = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    names[alias.asname] = alias.name
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            for alias in node.names:
+                names[alias.asname or alias.name] = f"{node.module}.{alias.name}"
+    return names
+
+
+def _resolve(name, imported):
+    head, _, rest = name.partition('.')
+    if head not in imported:
+        return name
+    return f"{imported[head]}.{rest}" if rest else imported[head]
+
+
+def _is_sql_literal(node):
+    return isinstance(node, ast.Constant) and isinstance(node.value, str) and SQL_KEYWORDS.search(node.value)
+
+
+def _builds_sql(node):
+    """String concatenation, %-formatting, .format() or f-strings around SQL text."""
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mod)):
+        return _is_sql_literal(node.left) or _is_sql_literal(node.right) or _builds_sql(node.left)
+    if isinstance(node, ast.JoinedStr):
+        return any(_is_sql_literal(value) for value in node.values)
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == 'format':
+        return _is_sql_literal(node.func.value)
+    return False
+
+
+def find_candidate_sinks(content):
+    """Return (kind, line) pairs for risky sinks in Python source.
+
+    Returns None when the content cannot be parsed (e.g. a diff patch), in
+    which case the file must go to the full scanner.
+    """
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+
+    # Calls are matched by the name they were imported under, so aliases and
+    # `from os import system` cannot hide a sink
+    imported = _imported_names(tree)
+    sinks = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            name = _dotted_name(node.func)
+            if name and (SINK_CALLS.match(name) or SINK_CALLS.match(_resolve(name, imported))):
+                sinks.append((name, node.lineno))
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            modules = [node.module] if isinstance(node, ast.ImportFrom) else [alias.name for alias in node.names]
+            for module in modules:
+                if module and SINK_MODULES.match(module.split('.')[0]):
+                    sinks.append((f"import {module}", node.lineno))
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str) and node.value.value:
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                name = _dotted_name(target)
+                if name and SECRET_NAMES.search(name):
+                    sinks.append(("hard-coded secret", node.lineno))
+
+        if isinstance(node, (ast.BinOp, ast.JoinedStr, ast.Call)) and _builds_sql(node):
+            sinks.append(("SQL string building", node.lineno))
+    return sinks
@@ -0,0 +1,186 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, TimeoutError as FutureTimeout
+from dotenv import load_dotenv
+from config.metrics import cache_lookups_total
+from config.tracing import span
+from scanning.base import scan_result, completed
+from scanning.bearer import BearerBackend
+from scanning.prefilter import find_candidate_sinks
+from scanning.slither import SlitherBackend
+from scanning.stub import StubBackend
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Longest a caller waits for a scan: its own backend run plus one queued run ahead of it
+SCAN_WAIT_TIMEOUT = int(os.environ.get(
+    "SCAN_WAIT_TIMEOUT",
+    2 * max(int(os.environ.get("BEARER_TIMEOUT", 60)), int(os.environ.get("SLITHER_TIMEOUT", 120)))
+))
+
+BACKENDS = {
+    "bearer": lambda language: BearerBackend(
+        name=f"bearer-{language}",
+        workers=int(os.environ.get(f"BEARER_{language.upper()}_WORKERS", os.environ.get("BEARER_WORKERS", 2))),
+        batch_size=int(os.environ.get("BEARER_BATCH_SIZE", 8)),
+        timeout=int(os.environ.get("BEARER_TIMEOUT", 60))
+    ),
+    "slither": lambda language: SlitherBackend(
+        name=f"slither-{language}",
+        workers=int(os.environ.get("SLITHER_WORKERS", 1)),
+        timeout=int(os.environ.get("SLITHER_TIMEOUT", 120))
+    ),
+    "stub": lambda language: StubBackend(name=f"stub-{language}"),
+}
+
+# Language routing table: which extensions go to which backend, and which
+# pre-filter (if any) runs before it. Every language gets its own backend
+# instance, so its own worker pool and cache namespace.
+LANGUAGES = {
+    "python": {"extensions": (".py",), "backend": "bearer", "prefilter": find_candidate_sinks},
+    "javascript": {"extensions": (".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx"), "backend": "bearer", "prefilter": None},
+    "solidity": {"extensions": (".sol",), "backend": "slither", "prefilter": None},
+}
+
+
+class ScanRoute:
+    def __init__(self, language, backend, prefilter=None):
+        self.language = language
+        self.backend = backend
+        self.prefilter = prefilter
+
+
+class ScanService:
+    """Front door for all vulnerability scans.
+
+    Applies the file-level rules shared by every dashboard, then routes the
+    content by extension to a language's backend. Results are cached by
+    backend and content hash so the admin, developer and auditor views of the
+    same PR pay for one scan.
+
+    A route's `prefilter` is a cheap in-process check returning the candidate
+    sinks in a file (or None if it cannot tell); files with no sinks never
+    reach the backend.
+    """
+
+    def __init__(self, routes, cache_size=1024):
+        self.routes = routes  # extension -> ScanRoute
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {"submitted": 0, "cache_hits": 0, "prefilter_skipped": 0, "backend_scans": 0}
+
+    def submit(self, file_content, filename):
+        """Queue a file for scanning and return a Future with its scan_result."""
+        extension = os.path.splitext(filename)[1].lower()
+        route = self.routes.get(extension)
+        if route is None:
+            return completed(scan_result(False, f"No scanner for {extension or 'extensionless'} files, marked as safe"))
+
+        if not file_content or file_content.strip() == "":
+            logger.warning("No content to scan for %s: content is empty or whitespace", filename)
+            return completed(scan_result(False, "Empty or invalid file content"))
+
+        with self.lock:
+            self.stats["submitted"] += 1
+
+        if route.prefilter is not None:
+            with span("scan.prefilter", **{"file.name": filename}):
+                sinks = route.prefilter(file_content)
+            if sinks == []:
+                with self.lock:
+                    self.stats["prefilter_skipped"] += 1
+                return completed(scan_result(False, "No vulnerabilities detected (no risky sinks found by pre-filter)"))
+
+        key = hashlib.sha256(f"{route.backend.name}:{extension}:".encode() + file_content.encode('utf-8', errors='replace')).hexdigest()
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                cache_lookups_total.inc("scan", "hit")
+                return self.cache[key]
+            cache_lookups_total.inc("scan", "miss")
+            self.stats["backend_scans"] += 1
+            future = route.backend.submit(file_content, filename)
+            self.cache[key] = future
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        future.add_done_callback(lambda done: self._evict_failed(key, done))
+        return future
+
+    def _evict_failed(self, key, future):
+        # Timeouts, backend errors and cancelled scans should be retried on the next request, not cached
+        failed = future.cancelled() or future.exception() is not None
+        if not failed:
+            result = future.result()
+            failed = not result["is_vulnerable"] and not result["details"].startswith("No vulnerabilities")
+        if failed:
+            with self.lock:
+                self.cache.pop(key, None)
+
+    def scan(self, file_content, filename):
+        return wait_for_scan(self.submit(file_content, filename))
+
+
+def wait_for_scan(future, timeout=SCAN_WAIT_TIMEOUT):
+    """The scan_result of a submitted scan; a backend exception or no result in time becomes an error result."""
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeout:
+        logger.warning("No scan result after %ss", timeout)
+        return scan_result(False, "Scan timed out waiting for a scanner worker")
+    except CancelledError:
+        logger.warning("Scan was cancelled before it finished")
+        return scan_result(False, "Scan was cancelled")
+    except Exception as e:
+        logger.error("Scan failed: %s", e)
+        return scan_result(False, f"Failed to scan file: {str(e)}")
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_scan_service():
+    """Return the process-wide scan service, starting its backends on first use.
+
+    SCANNER_BACKEND overrides the backend of every language (e.g. "stub").
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            override = os.environ.get("SCANNER_BACKEND")
+            if override and override not in BACKENDS:
+                raise Exception(f"Unknown SCANNER_BACKEND: {override}")
+            use_prefilter = os.environ.get("SCAN_PREFILTER", "on") == "on"
+            routes = {}
+            for language, config in LANGUAGES.items():
+                route = ScanRoute(
+                    language,
+                    BACKENDS[override or config["backend"]](language).start(),
+                    prefilter=config["prefilter"] if use_prefilter else None
+                )
+                for extension in config["extensions"]:
+                    routes[extension] = route
+            _service = ScanService(routes, cache_size=int(os.environ.get("SCAN_CACHE_SIZE", 1024)))
+    return _service
+
+
+def submit_scan(file_content, filename):
+    return get_scan_service().submit(file_content, filename)
+
+
+def check_vulnerabilities(file_content, filename):
+    """Scan a file with its language's backend and return its scan_result."""
+    return get_scan_service().scan(file_content, filename)
+
+
+def scan_stats():
+    """Counters for the shared scan service, including Bearer runs avoided by the pre-filter."""
+    service = get_scan_service()
+    return dict(service.stats)
@@ -0,0 +1,95 @@
+import json
+import logging
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config.metrics import scan_seconds, scan_timeouts_total
+from scanning.base import ScannerBackend, scan_result, finding, completed
+from scanning.staging import ScratchDir
+
+logger = logging.getLogger(__name__)
+
+# Slither's informational and optimization detectors are style notes, not vulnerabilities
+REPORTED_IMPACTS = ('High', 'Medium', 'Low')
+
+
+class SlitherBackend(ScannerBackend):
+    """Scans Solidity files with Slither on a small dedicated thread pool.
+
+    Slither compiles every file with solc, so it gets its own pool and never
+    competes with the Bearer workers on the Python path.
+    """
+
+    def __init__(self, name="slither", workers=1, timeout=120):
+        self.name = name
+        self.workers = workers
+        self.timeout = timeout
+        self.slither_path = None
+        self.executor = None
+        self.local = threading.local()
+
+    def start(self):
+        self.slither_path = shutil.which('slither')
+        if not self.slither_path:
+            logger.warning("Slither not found in PATH. Solidity files will not be scanned.")
+            return self
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"{self.name}-worker")
+        logger.info("Started %s %s workers", self.workers, self.name)
+        return self
+
+    def submit(self, content, filename):
+        if not self.slither_path:
+            return completed(scan_result(False, "Slither not installed or not found"))
+        return self.executor.submit(self._scan, content, filename)
+
+    def _scan(self, content, filename):
+        try:
+            if not hasattr(self.local, "scratch"):
+                self.local.scratch = ScratchDir(prefix=f"{self.name}-")
+            scratch = self.local.scratch
+            name = scratch.stage([(content, filename)])[0]
+            with scan_seconds.time(self.name):
+                result = subprocess.run(
+                    [self.slither_path, name, '--json', '-'],
+                    capture_output=True,
+                    text=True,
+                    timeout=self.timeout,
+                    cwd=scratch.path
+                )
+        except subprocess.TimeoutExpired:
+            logger.warning("Slither scan timed out for %s", filename)
+            scan_timeouts_total.inc(self.name)
+            return scan_result(False, "Slither scan timed out")
+        except Exception as e:
+            logger.error("Error running Slither scan for %s: %s", filename, str(e))
+            return scan_result(False, f"Failed to scan file: {str(e)}")
+
+        try:
+            slither_output = json.loads(result.stdout)
+        except json.JSONDecodeError:
+            logger.error("Slither scan failed for %s: %s", filename, result.stderr[-500:])
+            return scan_result(False, f"Slither scan failed: {result.stderr[-500:]}")
+
+        if not slither_output.get("success"):
+            logger.error("Slither scan failed for %s: %s", filename, slither_output.get('error'))
+            return scan_result(False, f"Slither scan failed: {slither_output.get('error')}")
+
+        vulnerabilities = []
+        for detector in (slither_output.get("results") or {}).get("detectors", []):
+            if detector.get("impact") not in REPORTED_IMPACTS:
+                continue
+            lines = []
+            for element in detector.get("elements", []):
+                lines = element.get("source_mapping", {}).get("lines") or lines
+                if lines:
+                    break
+            vulnerabilities.append(finding(
+                detector.get("check", "Unknown Vulnerability"),
+                lines[0] if lines else 1,
+                detector.get("description", "No snippet available").strip()
+            ))
+
+        if vulnerabilities:
+            return scan_result(True, vulnerabilities)
+        return scan_result(False, "No vulnerabilities detected")
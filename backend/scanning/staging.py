@@ -0,0 +1,48 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+
+def scratch_root():
+    """Prefer a RAM-backed filesystem for staging scan input."""
+    configured = os.environ.get("SCAN_SCRATCH_DIR")
+    if configured:
+        return configured
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return tempfile.gettempdir()
+
+
+class ScratchDir:
+    """Staging directory owned by one scanner worker and reused for every batch.
+
+    Files are named by their position in the batch, so the next batch
+    overwrites them in place and only the surplus from a larger previous
+    batch has to be unlinked.
+    """
+
+    def __init__(self, prefix="scan-"):
+        self.path = tempfile.mkdtemp(prefix=prefix, dir=scratch_root())
+        self.names = []
+        atexit.register(self.cleanup)
+
+    def stage(self, files):
+        """Write (content, filename) pairs and return the staged names in order."""
+        names = []
+        for index, (content, filename) in enumerate(files):
+            name = f"{index}{os.path.splitext(filename)[1]}"
+            with open(os.path.join(self.path, name), 'w', encoding='utf-8') as f:
+                f.write(content)
+            names.append(name)
+
+        for stale in set(self.names) - set(names):
+            try:
+                os.unlink(os.path.join(self.path, stale))
+            except FileNotFoundError:
+                pass
+        self.names = names
+        return names
+
+    def cleanup(self):
+        shutil.rmtree(self.path, ignore_errors=True)
@@ -1,7 +1,11 @@
-from flask import Flask, jsonify
+from flask import Flask, Response, jsonify
 from flask_cors import CORS
 
-from config.db import connect_db
+from config import metrics, registry
+from config.log import init_app as init_logging
+from config.profiling import init_app as init_profiling
+from config.responses import init_app as init_responses
+from config.tracing import init_app as init_tracing
 from routes.auth_routes import auth_bp
 from routes.developer_routes import dev_bp
 from routes.admin_routes import admin_bp
@@ -10,15 +14,29 @@ from routes.auditor_routes import auditor_bp
 
 app = Flask(__name__)
 CORS(app, supports_credentials=True)
-
-# Connect to MongoDB
-db = connect_db()
+# Registered before the other hooks so compression runs after theirs (after_request runs in reverse)
+init_responses(app)
+init_logging(app)
+init_tracing(app)
+init_profiling(app)
 
 # Root endpoint
 @app.route('/')
 def home():
     return jsonify({"message": "API is running"}), 200
 
+# Dependency health: builds each client on demand and reports which ones are down
+@app.route('/healthz')
+def healthz():
+    services = registry.health()
+    healthy = all(service["ok"] for service in services.values())
+    return jsonify({"status": "ok" if healthy else "degraded", "services": services}), 200 if healthy else 503
+
+# Prometheus scrape target (per worker process)
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 # Register blueprints
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
 app.register_blueprint(admin_bp, url_prefix='/admin')
@@ -29,4 +47,6 @@ app.register_blueprint(auditor_bp, url_prefix="/auditor")
 if __name__ == '__main__':
     import os
     port = int(os.environ.get("PORT", 5001))
-    app.run(host='0.0.0.0', debug=True, port=port)
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py)
+    debug = os.environ.get("FLASK_DEBUG", "0") == "1"
+    app.run(host='0.0.0.0', debug=debug, port=port)
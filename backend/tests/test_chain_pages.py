@@ -0,0 +1,74 @@
+import pytest
+from config.chain_pages import developer_pull_request_ids, iter_pages, pull_request_history
+
+# Run from the backend directory: python -m pytest tests
+
+
+class PagedList:
+    """fetch_page over a list, recording every (offset, limit) call."""
+
+    def __init__(self, items):
+        self.items = items
+        self.calls = []
+
+    def __call__(self, offset, limit):
+        self.calls.append((offset, limit))
+        return self.items[offset:offset + limit], len(self.items)
+
+
+class FakeView:
+    def __init__(self, items):
+        self.pages = PagedList(items)
+        self.args = []
+
+    def __call__(self, *args):
+        self.args.append(args[:-2])
+        return FakeCall(self.pages, *args[-2:])
+
+
+class FakeCall:
+    def __init__(self, pages, offset, limit):
+        self.pages, self.offset, self.limit = pages, offset, limit
+
+    def call(self):
+        return self.pages(self.offset, self.limit)
+
+
+class FakeContract:
+    def __init__(self, **views):
+        self.functions = type("Functions", (), views)()
+
+
+def test_empty_list_takes_one_call():
+    pages = PagedList([])
+    assert list(iter_pages(pages, page_size=3)) == []
+    assert pages.calls == [(0, 3)]
+
+
+@pytest.mark.parametrize("count, calls", [(6, [(0, 3), (3, 3)]), (7, [(0, 3), (3, 3), (6, 3)]), (2, [(0, 3)])])
+def test_pages_cover_every_item_once(count, calls):
+    pages = PagedList(list(range(count)))
+    assert list(iter_pages(pages, page_size=3)) == list(range(count))
+    # An exact multiple of the page size stops on the total, without an empty trailing call
+    assert pages.calls == calls
+
+
+def test_items_appended_mid_iteration_are_picked_up():
+    pages = PagedList([1, 2, 3])
+    seen = []
+    for item in iter_pages(pages, page_size=2):
+        seen.append(item)
+        if item == 1:
+            pages.items.append(4)
+    assert seen == [1, 2, 3, 4]
+
+
+def test_generators_page_through_contract_views():
+    by_developer = FakeView([11, 12, 13])
+    history = FakeView([(5, "proj", "dev", "t0", "pending", True), (5, "proj", "dev", "t1", "approved", True)])
+    contract = FakeContract(getPullRequestsByDeveloperPage=by_developer, getPullRequestHistoryPage=history)
+
+    assert list(developer_pull_request_ids(contract, "dev", "proj", page_size=2)) == [11, 12, 13]
+    assert by_developer.args == [("dev", "proj")] * 2
+    assert [entry[4] for entry in pull_request_history(contract, 5, page_size=2)] == ["pending", "approved"]
+    assert history.args == [(5,)]
@@ -0,0 +1,199 @@
+from concurrent.futures import Future
+import threading
+import pytest
+from scanning import service
+from scanning.base import ScannerBackend, scan_result
+from scanning.bearer import BearerBackend
+from scanning.prefilter import find_candidate_sinks
+from scanning.service import ScanRoute, ScanService, get_scan_service, wait_for_scan
+from scanning.stub import StubBackend
+
+# Run from the backend directory: python -m pytest tests
+
+
+class FailingBackend(ScannerBackend):
+    """Backend whose scans fail, either with an error result or an exception."""
+
+    def __init__(self, name="failing", raises=False):
+        self.name = name
+        self.raises = raises
+        self.calls = []
+
+    def submit(self, content, filename):
+        self.calls.append(filename)
+        future = Future()
+        if self.raises:
+            future.set_exception(RuntimeError("backend down"))
+        else:
+            future.set_result(scan_result(False, "Bearer scan timed out"))
+        return future
+
+
+def make_service(python=None, solidity=None, prefilter=None):
+    python = python or StubBackend(name="stub-python")
+    solidity = solidity or StubBackend(name="stub-solidity")
+    python_route = ScanRoute("python", python, prefilter=prefilter)
+    return ScanService({".py": python_route, ".sol": ScanRoute("solidity", solidity)})
+
+
+def test_routes_by_extension():
+    python, solidity = StubBackend(name="stub-python"), StubBackend(name="stub-solidity")
+    scans = make_service(python, solidity)
+
+    assert scans.scan("x = eval(data)\n", "app/main.py")["is_vulnerable"]
+    assert not scans.scan("contract A {}\n", "contracts/A.SOL")["is_vulnerable"]
+    assert python.calls == ["app/main.py"]
+    assert solidity.calls == ["contracts/A.SOL"]
+
+
+def test_unrouted_and_empty_files_skip_the_backend():
+    python = StubBackend()
+    scans = make_service(python)
+
+    assert scans.scan("console.log(1)", "README")["details"].startswith("No scanner for extensionless")
+    assert scans.scan("   \n", "empty.py")["details"] == "Empty or invalid file content"
+    assert python.calls == []
+
+
+def test_findings_carry_line_and_snippet():
+    result = make_service().scan("import os\nvalue = eval(data)\n", "a.py")
+    assert result["details"] == [{"type": "Stub match: eval(", "line": 2, "snippet": "value = eval(data)"}]
+
+
+def test_same_content_is_scanned_once():
+    python = StubBackend()
+    scans = make_service(python)
+
+    first = scans.scan("x = eval(data)\n", "a.py")
+    second = scans.scan("x = eval(data)\n", "b.py")
+    assert first == second
+    assert python.calls == ["a.py"]
+    assert scans.stats["cache_hits"] == 1
+
+
+def test_cache_is_namespaced_by_backend():
+    python, solidity = StubBackend(name="stub-python"), StubBackend(name="stub-solidity")
+    scans = make_service(python, solidity)
+
+    scans.scan("same text\n", "a.py")
+    scans.scan("same text\n", "a.sol")
+    assert python.calls == ["a.py"]
+    assert solidity.calls == ["a.sol"]
+
+
+def test_least_recently_used_entry_is_evicted():
+    python = StubBackend()
+    scans = make_service(python)
+    scans.cache_size = 2
+
+    for content in ("a = 1\n", "b = 2\n", "a = 1\n", "c = 3\n", "b = 2\n"):
+        scans.scan(content, "f.py")
+    # "a" was refreshed before "c" arrived, so "b" was the one dropped
+    assert python.calls == ["f.py"] * 4
+    assert len(scans.cache) == 2
+
+
+@pytest.mark.parametrize("raises", [False, True])
+def test_failed_scans_are_not_cached(raises):
+    backend = FailingBackend(raises=raises)
+    scans = make_service(backend)
+
+    for _ in range(2):
+        result = scans.scan("x = eval(data)\n", "a.py")
+        assert not result["is_vulnerable"]
+        assert "timed out" in result["details"] or "backend down" in result["details"]
+    assert backend.calls == ["a.py", "a.py"]
+    assert len(scans.cache) == 0
+
+
+def test_cancelled_scans_are_evicted():
+    backend = StubBackend()
+    backend.submit = lambda content, filename: Future()
+    scans = make_service(backend)
+
+    future = scans.submit("x = eval(data)\n", "a.py")
+    assert future.cancel()
+    assert len(scans.cache) == 0
+    assert wait_for_scan(future)["details"] == "Scan was cancelled"
+
+
+def test_silent_bearer_run_is_not_cached(tmp_path):
+    bearer_path = tmp_path / "bearer"
+    bearer_path.write_text("#!/bin/sh\nexit 0\n")
+    bearer_path.chmod(0o755)
+    backend = BearerBackend(workers=1, batch_wait=0)
+    backend.bearer_path = str(bearer_path)
+    backend.threads.append(threading.Thread(target=backend._work, daemon=True))
+    backend.threads[0].start()
+    scans = make_service(backend)
+
+    assert scans.scan("x = eval(data)\n", "a.py")["details"] == "Bearer scan produced no output"
+    assert len(scans.cache) == 0
+
+
+def test_prefilter_skips_files_without_sinks():
+    python = StubBackend()
+    scans = make_service(python, prefilter=find_candidate_sinks)
+
+    result = scans.scan("def add(a, b):\n    return a + b\n", "math.py")
+    assert result["details"].startswith("No vulnerabilities detected (no risky sinks")
+    assert python.calls == []
+    assert scans.stats["prefilter_skipped"] == 1
+
+
+def test_prefilter_passes_files_with_sinks():
+    python = StubBackend()
+    scans = make_service(python, prefilter=find_candidate_sinks)
+
+    assert scans.scan("import subprocess\nsubprocess.run(cmd, shell=True)\n", "run.py")["details"] == "No vulnerabilities detected"
+    assert scans.scan("value = eval(data)\n", "calc.py")["is_vulnerable"]
+    assert python.calls == ["run.py", "calc.py"]
+
+
+def test_prefilter_sends_unparsable_content_to_the_backend():
+    python = StubBackend()
+    scans = make_service(python, prefilter=find_candidate_sinks)
+
+    # Patches are not valid Python, so the pre-filter cannot rule anything out
+    scans.scan("@@ -1,2 +1,2 @@\n-x = 1\n+x = 2\n", "patch.py")
+    assert python.calls == ["patch.py"]
+
+
+def test_find_candidate_sinks():
+    assert find_candidate_sinks("x = 1\n") == []
+    assert find_candidate_sinks("API_KEY = 'abc'\n") == [("hard-coded secret", 1)]
+    assert ("SQL string building", 1) in find_candidate_sinks("q = 'SELECT * FROM users WHERE id=' + user_id\n")
+    assert find_candidate_sinks("def broken(:\n") is None
+
+
+@pytest.mark.parametrize("content", [
+    "from os import system\nsystem(cmd)\n",
+    "from os import popen\npopen(cmd).read()\n",
+    "from os import system as run\nrun(cmd)\n",
+    "import os as o\no.system(cmd)\n",
+    "import yaml as y\ny.load(data)\n",
+])
+def test_find_candidate_sinks_resolves_imported_names(content):
+    assert find_candidate_sinks(content)
+
+
+def test_imported_names_without_sinks_are_skipped():
+    assert find_candidate_sinks("from os import path\nimport os as o\nprint(path.join(o.sep, 'a'))\n") == []
+
+
+def test_scanner_backend_override(monkeypatch):
+    monkeypatch.setenv("SCANNER_BACKEND", "stub")
+    monkeypatch.setenv("SCAN_PREFILTER", "off")
+    monkeypatch.setattr(service, "_service", None)
+
+    scans = get_scan_service()
+    assert {route.backend.name for route in scans.routes.values()} == {"stub-python", "stub-javascript", "stub-solidity"}
+    assert scans.scan("x = 1\n", "a.py")["details"] == "No vulnerabilities detected"
+
+
+def test_unknown_scanner_backend_is_rejected(monkeypatch):
+    monkeypatch.setenv("SCANNER_BACKEND", "nope")
+    monkeypatch.setattr(service, "_service", None)
+
+    with pytest.raises(Exception, match="Unknown SCANNER_BACKEND"):
+        get_scan_service()
@@ -0,0 +1,148 @@
+import pytest
+from bson.objectid import ObjectId
+from flask import Flask
+from itsdangerous import TimestampSigner, URLSafeTimedSerializer
+from config import sessions
+
+# Run from the backend directory: python -m pytest tests
+
+app = Flask(__name__)
+
+
+class FakeUsers:
+    """The users collection as current_user reads it, counting round trips."""
+
+    def __init__(self, *docs):
+        self.docs = list(docs)
+        self.reads = 0
+
+    def find_one(self, query, projection=None):
+        self.reads += 1
+        for doc in self.docs:
+            if all(doc.get(key) == value for key, value in query.items()):
+                return {key: value for key, value in doc.items() if key != "password"}
+        return None
+
+
+class FakeDb:
+    def __init__(self, users):
+        self.users = users
+
+
+@pytest.fixture
+def developer():
+    return {
+        "_id": ObjectId(),
+        "email": "dev@example.com",
+        "password": "hash",
+        "role": "developer",
+        "githubToken": "secret",
+        "assignedProjects": [{"projectName": "alpha", "role": "developer"}],
+    }
+
+
+@pytest.fixture
+def users(monkeypatch, developer):
+    users = FakeUsers(developer)
+    monkeypatch.setattr(sessions, "db", FakeDb(users))
+    monkeypatch.setattr(sessions, "_serializer", URLSafeTimedSerializer("test-secret", salt="session"))
+    monkeypatch.setattr(sessions, "_cache", {})
+    monkeypatch.setattr(sessions, "_invalidated", {})
+    return users
+
+
+def call_as(headers, **kwargs):
+    with app.test_request_context(headers=headers):
+        return sessions.current_user(**kwargs)
+
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_fresh_token_is_trusted_without_mongo(users, developer):
+    user = call_as(bearer(sessions.issue_token(developer)), role="developer")
+
+    assert user["_id"] == developer["_id"]
+    assert user["assignedProjects"] == developer["assignedProjects"]
+    assert users.reads == 0
+
+
+def test_token_for_another_role_is_rejected(users, developer):
+    assert call_as(bearer(sessions.issue_token(developer)), role="admin") is None
+    assert users.reads == 0
+
+
+def test_tampered_token_identifies_nobody(users, developer):
+    signed, signature = sessions.issue_token(developer).rsplit(".", 1)
+    assert call_as(bearer(f"{signed}.{signature[::-1]}")) is None
+
+
+def test_expired_token_identifies_nobody(users, developer, monkeypatch):
+    issued = TimestampSigner.get_timestamp
+    monkeypatch.setattr(TimestampSigner, "get_timestamp", lambda self: issued(self) - sessions.SESSION_MAX_AGE - 1)
+    token = sessions.issue_token(developer)
+    monkeypatch.setattr(TimestampSigner, "get_timestamp", issued)
+
+    assert call_as(bearer(token)) is None
+
+
+def test_no_token_without_a_secret(users, developer, monkeypatch):
+    monkeypatch.setattr(sessions, "_serializer", None)
+    assert sessions.issue_token(developer) is None
+
+
+def test_full_lookups_are_cached_and_never_expose_the_password(users, developer):
+    headers = {"X-User-Email": developer["email"]}
+    first = call_as(headers, role="developer", full=True)
+    first["assignedProjects"].append({"projectName": "mutated"})
+    second = call_as(headers, role="developer", full=True)
+
+    assert users.reads == 1
+    assert "password" not in second
+    assert second["githubToken"] == "secret"
+    # Handlers get copies, so one request's edits never leak into the cache
+    assert second["assignedProjects"] == developer["assignedProjects"]
+
+
+def test_invalidate_user_drops_cached_memberships(users, developer):
+    headers = {"X-User-Email": developer["email"]}
+    call_as(headers, full=True)
+    developer["assignedProjects"] = developer["assignedProjects"] + [{"projectName": "beta", "role": "developer"}]
+
+    assert len(call_as(headers, full=True)["assignedProjects"]) == 1
+    sessions.invalidate_user(developer["_id"], developer["email"])
+    assert [p["projectName"] for p in call_as(headers, full=True)["assignedProjects"]] == ["alpha", "beta"]
+    assert users.reads == 2
+
+
+def test_token_claims_are_not_trusted_after_invalidation(users, developer):
+    token = sessions.issue_token(developer)
+    developer["assignedProjects"] = []
+    sessions.invalidate_user(developer["_id"])
+
+    # The claims still list "alpha"; the user document no longer does
+    assert call_as(bearer(token), role="developer")["assignedProjects"] == []
+    assert users.reads == 1
+
+
+def test_creating_a_project_refreshes_the_admins_cached_session(users, monkeypatch):
+    mongomock = pytest.importorskip("mongomock")
+    from config import registry
+    import server
+
+    db = mongomock.MongoClient()["test"]
+    admin = {"_id": ObjectId(), "email": "admin@example.com", "password": "hash", "role": "admin",
+             "githubUsername": "owner", "createdProjects": ["alpha"]}
+    db.users.insert_one(admin)
+    monkeypatch.setattr(sessions, "db", db)
+    monkeypatch.setitem(registry._factories, "db", lambda: db)
+    registry.reset("db")
+    headers = {"X-User-Email": admin["email"]}
+
+    assert call_as(headers, role="admin", full=True)["createdProjects"] == ["alpha"]
+    response = server.app.test_client().post("/admin/create_project", headers=headers,
+                                             json={"name": "beta", "adminGithubUsername": "owner", "createdAt": "2024-01-01"})
+    assert response.status_code == 201
+    assert call_as(headers, role="admin", full=True)["createdProjects"] == ["alpha", "beta"]
+    registry.reset("db")
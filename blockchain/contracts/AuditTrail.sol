@@ -49,18 +49,11 @@ contract AuditTrail {
             "Not authorized"
         );
 
-        // ✅ Validate commitHash exists for the component
-        bool valid = false;
-        SoftwareRegistry.Version[] memory versions = softwareRegistry.getVersions(componentId);
-
-        for (uint i = 0; i < versions.length; i++) {
-            if (keccak256(abi.encodePacked(versions[i].commitHash)) == keccak256(abi.encodePacked(commitHash))) {
-                valid = true;
-                break;
-            }
-        }
-
-        require(valid, "Invalid commitHash for this component");
+        // ✅ Validate commitHash exists for the component (indexed lookup, not a scan of every version)
+        require(
+            softwareRegistry.isValidCommit(componentId, commitHash),
+            "Invalid commitHash for this component"
+        );
 
         audits[componentId].push(
             AuditRecord(
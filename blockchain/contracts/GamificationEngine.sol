@@ -11,11 +11,19 @@ contract GamificationEngine {
         PatchDependency       // 5
     }
 
+    // Bits of UserStats.badgeMask
+    uint256 private constant RISING_STAR = 1 << 0;
+    uint256 private constant CONSISTENT_CONTRIBUTOR = 1 << 1;
+    uint256 private constant BUG_HUNTER = 1 << 2;
+    uint256 private constant SECURITY_CHAMPION = 1 << 3;
+    uint256 private constant ALL_BADGES = RISING_STAR | CONSISTENT_CONTRIBUTOR | BUG_HUNTER | SECURITY_CHAMPION;
+
     struct UserStats {
         uint256 points;
         uint256 streak;
-        string[] badges;
+        string[] badges;       // display names, in the order earned; never read on the write path
         mapping(ActionType => uint256) actionCounts;
+        uint256 badgeMask;     // earned badges, checked in constant gas
     }
 
     mapping(address => UserStats) private users;
@@ -55,36 +63,38 @@ contract GamificationEngine {
 
     function _checkForBadges(address user) internal {
         UserStats storage stats = users[user];
+        uint256 mask = stats.badgeMask;
+        if (mask == ALL_BADGES) return;
 
-        if (stats.points >= 100 && !_hasBadge(user, "Rising Star")) {
-            stats.badges.push("Rising Star");
-            emit BadgeEarned(user, "Rising Star");
+        if (mask & RISING_STAR == 0 && stats.points >= 100) {
+            mask = _awardBadge(user, stats, mask, RISING_STAR, "Rising Star");
         }
 
-        if (stats.streak >= 5 && !_hasBadge(user, "Consistent Contributor")) {
-            stats.badges.push("Consistent Contributor");
-            emit BadgeEarned(user, "Consistent Contributor");
+        if (mask & CONSISTENT_CONTRIBUTOR == 0 && stats.streak >= 5) {
+            mask = _awardBadge(user, stats, mask, CONSISTENT_CONTRIBUTOR, "Consistent Contributor");
         }
 
-        if (stats.actionCounts[ActionType.FindVulnerability] >= 3 && !_hasBadge(user, "Bug Hunter")) {
-            stats.badges.push("Bug Hunter");
-            emit BadgeEarned(user, "Bug Hunter");
+        if (mask & BUG_HUNTER == 0 && stats.actionCounts[ActionType.FindVulnerability] >= 3) {
+            mask = _awardBadge(user, stats, mask, BUG_HUNTER, "Bug Hunter");
         }
 
-        if (stats.actionCounts[ActionType.SecureRelease] >= 2 && !_hasBadge(user, "Security Champion")) {
-            stats.badges.push("Security Champion");
-            emit BadgeEarned(user, "Security Champion");
+        if (mask & SECURITY_CHAMPION == 0 && stats.actionCounts[ActionType.SecureRelease] >= 2) {
+            _awardBadge(user, stats, mask, SECURITY_CHAMPION, "Security Champion");
         }
     }
 
-    function _hasBadge(address user, string memory badge) internal view returns (bool) {
-        string[] memory userBadges = users[user].badges;
-        for (uint i = 0; i < userBadges.length; i++) {
-            if (keccak256(bytes(userBadges[i])) == keccak256(bytes(badge))) {
-                return true;
-            }
-        }
-        return false;
+    function _awardBadge(
+        address user,
+        UserStats storage stats,
+        uint256 mask,
+        uint256 badge,
+        string memory name
+    ) internal returns (uint256) {
+        mask |= badge;
+        stats.badgeMask = mask;
+        stats.badges.push(name);
+        emit BadgeEarned(user, name);
+        return mask;
     }
 
     // External view functions for frontends/APIs
@@ -108,4 +118,9 @@ contract GamificationEngine {
     function getBadges(address user) external view returns (string[] memory) {
         return users[user].badges;
     }
+
+    // Bit 0 Rising Star, 1 Consistent Contributor, 2 Bug Hunter, 3 Security Champion
+    function getBadgeMask(address user) external view returns (uint256) {
+        return users[user].badgeMask;
+    }
 }
\ No newline at end of file
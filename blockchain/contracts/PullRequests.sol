@@ -15,6 +15,8 @@ contract PullRequests {
 
     mapping(uint256 => PullRequest[]) public pullRequests;
     mapping(string => mapping(string => uint256[])) public developerPullRequests;
+    // Guards developerPullRequests so each id is listed once per developer and project
+    mapping(string => mapping(string => mapping(uint256 => bool))) private indexedPullRequests;
 
     event PullRequestLogged(
         uint256 indexed pullRequestId,
@@ -62,7 +64,7 @@ contract PullRequests {
         });
 
         pullRequests[_pullRequestId].push(newPullRequest);
-        developerPullRequests[_developer][_projectName].push(_pullRequestId);
+        _indexPullRequest(_developer, _projectName, _pullRequestId);
         pullRequestCount++;
 
         emit PullRequestLogged(_pullRequestId, _projectName, _developer, _timestamp, _status);
@@ -98,12 +100,27 @@ contract PullRequests {
         });
 
         pullRequests[_pullRequestId].push(updatedPullRequest);
-        developerPullRequests[pullRequests[_pullRequestId][0].developer][_projectName].push(_pullRequestId);
+        _indexPullRequest(pullRequests[_pullRequestId][0].developer, _projectName, _pullRequestId);
         pullRequestCount++;
 
         emit PullRequestStatusUpdated(_pullRequestId, _projectName, pullRequests[_pullRequestId][0].developer, _timestamp, _newStatus);
     }
 
+    function _indexPullRequest(string memory _developer, string memory _projectName, uint256 _pullRequestId) private {
+        if (!indexedPullRequests[_developer][_projectName][_pullRequestId]) {
+            indexedPullRequests[_developer][_projectName][_pullRequestId] = true;
+            developerPullRequests[_developer][_projectName].push(_pullRequestId);
+        }
+    }
+
+    function _pageLength(uint256 _total, uint256 _offset, uint256 _limit) private pure returns (uint256) {
+        if (_offset >= _total) {
+            return 0;
+        }
+        uint256 remaining = _total - _offset;
+        return remaining < _limit ? remaining : _limit;
+    }
+
     function getPullRequestsByDeveloper(string memory _developer, string memory _projectName)
         public
         view
@@ -112,6 +129,25 @@ contract PullRequests {
         return developerPullRequests[_developer][_projectName];
     }
 
+    // Up to _limit ids starting at _offset, plus the full length for the next page
+    function getPullRequestsByDeveloperPage(
+        string memory _developer,
+        string memory _projectName,
+        uint256 _offset,
+        uint256 _limit
+    )
+        public
+        view
+        returns (uint256[] memory ids, uint256 total)
+    {
+        uint256[] storage all = developerPullRequests[_developer][_projectName];
+        total = all.length;
+        ids = new uint256[](_pageLength(total, _offset, _limit));
+        for (uint256 i = 0; i < ids.length; i++) {
+            ids[i] = all[_offset + i];
+        }
+    }
+
     function getPullRequest(uint256 _pullRequestId)
         public
         view
@@ -146,6 +182,20 @@ contract PullRequests {
         return pullRequests[_pullRequestId];
     }
 
+    // Up to _limit history entries starting at _offset, plus the full length for the next page
+    function getPullRequestHistoryPage(uint256 _pullRequestId, uint256 _offset, uint256 _limit)
+        public
+        view
+        returns (PullRequest[] memory page, uint256 total)
+    {
+        PullRequest[] storage history = pullRequests[_pullRequestId];
+        total = history.length;
+        page = new PullRequest[](_pageLength(total, _offset, _limit));
+        for (uint256 i = 0; i < page.length; i++) {
+            page[i] = history[_offset + i];
+        }
+    }
+
     function getPullRequestCount() public view returns (uint256) {
         return pullRequestCount;
     }
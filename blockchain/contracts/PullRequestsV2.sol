@@ -0,0 +1,139 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+// PullRequests with fixed-size storage: status is an enum, the timestamp is
+// unix seconds, and project and developer names are stored as keccak256 keys.
+// The names and every status change are only kept in events.
+contract PullRequestsV2 {
+    enum Status { None, Pending, Approved, Rejected }
+
+    // Three storage slots: the two keys, then timestamp and status packed together
+    struct PullRequest {
+        bytes32 projectKey;
+        bytes32 developerKey;
+        uint64 timestamp;
+        Status status;
+    }
+
+    uint256 public pullRequestCount;
+
+    mapping(uint256 => PullRequest) private pullRequests;
+    mapping(bytes32 => mapping(bytes32 => uint256[])) private developerPullRequests;
+
+    event PullRequestLogged(
+        uint256 indexed pullRequestId,
+        bytes32 indexed projectKey,
+        bytes32 indexed developerKey,
+        string projectName,
+        string developer,
+        uint64 timestamp,
+        Status status
+    );
+
+    event PullRequestStatusUpdated(
+        uint256 indexed pullRequestId,
+        bytes32 indexed projectKey,
+        bytes32 indexed developerKey,
+        uint64 timestamp,
+        Status oldStatus,
+        Status newStatus
+    );
+
+    function logPullRequest(
+        uint256 _pullRequestId,
+        string calldata _projectName,
+        string calldata _developer,
+        uint64 _timestamp,
+        Status _status
+    ) external {
+        require(_status != Status.None, "Invalid status");
+        PullRequest storage pr = pullRequests[_pullRequestId];
+        require(pr.status == Status.None, "Pull request already logged");
+
+        bytes32 projectKey = keccak256(bytes(_projectName));
+        bytes32 developerKey = keccak256(bytes(_developer));
+        pr.projectKey = projectKey;
+        pr.developerKey = developerKey;
+        pr.timestamp = _timestamp;
+        pr.status = _status;
+
+        developerPullRequests[developerKey][projectKey].push(_pullRequestId);
+        unchecked {
+            pullRequestCount++;
+        }
+
+        emit PullRequestLogged(_pullRequestId, projectKey, developerKey, _projectName, _developer, _timestamp, _status);
+    }
+
+    function updatePullRequestStatus(
+        uint256 _pullRequestId,
+        Status _newStatus,
+        uint64 _timestamp
+    ) external {
+        PullRequest storage pr = pullRequests[_pullRequestId];
+        Status oldStatus = pr.status;
+        require(oldStatus != Status.None, "Pull request does not exist");
+        require(oldStatus != _newStatus, "Status unchanged");
+        require(_newStatus != Status.None, "Invalid status");
+
+        pr.status = _newStatus;
+        pr.timestamp = _timestamp;
+
+        emit PullRequestStatusUpdated(_pullRequestId, pr.projectKey, pr.developerKey, _timestamp, oldStatus, _newStatus);
+    }
+
+    function getPullRequestsByDeveloper(string calldata _developer, string calldata _projectName)
+        external
+        view
+        returns (uint256[] memory)
+    {
+        return developerPullRequests[keccak256(bytes(_developer))][keccak256(bytes(_projectName))];
+    }
+
+    // Up to _limit ids starting at _offset, plus the full length for the next page
+    function getPullRequestsByDeveloperPage(
+        string calldata _developer,
+        string calldata _projectName,
+        uint256 _offset,
+        uint256 _limit
+    )
+        external
+        view
+        returns (uint256[] memory ids, uint256 total)
+    {
+        uint256[] storage all = developerPullRequests[keccak256(bytes(_developer))][keccak256(bytes(_projectName))];
+        total = all.length;
+        uint256 length = 0;
+        if (_offset < total) {
+            length = total - _offset < _limit ? total - _offset : _limit;
+        }
+        ids = new uint256[](length);
+        for (uint256 i = 0; i < length; i++) {
+            ids[i] = all[_offset + i];
+        }
+    }
+
+    // Same shape as v1's getPullRequest, so isLogged stays the sixth field
+    function getPullRequest(uint256 _pullRequestId)
+        external
+        view
+        returns (
+            uint256 pullRequestId,
+            bytes32 projectKey,
+            bytes32 developerKey,
+            uint64 timestamp,
+            Status status,
+            bool isLogged
+        )
+    {
+        PullRequest storage pr = pullRequests[_pullRequestId];
+        if (pr.status == Status.None) {
+            return (0, bytes32(0), bytes32(0), 0, Status.None, false);
+        }
+        return (_pullRequestId, pr.projectKey, pr.developerKey, pr.timestamp, pr.status, true);
+    }
+
+    function getPullRequestCount() external view returns (uint256) {
+        return pullRequestCount;
+    }
+}
@@ -17,6 +17,9 @@ pragma solidity ^0.8.20;
       5.  Added detailed revert reasons to every require() for easier
           debugging from the frontend.
       6.  Solidity‑style natspec cleaned up and expanded.
+      7.  Every version's commitHash is indexed per component, and
+          isValidCommit(componentId, commitHash) checks it in O(1)
+          instead of callers copying getVersions() and scanning it.
     --------------------------------------------------------------------------
     NOTE:  No changes are required in your frontend code that calls
            storeCommit / recordCommit / addCommit.  All three work.
@@ -65,6 +68,9 @@ contract SoftwareRegistry {
     // commitHash is unique; keeping it as a string keeps ABI simple.
     mapping(string => Commit) private commits;         // commitHash → Commit
 
+    // componentId → keccak256(commitHash) → some version carries it
+    mapping(uint256 => mapping(bytes32 => bool)) private versionCommits;
+
     AccessControl public accessControl;
     IGamification public gamification;
 
@@ -128,6 +134,7 @@ contract SoftwareRegistry {
         c.versions.push(
             Version(version, hash, commitHash, block.timestamp)
         );
+        versionCommits[id][keccak256(bytes(commitHash))] = true;
         componentCount++;
 
         emit ComponentRegistered(id, name, version, hash, commitHash);
@@ -154,6 +161,7 @@ contract SoftwareRegistry {
         components[componentId].versions.push(
             Version(version, hash, commitHash, block.timestamp)
         );
+        versionCommits[componentId][keccak256(bytes(commitHash))] = true;
 
         emit VersionAdded(componentId, version, hash, commitHash);
     }
@@ -272,6 +280,17 @@ contract SoftwareRegistry {
         return (c.projectName, c.metadata, c.committer, c.timestamp);
     }
 
+    /**
+     * True if any version of the component was registered with commitHash.
+     * Constant cost regardless of how many versions the component has.
+     */
+    function isValidCommit(
+        uint256 componentId,
+        string calldata commitHash
+    ) external view returns (bool) {
+        return versionCommits[componentId][keccak256(bytes(commitHash))];
+    }
+
     function getVersions(
         uint256 componentId
     ) external view returns (Version[] memory) {
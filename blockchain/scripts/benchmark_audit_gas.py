@@ -0,0 +1,61 @@
+from brownie import accounts, AccessControl, GamificationEngine, SoftwareRegistry, AuditTrail
+
+# Usage: brownie run scripts/benchmark_audit_gas.py --network development
+#
+# Grows one component to 10, 100 and 1000 versions and records the gas of
+# AuditTrail.logAudit at each size, for the oldest and the newest commit.
+# logAudit now validates through SoftwareRegistry.isValidCommit, so both
+# columns should stay flat. getVersions is the array the old validation
+# copied before scanning it; its gas is a floor for what the old path cost.
+
+CHECKPOINTS = (10, 100, 1000)
+
+
+def commit_hash(i):
+    return f"{i:040x}"  # 40-char, SHA-1 shaped
+
+
+def main():
+    admin = accounts[0]
+    developer = accounts[1]
+    auditor = accounts[2]
+
+    print("🚀 Deploying contracts...")
+    access_control = AccessControl.deploy({"from": admin})
+    gamification = GamificationEngine.deploy({"from": admin})
+    software_registry = SoftwareRegistry.deploy(access_control, gamification, {"from": admin})
+    audit_trail = AuditTrail.deploy(access_control, gamification, software_registry, {"from": admin})
+
+    access_control.assignRole(developer, 2, {"from": admin})  # Role.Developer = 2
+    access_control.assignRole(auditor, 3, {"from": admin})    # Role.Auditor = 3
+
+    software_registry.registerComponent("BenchComponent", "v0", "QmBench0", commit_hash(0), {"from": developer})
+    component_id = software_registry.componentCount() - 1
+    versions = 1
+
+    rows = []
+    for target in CHECKPOINTS:
+        print(f"🛠 Adding versions up to {target}...")
+        while versions < target:
+            software_registry.addVersion(
+                component_id, f"v{versions}", f"QmBench{versions}", commit_hash(versions),
+                {"from": developer, "silent": True}
+            )
+            versions += 1
+
+        oldest = audit_trail.logAudit(component_id, "pass", f"QmReportOldest{target}", commit_hash(0), {"from": auditor})
+        newest = audit_trail.logAudit(component_id, "pass", f"QmReportNewest{target}", commit_hash(versions - 1), {"from": auditor})
+        rows.append((
+            target,
+            oldest.gas_used,
+            newest.gas_used,
+            software_registry.isValidCommit.estimate_gas(component_id, commit_hash(versions - 1)),
+            software_registry.getVersions.estimate_gas(component_id),
+        ))
+
+    print("\n⛽ logAudit gas by component history size")
+    print("=" * 86)
+    print(f"{'versions':>8}  {'logAudit (oldest)':>18}  {'logAudit (newest)':>18}  {'isValidCommit':>14}  {'getVersions':>14}")
+    for target, oldest_gas, newest_gas, lookup_gas, copy_gas in rows:
+        print(f"{target:>8}  {oldest_gas:>18,}  {newest_gas:>18,}  {lookup_gas:>14,}  {copy_gas:>14,}")
+    print("=" * 86)
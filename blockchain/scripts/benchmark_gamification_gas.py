@@ -0,0 +1,38 @@
+from brownie import accounts, GamificationEngine
+
+# Usage: brownie run scripts/benchmark_gamification_gas.py --network development
+#
+# Sends ACTIONS performAction calls from one account, cycling through every
+# action type so all four badges get earned along the way, and reports the
+# gas of each call. Once every action type has been used once (the first
+# write to a counter costs more), gas per action should be flat apart from
+# the calls that award a badge, however many actions and badges came before.
+
+ACTIONS = 200
+WARM_UP = 24  # every action type used at least once, every badge earned
+REPORT_AT = (1, 5, 10, 25, 50, 100, 200)
+
+
+def main():
+    user = accounts[0]
+
+    print("🚀 Deploying GamificationEngine...")
+    gamification = GamificationEngine.deploy({"from": user})
+
+    gas = []
+    badges_before = 0
+    for i in range(ACTIONS):
+        tx = gamification.performAction(i % 6, {"from": user, "silent": True})
+        badges = len(gamification.getBadges(user))
+        gas.append((tx.gas_used, badges, badges > badges_before))
+        badges_before = badges
+
+    steady = [used for used, _, awarded in gas[WARM_UP:] if not awarded]
+    print("\n⛽ performAction gas by action count")
+    print("=" * 48)
+    print(f"{'action':>8}  {'gas':>10}  {'badges':>7}  {'awarded':>8}")
+    for n in REPORT_AT:
+        used, badges, awarded = gas[n - 1]
+        print(f"{n:>8}  {used:>10,}  {badges:>7}  {'yes' if awarded else '':>8}")
+    print("=" * 48)
+    print(f"Actions {WARM_UP + 1}-{ACTIONS} without an award: min {min(steady):,}, max {max(steady):,} gas")
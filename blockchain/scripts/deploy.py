@@ -1,7 +1,5 @@
-import json
-import os
-from pathlib import Path
-from brownie import accounts, PullRequests, network
+from brownie import accounts, PullRequests, PullRequestsV2
+from scripts.manifest import record_deployments
 
 def main():
     # Method 1: Use accounts[0] directly (recommended for Ganache)
@@ -25,60 +23,21 @@ def main():
     pull_requests = PullRequests.deploy(gas_params)
     print(f"✅ PullRequests deployed at: {pull_requests.address}")
 
+    print("🚀 Deploying PullRequestsV2...")
+    pull_requests_v2 = PullRequestsV2.deploy(gas_params)
+    print(f"✅ PullRequestsV2 deployed at: {pull_requests_v2.address}")
+
     print("\n🎉 Deployment Complete!")
     print("=" * 50)
     print(f"PullRequests:  {pull_requests.address}")
+    print(f"PullRequestsV2:  {pull_requests_v2.address}")
     print("=" * 50)
 
-    # Define paths for frontend and backend
-    frontend_abi_path = Path("../../frontend/src/abis")
-    frontend_contracts_path = Path("../../frontend/src/contracts")
-
-    backend_abi_path = Path("../../backend/abis")
-    backend_contracts_path = Path("../../backend/contracts")
-
-    # Ensure all target directories exist
-    os.makedirs(frontend_abi_path, exist_ok=True)
-    os.makedirs(frontend_contracts_path, exist_ok=True)
-    os.makedirs(backend_abi_path, exist_ok=True)
-    os.makedirs(backend_contracts_path, exist_ok=True)
-
-    # Define contract
-    contracts = {
-        "PullRequests": PullRequests
-    }
-
-    # Dictionary to store deployed address
-    addresses = {}
-
-    for name, contract in contracts.items():
-        # Get the latest deployed instance
-        instance = contract[-1]
-
-        # Extract and write only the ABI
-        abi = instance.abi
-        abi_json = json.dumps({"abi": abi}, indent=2)
-
-        # Write ABI to frontend
-        with open(frontend_abi_path / f"{name}.json", "w") as f:
-            f.write(abi_json)
-
-        # Write ABI to backend
-        with open(backend_abi_path / f"{name}.json", "w") as f:
-            f.write(abi_json)
-
-        # Store address
-        addresses[name] = instance.address
-
-    # Write addresses to frontend
-    with open(frontend_contracts_path / "addresses.json", "w") as f:
-        json.dump(addresses, f, indent=2)
-
-    # Write addresses to backend
-    with open(backend_contracts_path / "addresses.json", "w") as f:
-        json.dump(addresses, f, indent=2)
-
-    print("✅ Synced ABI and address for PullRequests to both frontend and backend")
+    # Record both in the deployment manifest and sync ABIs to frontend and backend
+    record_deployments({
+        "PullRequests": pull_requests,
+        "PullRequestsV2": pull_requests_v2
+    })
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
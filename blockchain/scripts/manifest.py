@@ -0,0 +1,80 @@
+import hashlib
+import json
+from pathlib import Path
+from brownie import web3
+
+# One deployment manifest per chain, merged across deploy runs:
+#   {"chainId": 1337, "contracts": {"PullRequests": {"address": "0x...",
+#    "deployBlock": 12, "abiHash": "sha256:..."}}}
+# It is written to backend/contracts and frontend/src/contracts. The ABIs and
+# the legacy name -> address maps (addresses.json) are derived from it, and
+# files whose content has not changed are left untouched.
+
+REPO_DIR = Path(__file__).resolve().parents[2]
+TARGETS = (REPO_DIR / "backend", REPO_DIR / "frontend" / "src")
+
+
+def abi_hash(abi):
+    """sha256 of the canonical ABI JSON; backend/config/deployments.py computes the same."""
+    return "sha256:" + hashlib.sha256(json.dumps(abi, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def deploy_block(instance):
+    """Block the contract was created in: its deploy tx if Brownie has it, else a binary search on code."""
+    if getattr(instance, "tx", None) is not None:
+        return instance.tx.block_number
+    low, high = 0, web3.eth.block_number
+    while low < high:
+        middle = (low + high) // 2
+        if len(web3.eth.get_code(instance.address, block_identifier=middle)) > 0:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def _write_json(path, data):
+    """Write indented JSON unless the file already holds exactly that; returns True if written."""
+    content = json.dumps(data, indent=2)
+    if path.exists() and path.read_text() == content:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return True
+
+
+def _abi_file(path, abi):
+    # Keep each file's existing shape: the frontend imports some ABIs as bare lists
+    if path.exists() and isinstance(json.loads(path.read_text()), list):
+        return abi
+    return {"abi": abi}
+
+
+def record_deployments(contracts):
+    """Merge {name: deployed Brownie contract} into the manifest and sync every derived file."""
+    chain_id = web3.eth.chain_id
+    manifest_path = TARGETS[0] / "contracts" / "deployments.json"
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    if manifest.get("chainId") != chain_id:
+        # Addresses from another chain mean nothing here
+        manifest = {"chainId": chain_id, "contracts": {}}
+
+    abis = {}
+    for name, instance in contracts.items():
+        abis[name] = instance.abi
+        manifest["contracts"][name] = {
+            "address": instance.address,
+            "deployBlock": deploy_block(instance),
+            "abiHash": abi_hash(instance.abi),
+        }
+
+    written = 0
+    addresses = {name: entry["address"] for name, entry in manifest["contracts"].items()}
+    for target in TARGETS:
+        written += _write_json(target / "contracts" / "deployments.json", manifest)
+        written += _write_json(target / "contracts" / "addresses.json", addresses)
+        for name, abi in abis.items():
+            path = target / "abis" / f"{name}.json"
+            written += _write_json(path, _abi_file(path, abi))
+    print(f"✅ Deployment manifest for chain {chain_id}: {', '.join(contracts)} ({written} files updated)")
+    return manifest
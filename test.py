@@ -27,8 +27,10 @@ except json.JSONDecodeError:
     logger.error(f"Invalid JSON in ABI file at {abi_path}")
     raise Exception(f"Invalid JSON in ABI file")
 
-# Contract address
-contract_address = "0xc4a28C2308822811d2e08558FA25E1d035792d73"
+# Contract address, from the deployment manifest written by blockchain/scripts/deploy.py
+manifest_path = os.path.join(os.path.dirname(__file__), 'backend', 'contracts', 'deployments.json')
+with open(manifest_path, 'r') as f:
+    contract_address = json.load(f)['contracts']['PullRequests']['address']
 
 # Create contract instance
 try: